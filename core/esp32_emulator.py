@@ -0,0 +1,434 @@
+import os
+import re
+import select
+import threading
+import time
+import tty
+from collections import defaultdict
+
+from core.firmware_gen import ACCEL_SPS2, BASE_STEPS_PER_DEG, MAX_SPEED_SPS, motor_layout
+from core.serial_protocol import (
+    ANGLE_SCALE, BOARD_QUERY, FRAME_CRC, FRAME_HEADER, FRAME_JOINTS, FRAME_POS, FRAME_SYNC, FRAME_TRAJ,
+    FRAME_TRAJ_END, FRAME_TRAJ_RESET, JOINT_ENTRY, PROTOCOL_QUERY, PROTOCOL_REPLY, REPORT_HZ, SPEED_SCALE,
+    TRAJ_ENTRY, TRAJ_HEADER, TRAJ_SLOTS, crc16_ccitt, encode_frame, encode_pos_payload,
+)
+
+_NUMBER = re.compile(r"^\s*[-+]?(\d+\.?\d*|\.\d+)")
+
+
+def _to_float(text):
+    """Arduino String.toFloat(): the leading number, 0 when there is none."""
+    m = _NUMBER.match(text)
+    return float(m.group(0)) if m else 0.0
+
+
+def _to_int(text):
+    """Arduino String.toInt()."""
+    return int(_to_float(text))
+
+
+def _clamp(value, lo, hi):
+    return max(lo, min(hi, value))
+
+
+class _Joint:
+    """Emulated state of one servo or stepper, mirroring the firmware structs."""
+
+    __slots__ = (
+        "name", "kind", "pin", "continuous", "current", "target", "speed", "min_limit", "max_limit",
+        "integral", "last_error", "steps_per_deg", "steps", "velocity", "target_steps", "max_sps",
+    )
+
+    def __init__(self, name, kind, pin, jobj, default_speed, continuous=False, ratio=1.0):
+        self.name = name
+        self.kind = kind            # 0 = servo, 1 = stepper (firmware jointKind)
+        self.pin = pin
+        self.continuous = continuous
+        self.current = 0.0
+        self.target = 0.0
+        self.speed = float(default_speed)
+        self.min_limit = float(jobj.min_limit)
+        self.max_limit = float(jobj.max_limit)
+        self.integral = 0.0
+        self.last_error = 0.0
+        self.steps_per_deg = round(BASE_STEPS_PER_DEG * ratio, 6)
+        self.steps = 0.0            # Stepper position and velocity, in steps and steps/s
+        self.velocity = 0.0
+        self.target_steps = 0
+        self.max_sps = float(MAX_SPEED_SPS)
+
+    @property
+    def actual(self):
+        """What the firmware reports for this joint (jointActual)."""
+        if self.kind == 1:
+            return int(self.steps) / self.steps_per_deg
+        return self.target if self.continuous else self.current
+
+
+class ESP32Emulator:
+    """
+    Software stand-in for a board running the generated firmware.
+
+    Opens a pseudo-terminal pair; the host connects to `port` like to any
+    serial port. The emulator speaks the same protocol as the .ino that
+    core.firmware_gen generates for the same robot and motor assignments:
+    text commands and their echoes, PING/PONG, PROTO?, REPORT, PID:,
+    binary joint and trajectory frames, credits and position reports.
+    Joint motion follows the firmware too: limits are applied to every
+    target, servos step by speed (or PID) every CONTROL_PERIOD_MS and
+    steppers accelerate like AccelStepper. Runs on one background thread.
+    With `board` given it stands in for that board of a multi-board robot.
+    """
+
+    CONTROL_PERIOD_MS = 8
+    SERIAL_LINE_BUF = 96
+
+    def __init__(self, robot, motor_assignments=None, default_speed=50, report_hz=REPORT_HZ, board=None):
+        servo_joints, stepper_joints, joint_kinds, joint_slots = motor_layout(robot, motor_assignments, board)
+        servos = [
+            _Joint(name, 0, pwm, jobj, default_speed, continuous="Continuous" in mode)
+            for name, jobj, pwm, mode in servo_joints
+        ]
+        steppers = [
+            _Joint(name, 1, step, jobj, default_speed, ratio=ratio)
+            for name, jobj, step, dr, en, ratio in stepper_joints
+        ]
+        # Protocol index -> joint, like jointKind[] / jointSlot[]
+        self.joints = [(servos, steppers)[k][s] for k, s in zip(joint_kinds, joint_slots)]
+        self._servos = servos
+        self._steppers = steppers
+        self._report_hz_default = int(report_hz)
+        self.board = board
+
+        self.port = None
+        self.stats = defaultdict(int)  # rx_bytes, tx_bytes, lines, frames, crc_errors, tx_dropped...
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._boot()
+
+    def _boot(self):
+        self.use_pid = False
+        self.binary_host = False
+        self.report_hz = self._report_hz_default
+        self._line = bytearray()
+        self._frame = bytearray()
+        self._frame_state = 0  # 0 = text, 1 = sync byte seen, 2 = inside a frame
+        self._tx_seq = 0
+        self._traj = []        # [(t_ms, [deg per joint])], oldest first
+        self._traj_freed = 0
+        self._traj_active = False
+        self._traj_ended = False
+        self._traj_start = 0
+        self._t0 = time.monotonic()
+        self._last_tick = 0
+        self._last_report = 0
+        for j in self.joints:
+            j.current = j.target = 0.0
+            j.integral = j.last_error = 0.0
+            j.steps = j.velocity = 0.0
+            j.target_steps = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        """Opens the pty pair, boots and starts answering; returns the port path."""
+        if self._thread is not None:
+            return self.port
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        # A board whose host stopped reading drops output instead of stalling
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        with self._lock:
+            self._boot()
+            self._println("ToRoTRoN Online")
+            self._println("READY")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+
+    def millis(self):
+        return int((time.monotonic() - self._t0) * 1000.0)
+
+    def joint_values(self):
+        """{joint: reported angle}, as the next position report would carry them."""
+        with self._lock:
+            return {j.name: j.actual for j in self.joints}
+
+    def joint_targets(self):
+        with self._lock:
+            return {j.name: j.target for j in self.joints}
+
+    # ── Main loop ─────────────────────────────────────────────────────────────
+    def _run(self):
+        period_s = self.CONTROL_PERIOD_MS / 1000.0
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._master], [], [], period_s / 2)
+                data = os.read(self._master, 4096) if ready else b""
+            except (OSError, ValueError):
+                data = b""
+            with self._lock:
+                if data:
+                    self.stats["rx_bytes"] += len(data)
+                    for raw in data:
+                        self._feed(raw)
+                now = self.millis()
+                if now - self._last_tick >= self.CONTROL_PERIOD_MS:
+                    dt = (now - self._last_tick) / 1000.0
+                    self._last_tick = now
+                    self._update_trajectory(now)
+                    self._update_servos()
+                    self._update_steppers(dt)
+                if self.binary_host and self.report_hz > 0 and now - self._last_report >= 1000 // self.report_hz:
+                    self._last_report = now
+                    self._send_positions(now)
+
+    def _write(self, data):
+        try:
+            os.write(self._master, data)
+            self.stats["tx_bytes"] += len(data)
+        except (BlockingIOError, OSError):
+            self.stats["tx_dropped"] += len(data)
+
+    def _println(self, text):
+        self._write(f"{text}\r\n".encode("utf-8"))
+
+    # ── Receive (updateSerial) ────────────────────────────────────────────────
+    def _feed(self, raw):
+        if self._frame_state == 1:
+            self._frame_state = 2 if raw == FRAME_SYNC[1] else 0
+            self._frame.clear()
+            return
+        if self._frame_state == 2:
+            self._frame.append(raw)
+            n = len(self._frame)
+            if n >= FRAME_HEADER.size and n == FRAME_HEADER.size + self._frame[2] + FRAME_CRC.size:
+                self._handle_frame(bytes(self._frame))
+                self._frame_state = 0
+            return
+        if raw == FRAME_SYNC[0] and not self._line:
+            self._frame_state = 1
+            return
+        if raw == 0x0A:
+            line = self._line.decode("utf-8", errors="ignore")
+            self._line.clear()
+            self._parse_command(line)
+        elif len(self._line) < self.SERIAL_LINE_BUF - 1:
+            self._line.append(raw)
+
+    def _handle_frame(self, frame):
+        frame_type, seq, length = FRAME_HEADER.unpack_from(frame)
+        (rx_crc,) = FRAME_CRC.unpack_from(frame, FRAME_HEADER.size + length)
+        if crc16_ccitt(frame[:FRAME_HEADER.size + length]) != rx_crc:
+            self.stats["crc_errors"] += 1
+            self._println(f"ERR CRC {seq}")
+            return
+        self.stats["frames"] += 1
+        p = frame[FRAME_HEADER.size:FRAME_HEADER.size + length]
+        if frame_type == FRAME_JOINTS:
+            count = p[0] if length else 0
+            if length < 1 + count * JOINT_ENTRY.size:
+                self._println(f"ERR LEN {seq}")
+                return
+            for k in range(count):
+                idx, angle, spd = JOINT_ENTRY.unpack_from(p, 1 + k * JOINT_ENTRY.size)
+                self._set_joint_target(idx, angle / ANGLE_SCALE, spd / SPEED_SCALE)
+        elif frame_type == FRAME_TRAJ_RESET:
+            self._traj = []
+            self._traj_freed = 0
+            self._traj_active = False
+            self._traj_ended = False
+            self._println(f"TRAJ READY {TRAJ_SLOTS} {seq}")
+        elif frame_type == FRAME_TRAJ_END:
+            self._traj_ended = True
+            if not self._traj_active and not self._traj:
+                self._println("TRAJ DONE")  # Already played out
+        elif frame_type == FRAME_TRAJ:
+            if length < TRAJ_HEADER.size or length < TRAJ_HEADER.size + p[4] * TRAJ_ENTRY.size:
+                self._println(f"ERR LEN {seq}")
+                return
+            if len(self._traj) >= TRAJ_SLOTS:
+                self._println(f"ERR TRAJ FULL {seq}")
+                return
+            t_ms, count = TRAJ_HEADER.unpack_from(p)
+            # Joints left out of the waypoint hold their previous value
+            deg = list(self._traj[-1][1]) if self._traj else [j.target for j in self.joints]
+            for k in range(count):
+                idx, angle = TRAJ_ENTRY.unpack_from(p, TRAJ_HEADER.size + k * TRAJ_ENTRY.size)
+                if idx < len(deg):
+                    deg[idx] = angle / ANGLE_SCALE
+            self._traj.append((t_ms, deg))
+            if not self._traj_active:
+                # First waypoint (or after an underrun): the clock starts at its timestamp
+                self._traj_active = True
+                self._traj_start = self.millis() - t_ms
+
+    def _parse_command(self, line):
+        cmd = line.strip()
+        if not cmd:
+            return
+        self.stats["lines"] += 1
+        if cmd.upper() == "PING":
+            self._println("PONG")
+            return
+        if cmd.startswith("PING "):
+            # Sequence-numbered heartbeat: echo the number for RTT measurement
+            self._println(f"PONG {cmd[5:]}")
+            return
+        if cmd == BOARD_QUERY:
+            self._println(f"BOARD {self.board or 0}")
+            return
+        if cmd == PROTOCOL_QUERY:
+            self._println(PROTOCOL_REPLY)
+            self.binary_host = True
+            return
+        if cmd.startswith("REPORT "):
+            self.report_hz = _clamp(_to_int(cmd[7:]), 0, 200)
+            self._println(f"ACK REPORT {self.report_hz}")
+            return
+        if cmd.startswith("PID:"):
+            self.use_pid = _to_int(cmd[4:]) == 1
+            for j in self._servos:
+                j.integral = 0.0
+                j.last_error = 0.0
+            self._println(f"💡 [HW] PID Control set to: {'ON' if self.use_pid else 'OFF'}")
+            return
+        f = cmd.find(":")
+        l = cmd.rfind(":")
+        if f < 1 or l <= f:
+            return
+        name = cmd[:f].lower()
+        angle = _to_float(cmd[f + 1:l])
+        spd = _to_float(cmd[l + 1:])
+
+        for j in self._servos:
+            if name == j.name.lower():
+                self._apply_servo_target(j, angle, spd)
+                self._println(f"💡 [HW] Pin {j.pin} -> Angle: {j.target:.2f}")
+                return
+        for j in self._steppers:
+            if name == j.name.lower():
+                self._apply_stepper_target(j, angle, spd)
+                self._println(f"⚙️ [HW] Stepper '{j.name}' -> Steps: {j.target_steps}")
+                return
+        self._println(f"⚠️ [HW] Unrecognized or unmatched command: {cmd}")
+
+    # ── Targets ───────────────────────────────────────────────────────────────
+    def _set_joint_target(self, idx, angle, spd):
+        if idx >= len(self.joints):
+            return
+        j = self.joints[idx]
+        if j.kind == 0:
+            self._apply_servo_target(j, angle, spd)
+        else:
+            self._apply_stepper_target(j, angle, spd)
+
+    def _apply_servo_target(self, j, angle, spd):
+        j.target = _clamp(angle, j.min_limit, j.max_limit)
+        j.speed = spd
+
+    def _apply_stepper_target(self, j, angle, spd):
+        j.target = _clamp(angle, j.min_limit, j.max_limit)
+        j.speed = spd
+        j.max_sps = max(50.0, (spd / 100.0) * MAX_SPEED_SPS)
+        j.target_steps = int(j.target * j.steps_per_deg)
+
+    # ── Control tick ──────────────────────────────────────────────────────────
+    def _update_trajectory(self, now):
+        if self._traj_active and self._traj:
+            t = now - self._traj_start
+            while len(self._traj) >= 2 and self._traj[1][0] <= t:
+                self._traj.pop(0)
+                self._traj_freed += 1
+            a_ms, a_deg = self._traj[0]
+            if len(self._traj) >= 2:
+                b_ms, b_deg = self._traj[1]
+                span = b_ms - a_ms
+                u = 0.0 if (t <= a_ms or span == 0) else (t - a_ms) / span
+                for idx, (a, b) in enumerate(zip(a_deg, b_deg)):
+                    self._set_joint_target(idx, a + (b - a) * u, 100.0)
+            else:
+                for idx, a in enumerate(a_deg):
+                    self._set_joint_target(idx, a, 100.0)
+                if t >= a_ms:
+                    # Last buffered waypoint reached: done, or the host fell behind
+                    self._traj = []
+                    self._traj_freed += 1
+                    self._traj_active = False
+                    self._println("TRAJ DONE" if self._traj_ended else "TRAJ UNDERRUN")
+        if self._traj_freed > 0:
+            self._println(f"CREDITS {self._traj_freed}")
+            self._traj_freed = 0
+
+    def _update_servos(self):
+        dt = self.CONTROL_PERIOD_MS / 1000.0
+        for j in self._servos:
+            if j.pin == -1 or j.continuous:
+                continue
+            err = j.target - j.current
+            if self.use_pid:
+                j.integral += err * dt
+                deriv = (err - j.last_error) / dt
+                j.last_error = err
+                # Smooth generic PID parameters for hobby servos
+                output = 1.8 * err + 0.2 * j.integral + 0.05 * deriv
+                max_step = (j.speed / 100.0) * 10.0
+                j.current += _clamp(output, -max_step, max_step)
+                if abs(err) < 0.1:
+                    j.current = j.target
+                    j.integral = 0.0
+            elif abs(err) < 0.1:
+                j.current = j.target
+            else:
+                step = max(0.1, (j.speed / 100.0) * 4.0)
+                j.current += step if err > 0 else -step
+                if (err > 0 and j.current > j.target) or (err < 0 and j.current < j.target):
+                    j.current = j.target
+
+    def _update_steppers(self, dt):
+        # Trapezoidal profile: brake when the stopping distance reaches the target
+        for j in self._steppers:
+            togo = j.target_steps - j.steps
+            if abs(togo) < 0.5 and abs(j.velocity) < ACCEL_SPS2 * dt:
+                j.steps = float(j.target_steps)
+                j.velocity = 0.0
+                continue
+            direction = 1.0 if togo > 0 else -1.0
+            stopping = j.velocity * j.velocity / (2.0 * ACCEL_SPS2)
+            if j.velocity * direction < 0 or stopping >= abs(togo):
+                j.velocity -= (1.0 if j.velocity > 0 else -1.0) * ACCEL_SPS2 * dt
+            else:
+                j.velocity += direction * ACCEL_SPS2 * dt
+            j.velocity = _clamp(j.velocity, -j.max_sps, j.max_sps)
+            j.steps += j.velocity * dt
+            if (togo > 0 and j.steps > j.target_steps) or (togo < 0 and j.steps < j.target_steps):
+                j.steps = float(j.target_steps)
+                j.velocity = 0.0
+
+    def _send_positions(self, now):
+        payload = encode_pos_payload(now & 0xFFFFFFFF, [j.actual for j in self.joints])
+        self._write(encode_frame(FRAME_POS, self._tx_seq, payload))
+        self._tx_seq = (self._tx_seq + 1) & 0xFF
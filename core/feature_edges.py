@@ -0,0 +1,228 @@
+import numpy as np
+
+
+class FeatureEdgeIndex:
+    """
+    Real CAD edges of a triangle mesh, computed once in the mesh's local frame.
+
+    Tessellation edges between nearly coplanar triangles are discarded; what
+    remains are sharp edges (dihedral angle above a threshold), open boundary
+    edges and non-manifold edges. These are chained into polylines ("seams")
+    that break at corners and junctions, so one query returns a whole seam.
+    """
+
+    def __init__(self, vertices, faces, sharp_angle_deg=30.0, corner_angle_deg=45.0):
+        self.vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        self.faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+        self.sharp_angle_deg = float(sharp_angle_deg)
+        self.corner_angle_deg = float(corner_angle_deg)
+
+        self._build_edges()
+        self._build_polylines()
+        self._build_segments()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    def _build_edges(self):
+        """Find unique mesh edges, their two faces and the feature subset."""
+        verts = self.vertices
+        faces = self.faces
+
+        if len(faces) == 0:
+            self.face_normals = np.zeros((0, 3))
+            self.edges = np.zeros((0, 2), dtype=np.int64)
+            self.normals_a = np.zeros((0, 3))
+            self.normals_b = np.zeros((0, 3))
+            self.dihedral_deg = np.zeros(0)
+            self.concave = np.zeros(0, dtype=bool)
+            self.is_boundary = np.zeros(0, dtype=bool)
+            return
+
+        # Face normals (degenerate triangles get a zero normal)
+        tri = verts[faces]
+        normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        lengths = np.linalg.norm(normals, axis=1)
+        normals = np.divide(normals, lengths[:, None], out=np.zeros_like(normals), where=lengths[:, None] > 1e-12)
+        self.face_normals = normals
+
+        # Every triangle contributes 3 edges; group identical (sorted) edges
+        all_edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        edge_face = np.repeat(np.arange(len(faces)), 3)
+        unique, inverse, counts = np.unique(all_edges, axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+
+        order = np.argsort(inverse, kind="stable")
+        starts = np.cumsum(counts) - counts
+        face_a = edge_face[order[starts]]
+        face_b = np.where(counts >= 2, edge_face[order[np.minimum(starts + 1, len(order) - 1)]], -1)
+
+        n_a = normals[face_a]
+        n_b = np.where((face_b >= 0)[:, None], normals[np.maximum(face_b, 0)], n_a)
+        cos_d = np.clip(np.einsum("ij,ij->i", n_a, n_b), -1.0, 1.0)
+        dihedral = np.degrees(np.arccos(cos_d))
+
+        # Concave when the far vertex of face B lies in front of face A's plane.
+        # Index-sum trick: the third vertex of a triangle is sum(face) - edge.
+        far_b = faces[np.maximum(face_b, 0)].sum(axis=1) - unique[:, 0] - unique[:, 1]
+        far_b = np.clip(far_b, 0, len(verts) - 1)
+        side = np.einsum("ij,ij->i", n_a, verts[far_b] - verts[unique[:, 0]])
+        concave = (face_b >= 0) & (side > 1e-9)
+
+        boundary = counts == 1
+        feature = boundary | (counts > 2) | (dihedral > self.sharp_angle_deg)
+
+        self.edges = unique[feature]
+        self.normals_a = n_a[feature]
+        self.normals_b = n_b[feature]
+        self.dihedral_deg = dihedral[feature]
+        self.concave = concave[feature]
+        self.is_boundary = boundary[feature]
+
+    def _passes_through(self, vertex, edge_id, incident):
+        """True when a seam continues smoothly through `vertex` (no corner or junction)."""
+        around = incident.get(vertex, ())
+        if len(around) != 2:
+            return False
+        other = around[0] if around[1] == edge_id else around[1]
+        if other == edge_id:
+            return False
+
+        a, b = self.edges[edge_id]
+        c, d = self.edges[other]
+        d_in = self.vertices[vertex] - self.vertices[a if b == vertex else b]
+        d_out = self.vertices[d if c == vertex else c] - self.vertices[vertex]
+        n_in, n_out = np.linalg.norm(d_in), np.linalg.norm(d_out)
+        if n_in < 1e-12 or n_out < 1e-12:
+            return True
+        cos_turn = float(np.dot(d_in, d_out) / (n_in * n_out))
+        return cos_turn >= np.cos(np.radians(self.corner_angle_deg))
+
+    def _walk(self, vertex, edge_id, visited, incident):
+        """Follow a seam from `vertex` away from `edge_id`; returns (vertex ids, edge ids)."""
+        out_v, out_e = [], []
+        while self._passes_through(vertex, edge_id, incident):
+            around = incident[vertex]
+            nxt = around[0] if around[1] == edge_id else around[1]
+            if visited[nxt]:
+                break
+            visited[nxt] = True
+            a, b = self.edges[nxt]
+            vertex = b if a == vertex else a
+            out_v.append(int(vertex))
+            out_e.append(int(nxt))
+            edge_id = nxt
+        return out_v, out_e
+
+    def _build_polylines(self):
+        """Chain feature edges into seams (lists of vertex ids + edge ids)."""
+        self.polylines = []       # [np.ndarray of vertex ids]
+        self.polyline_edges = []  # [np.ndarray of feature edge ids]
+        self.closed = []          # [bool]
+
+        incident = {}
+        for eid, (a, b) in enumerate(self.edges.tolist()):
+            incident.setdefault(a, []).append(eid)
+            incident.setdefault(b, []).append(eid)
+
+        visited = np.zeros(len(self.edges), dtype=bool)
+        for seed in range(len(self.edges)):
+            if visited[seed]:
+                continue
+            visited[seed] = True
+            a, b = (int(v) for v in self.edges[seed])
+
+            fwd_v, fwd_e = self._walk(b, seed, visited, incident)
+            back_v, back_e = self._walk(a, seed, visited, incident)
+
+            verts = back_v[::-1] + [a, b] + fwd_v
+            eids = back_e[::-1] + [seed] + fwd_e
+            self.polylines.append(np.array(verts, dtype=np.int64))
+            self.polyline_edges.append(np.array(eids, dtype=np.int64))
+            self.closed.append(len(verts) > 3 and verts[0] == verts[-1])
+
+    def _build_segments(self):
+        """Flatten all seams into segment arrays for vectorized nearest queries."""
+        if not self.polylines:
+            self.seg_a = np.zeros((0, 3))
+            self.seg_b = np.zeros((0, 3))
+            self.seg_polyline = np.zeros(0, dtype=np.int64)
+            return
+
+        seg_a, seg_b, seg_pid = [], [], []
+        for pid, ids in enumerate(self.polylines):
+            seg_a.append(self.vertices[ids[:-1]])
+            seg_b.append(self.vertices[ids[1:]])
+            seg_pid.append(np.full(len(ids) - 1, pid, dtype=np.int64))
+        self.seg_a = np.concatenate(seg_a)
+        self.seg_b = np.concatenate(seg_b)
+        self.seg_polyline = np.concatenate(seg_pid)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return len(self.polylines)
+
+    def nearest(self, point_local, max_dist=None):
+        """
+        Returns (polyline_id, distance) of the seam closest to a local point,
+        or (None, inf) when there is no seam within `max_dist`.
+        """
+        if len(self.seg_a) == 0:
+            return None, float("inf")
+
+        p = np.asarray(point_local, dtype=float).reshape(3)
+        ab = self.seg_b - self.seg_a
+        denom = np.einsum("ij,ij->i", ab, ab)
+        t = np.einsum("ij,ij->i", p - self.seg_a, ab) / np.maximum(denom, 1e-18)
+        t = np.clip(t, 0.0, 1.0)
+        closest = self.seg_a + ab * t[:, None]
+        dist = np.linalg.norm(closest - p, axis=1)
+
+        best = int(np.argmin(dist))
+        d = float(dist[best])
+        if max_dist is not None and d > max_dist:
+            return None, float("inf")
+        return int(self.seg_polyline[best]), d
+
+    def polyline_points(self, polyline_id):
+        """Local-space points of one seam (closed seams repeat the first point)."""
+        return self.vertices[self.polylines[polyline_id]]
+
+    def seam_normals(self, polyline_id, segment_range=None):
+        """
+        Returns (normal_a, normal_b, dihedral_deg) averaged over a seam, or over
+        the segments [start, stop) of it when `segment_range` is given.
+        Face sides are made consistent along the chain before averaging.
+        """
+        eids = self.polyline_edges[polyline_id]
+        if segment_range is not None:
+            eids = eids[segment_range[0]:segment_range[1]]
+        n_a = self.normals_a[eids].copy()
+        n_b = self.normals_b[eids].copy()
+
+        # Walk the chain so each edge's "A" side matches its predecessor's;
+        # on curved seams a fixed reference normal would mix the two sides.
+        for i in range(1, len(eids)):
+            if np.dot(n_b[i], n_a[i - 1]) > np.dot(n_a[i], n_a[i - 1]):
+                n_a[i], n_b[i] = n_b[i].copy(), n_a[i].copy()
+        side_a = n_a.mean(axis=0)
+        side_b = n_b.mean(axis=0)
+
+        # Closed curved seams (e.g. a cylinder rim) average their radial side
+        # out to ~zero; fall back to the normals at the middle of the seam.
+        mid = len(eids) // 2
+        if np.linalg.norm(side_a) < 0.5:
+            side_a = n_a[mid]
+        if np.linalg.norm(side_b) < 0.5:
+            side_b = n_b[mid]
+
+        side_a = side_a / (np.linalg.norm(side_a) + 1e-12)
+        side_b = side_b / (np.linalg.norm(side_b) + 1e-12)
+        return side_a, side_b, float(np.mean(self.dihedral_deg[eids]))
+
+    def seam_is_concave(self, polyline_id):
+        """True when the majority of a seam's edges are concave (inside corners)."""
+        eids = self.polyline_edges[polyline_id]
+        return bool(np.mean(self.concave[eids]) > 0.5)
@@ -1,37 +1,42 @@
-def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
-    """
-    Generates a compilable Arduino (.ino) string for ESP32-S3.
+from core.serial_protocol import (
+    FRAME_JOINTS, FRAME_POS, FRAME_TRAJ, FRAME_TRAJ_END, FRAME_TRAJ_RESET, JOINT_ENTRY, MAX_PAYLOAD, POS_HEADER,
+    POS_ENTRY, BOARD_QUERY, PROTOCOL_QUERY, PROTOCOL_REPLY, REPORT_HZ, TRAJ_ENTRY, TRAJ_HEADER, TRAJ_SLOTS,
+    board_ids, protocol_joint_names,
+)
 
-    Improvements:
-      - Supports Stepper Gear Ratios (e.g. 1:3)
-      - Supports Servo Modes (Standard 0-180 vs Continuous)
-      - All inputs in degrees are converted to motor units (steps/pulse) automatically.
+
+# ─────────────────────────────────────────────────────────────────────────
+# ESP32-S3 Safe GPIO Pool
+# ─────────────────────────────────────────────────────────────────────────
+_GPIO_POOL = [
+    4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18,
+    21,
+    38, 43, 44, 47, 48,
+    1, 2,
+    39, 40, 41, 42,
+]
+
+# Stepper Base Constants (NEMA17 typical)
+STEPS_PER_REV   = 200
+MICROSTEP        = 16
+BASE_STEPS_PER_DEG = (STEPS_PER_REV * MICROSTEP) / 360.0  # ~8.8889
+MAX_SPEED_SPS   = 3200
+ACCEL_SPS2      = 1600
+
+
+def motor_layout(robot, motor_assignments=None, board=None):
     """
+    Splits the protocol joints into servos and steppers and assigns their pins
+    (only `board`'s joints when given; every board has its own GPIO pool).
 
-    # ─────────────────────────────────────────────────────────────────────────
-    # ESP32-S3 Safe GPIO Pool
-    # ─────────────────────────────────────────────────────────────────────────
-    _GPIO_POOL = [
-        4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18,
-        21,
-        38, 43, 44, 47, 48,
-        1, 2,
-        39, 40, 41, 42,
-    ]
-
-    # Stepper Base Constants (NEMA17 typical)
-    STEPS_PER_REV   = 200
-    MICROSTEP        = 16
-    BASE_STEPS_PER_DEG = (STEPS_PER_REV * MICROSTEP) / 360.0  # ~8.8889
-    MAX_SPEED_SPS   = 3200
-    ACCEL_SPS2      = 1600
-
-    slave_ids = set()
-    for slaves in robot.joint_relations.values():
-        for s_id, _ in slaves:
-            slave_ids.add(s_id)
-
-    joint_names = [n for n in robot.joints if n not in slave_ids]
+    Returns (servo_joints, stepper_joints, joint_kinds, joint_slots):
+      servo_joints   [(name, joint_obj, pwm_pin, mode)]
+      stepper_joints [(name, joint_obj, step_pin, dir_pin, en_pin, ratio)]
+      joint_kinds    per protocol index: 0 = servo, 1 = stepper
+      joint_slots    per protocol index: position in the servo / stepper list
+    """
+    # Protocol index order, shared with SerialManager
+    joint_names = protocol_joint_names(robot, motor_assignments, board)
 
     if motor_assignments is None:
         motor_assignments = {}
@@ -46,15 +51,17 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
                 return pin
         return -1
 
-    servo_joints   = []   # [(name, joint_obj, pwm_pin, mode)]
-    stepper_joints = []   # [(name, joint_obj, step_pin, dir_pin, en_pin, ratio)]
+    servo_joints   = []
+    stepper_joints = []
+    joint_kinds    = []
+    joint_slots    = []
 
     for name in joint_names:
         jobj = robot.joints[name]
         data = motor_assignments.get(name, {"type": "servo"})
         # Support legacy string format if any
         if isinstance(data, str): data = {"type": data}
-        
+
         mtype = data.get("type", "servo").lower()
 
         if mtype == "stepper":
@@ -62,12 +69,40 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
             dr   = _alloc_pin()
             en   = _alloc_pin()
             ratio = float(data.get("gear_ratio", 1.0))
+            joint_kinds.append(1)
+            joint_slots.append(len(stepper_joints))
             stepper_joints.append((name, jobj, step, dr, en, ratio))
         else:
             pwm = _alloc_pin()
             mode = data.get("servo_mode", "Standard (0-180)")
+            joint_kinds.append(0)
+            joint_slots.append(len(servo_joints))
             servo_joints.append((name, jobj, pwm, mode))
 
+    return servo_joints, stepper_joints, joint_kinds, joint_slots
+
+
+def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None, report_hz=REPORT_HZ, board=None):
+    """
+    Generates a compilable Arduino (.ino) string for ESP32-S3.
+
+    Improvements:
+      - Supports Stepper Gear Ratios (e.g. 1:3)
+      - Supports Servo Modes (Standard 0-180 vs Continuous)
+      - All inputs in degrees are converted to motor units (steps/pulse) automatically.
+      - Accepts binary multi-joint frames (see core.serial_protocol) next to the
+        text protocol; joints are addressed by their protocol index.
+      - Buffers streamed trajectory waypoints and interpolates between them on
+        the firmware clock, granting buffer slots back to the host as credits.
+      - Reports every joint's position `report_hz` times per second (0 = off)
+        to hosts that negotiated the binary protocol; "REPORT <hz>" changes it.
+      - With `board` given, builds the sketch for that board's joints only
+        (motor_assignments[joint]["board"]); see generate_board_firmwares.
+    """
+
+    servo_joints, stepper_joints, joint_kinds, joint_slots = motor_layout(robot, motor_assignments, board)
+    joint_names = protocol_joint_names(robot, motor_assignments, board)
+
     num_servo    = len(servo_joints)
     num_stepper  = len(stepper_joints)
     need_servo   = num_servo > 0
@@ -77,6 +112,8 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
     c.append("/**")
     c.append(" * ToRoTRoN — ESP32-S3 Robot Firmware (Enhanced)")
     c.append(" * Auto-generated with Gear Ratio & Servo Mode support")
+    if board is not None:
+        c.append(f" * Board {board}: {', '.join(joint_names) or '(no joints)'}")
     c.append(" */")
     c.append("")
 
@@ -138,6 +175,48 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
     c.append("unsigned long lastControlTick = 0;")
     c.append("")
 
+    # --- BINARY FRAMES ---
+    c.append("// Binary frames: A5 5A | type | seq | len | payload | crc16 (CCITT-FALSE, LE)")
+    c.append("#define FRAME_SYNC0        0xA5")
+    c.append("#define FRAME_SYNC1        0x5A")
+    c.append(f"#define FRAME_MAX_PAYLOAD  {MAX_PAYLOAD}")
+    c.append(f"#define FRAME_JOINTS       0x{FRAME_JOINTS:02X}")
+    c.append(f"#define FRAME_TRAJ         0x{FRAME_TRAJ:02X}")
+    c.append(f"#define FRAME_TRAJ_RESET   0x{FRAME_TRAJ_RESET:02X}")
+    c.append(f"#define FRAME_POS          0x{FRAME_POS:02X}")
+    c.append(f"#define FRAME_TRAJ_END     0x{FRAME_TRAJ_END:02X}")
+    c.append(f"#define JOINT_ENTRY_SIZE   {JOINT_ENTRY.size}")
+    c.append(f"#define TRAJ_HEADER_SIZE   {TRAJ_HEADER.size}")
+    c.append(f"#define TRAJ_ENTRY_SIZE    {TRAJ_ENTRY.size}")
+    c.append(f"#define JOINT_COUNT        {len(joint_names)}")
+    c.append("// Protocol index -> joint kind (0 = servo, 1 = stepper) and slot")
+    c.append(f"const uint8_t jointKind[] = {{{', '.join(str(k) for k in joint_kinds) or '0'}}};")
+    c.append(f"const uint8_t jointSlot[] = {{{', '.join(str(k) for k in joint_slots) or '0'}}};")
+    c.append("uint8_t frameBuf[3 + FRAME_MAX_PAYLOAD + 2];")
+    c.append("uint16_t framePos = 0;")
+    c.append("uint8_t frameState = 0; // 0 = text, 1 = sync byte seen, 2 = inside a frame")
+    c.append("uint8_t txSeq = 0;")
+    c.append("bool binaryHost = false;    // Set once the host asks for the binary protocol")
+    c.append(f"uint16_t reportHz = {max(0, int(report_hz))};")
+    c.append("unsigned long lastReport = 0;")
+    c.append("")
+
+    # --- TRAJECTORY BUFFER ---
+    c.append("// Streamed trajectory: ring buffer of timed waypoints, played on the firmware clock")
+    c.append(f"#define TRAJ_SLOTS         {TRAJ_SLOTS}")
+    c.append("struct TrajPoint {")
+    c.append("  uint32_t t_ms;")
+    c.append(f"  float    deg[{max(1, len(joint_names))}];")
+    c.append("};")
+    c.append("TrajPoint trajBuf[TRAJ_SLOTS];")
+    c.append("uint8_t trajHead = 0;")
+    c.append("uint8_t trajCount = 0;")
+    c.append("uint8_t trajFreed = 0;   // Slots consumed since the last CREDITS report")
+    c.append("bool trajActive = false;")
+    c.append("bool trajEnded = false;  // Host sent FRAME_TRAJ_END: the last buffered waypoint is the end")
+    c.append("unsigned long trajStart = 0;")
+    c.append("")
+
     # --- SETUP ---
     c.append("void setup() {")
     c.append("  Serial.begin(115200);")
@@ -199,19 +278,42 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
     c.append("  updateSerial();")
     if need_stepper:
         c.append(f"  for(int i=0; i<{num_stepper}; i++) stJoints[i].stepper.run();")
+    c.append("  unsigned long now = millis();")
+    c.append("  if (now - lastControlTick >= CONTROL_PERIOD_MS) {")
+    c.append("    lastControlTick = now;")
+    c.append("    updateTrajectory();")
     if need_servo:
-        c.append("  unsigned long now = millis();")
-        c.append("  if (now - lastControlTick >= CONTROL_PERIOD_MS) {")
-        c.append("    lastControlTick = now;")
         c.append("    updateServos();")
-        c.append("  }")
+    c.append("  }")
+    c.append("  if (binaryHost && reportHz > 0 && now - lastReport >= 1000UL / reportHz) {")
+    c.append("    lastReport = now;")
+    c.append("    sendPositions();")
+    c.append("  }")
     c.append("}")
     c.append("")
 
     # --- SERIAL ---
     c.append("void updateSerial() {")
     c.append("  while (Serial.available() > 0) {")
-    c.append("    char ch = (char)Serial.read();")
+    c.append("    uint8_t raw = (uint8_t)Serial.read();")
+    c.append("    if (frameState == 1) {")
+    c.append("      frameState = (raw == FRAME_SYNC1) ? 2 : 0;")
+    c.append("      framePos = 0;")
+    c.append("      continue;")
+    c.append("    }")
+    c.append("    if (frameState == 2) {")
+    c.append("      frameBuf[framePos++] = raw;")
+    c.append("      if (framePos >= 3 && framePos == 3 + frameBuf[2] + 2) {")
+    c.append("        handleFrame();")
+    c.append("        frameState = 0;")
+    c.append("      }")
+    c.append("      continue;")
+    c.append("    }")
+    c.append("    if (raw == FRAME_SYNC0 && serialLinePos == 0) {")
+    c.append("      frameState = 1;")
+    c.append("      continue;")
+    c.append("    }")
+    c.append("    char ch = (char)raw;")
     c.append("    if (ch == '\\n') {")
     c.append("      serialLine[serialLinePos] = '\\0';")
     c.append("      parseCommand(String(serialLine));")
@@ -223,12 +325,215 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
     c.append("}")
     c.append("")
 
+    c.append("uint16_t crc16(const uint8_t* data, uint16_t len) {")
+    c.append("  uint16_t crc = 0xFFFF;")
+    c.append("  for (uint16_t i = 0; i < len; i++) {")
+    c.append("    crc ^= (uint16_t)data[i] << 8;")
+    c.append("    for (uint8_t b = 0; b < 8; b++) crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);")
+    c.append("  }")
+    c.append("  return crc;")
+    c.append("}")
+    c.append("")
+
+    c.append("void handleFrame() {")
+    c.append("  uint8_t len = frameBuf[2];")
+    c.append("  uint16_t rxCrc = frameBuf[3 + len] | ((uint16_t)frameBuf[4 + len] << 8);")
+    c.append("  if (crc16(frameBuf, 3 + len) != rxCrc) {")
+    c.append("    Serial.print(\"ERR CRC \");")
+    c.append("    Serial.println(frameBuf[1]);")
+    c.append("    return;")
+    c.append("  }")
+    c.append("  const uint8_t* p = frameBuf + 3;")
+    c.append("  if (frameBuf[0] == FRAME_JOINTS) {")
+    c.append("    uint8_t count = p[0];")
+    c.append("    if (len < 1 + count * JOINT_ENTRY_SIZE) {")
+    c.append("      Serial.print(\"ERR LEN \");")
+    c.append("      Serial.println(frameBuf[1]);")
+    c.append("      return;")
+    c.append("    }")
+    c.append("    for (uint8_t k = 0; k < count; k++) {")
+    c.append("      const uint8_t* e = p + 1 + k * JOINT_ENTRY_SIZE;")
+    c.append("      int16_t  angle = (int16_t)(e[1] | ((uint16_t)e[2] << 8));")
+    c.append("      uint16_t spd   = e[3] | ((uint16_t)e[4] << 8);")
+    c.append("      setJointTarget(e[0], angle / 100.0f, spd / 100.0f);")
+    c.append("    }")
+    c.append("  } else if (frameBuf[0] == FRAME_TRAJ_RESET) {")
+    c.append("    trajHead = 0; trajCount = 0; trajFreed = 0; trajActive = false; trajEnded = false;")
+    c.append("    Serial.print(\"TRAJ READY \");")
+    c.append("    Serial.print(TRAJ_SLOTS);")
+    c.append("    Serial.print(' ');")
+    c.append("    Serial.println(frameBuf[1]);")
+    c.append("  } else if (frameBuf[0] == FRAME_TRAJ_END) {")
+    c.append("    trajEnded = true;")
+    c.append("    if (!trajActive && trajCount == 0) Serial.println(\"TRAJ DONE\");  // Already played out")
+    c.append("  } else if (frameBuf[0] == FRAME_TRAJ) {")
+    c.append("    if (len < TRAJ_HEADER_SIZE || len < TRAJ_HEADER_SIZE + p[4] * TRAJ_ENTRY_SIZE) {")
+    c.append("      Serial.print(\"ERR LEN \");")
+    c.append("      Serial.println(frameBuf[1]);")
+    c.append("      return;")
+    c.append("    }")
+    c.append("    if (trajCount >= TRAJ_SLOTS) {")
+    c.append("      Serial.print(\"ERR TRAJ FULL \");")
+    c.append("      Serial.println(frameBuf[1]);")
+    c.append("      return;")
+    c.append("    }")
+    c.append("    uint32_t t = p[0] | ((uint32_t)p[1] << 8) | ((uint32_t)p[2] << 16) | ((uint32_t)p[3] << 24);")
+    c.append("    TrajPoint& pt = trajBuf[(trajHead + trajCount) % TRAJ_SLOTS];")
+    c.append("    pt.t_ms = t;")
+    c.append("    // Joints left out of the waypoint hold their previous value")
+    c.append("    for (uint8_t j = 0; j < JOINT_COUNT; j++) {")
+    c.append("      pt.deg[j] = (trajCount > 0) ? trajBuf[(trajHead + trajCount - 1) % TRAJ_SLOTS].deg[j] : jointTarget(j);")
+    c.append("    }")
+    c.append("    for (uint8_t k = 0; k < p[4]; k++) {")
+    c.append("      const uint8_t* e = p + TRAJ_HEADER_SIZE + k * TRAJ_ENTRY_SIZE;")
+    c.append("      if (e[0] < JOINT_COUNT) pt.deg[e[0]] = (int16_t)(e[1] | ((uint16_t)e[2] << 8)) / 100.0f;")
+    c.append("    }")
+    c.append("    trajCount++;")
+    c.append("    if (!trajActive) {")
+    c.append("      // First waypoint (or after an underrun): the clock starts at its timestamp")
+    c.append("      trajActive = true;")
+    c.append("      trajStart = millis() - t;")
+    c.append("    }")
+    c.append("  }")
+    c.append("}")
+    c.append("")
+
+    c.append("float jointTarget(uint8_t idx) {")
+    if need_servo:
+        c.append("  if (jointKind[idx] == 0) return sJoints[jointSlot[idx]].target_deg;")
+    if need_stepper:
+        c.append("  if (jointKind[idx] == 1) return stJoints[jointSlot[idx]].target_deg;")
+    c.append("  return 0.0f;")
+    c.append("}")
+    c.append("")
+
+    c.append("float jointActual(uint8_t idx) {")
+    if need_servo:
+        c.append("  if (jointKind[idx] == 0) {")
+        c.append("    ServoJoint& s = sJoints[jointSlot[idx]];")
+        c.append("    return s.is_continuous ? s.target_deg : s.current_deg;")
+        c.append("  }")
+    if need_stepper:
+        c.append("  if (jointKind[idx] == 1) {")
+        c.append("    StepperJoint& st = stJoints[jointSlot[idx]];")
+        c.append("    return st.stepper.currentPosition() / st.steps_per_deg;")
+        c.append("  }")
+    c.append("  return 0.0f;")
+    c.append("}")
+    c.append("")
+
+    c.append("void sendFrame(uint8_t type, const uint8_t* payload, uint8_t len) {")
+    c.append("  uint8_t out[2 + 3 + FRAME_MAX_PAYLOAD + 2];")
+    c.append("  out[0] = FRAME_SYNC0; out[1] = FRAME_SYNC1;")
+    c.append("  out[2] = type; out[3] = txSeq++; out[4] = len;")
+    c.append("  memcpy(out + 5, payload, len);")
+    c.append("  uint16_t crc = crc16(out + 2, 3 + len);")
+    c.append("  out[5 + len] = crc & 0xFF;")
+    c.append("  out[6 + len] = crc >> 8;")
+    c.append("  Serial.write(out, 7 + len);")
+    c.append("}")
+    c.append("")
+
+    c.append("void sendPositions() {")
+    c.append(f"  uint8_t p[{POS_HEADER.size} + {POS_ENTRY.size} * {max(1, len(joint_names))}];")
+    c.append("  uint32_t t = millis();")
+    c.append("  p[0] = t & 0xFF; p[1] = (t >> 8) & 0xFF; p[2] = (t >> 16) & 0xFF; p[3] = (t >> 24) & 0xFF;")
+    c.append("  p[4] = JOINT_COUNT;")
+    c.append("  for (uint8_t j = 0; j < JOINT_COUNT; j++) {")
+    c.append("    int16_t a = (int16_t)constrain(lroundf(jointActual(j) * 100.0f), -32768L, 32767L);")
+    c.append(f"    p[{POS_HEADER.size} + 2 * j] = a & 0xFF;")
+    c.append(f"    p[{POS_HEADER.size} + 2 * j + 1] = (a >> 8) & 0xFF;")
+    c.append("  }")
+    c.append(f"  sendFrame(FRAME_POS, p, {POS_HEADER.size} + {POS_ENTRY.size} * JOINT_COUNT);")
+    c.append("}")
+    c.append("")
+
+    c.append("void updateTrajectory() {")
+    c.append("  if (trajActive && trajCount > 0) {")
+    c.append("    uint32_t t = millis() - trajStart;")
+    c.append("    while (trajCount >= 2 && trajBuf[(trajHead + 1) % TRAJ_SLOTS].t_ms <= t) {")
+    c.append("      trajHead = (trajHead + 1) % TRAJ_SLOTS;")
+    c.append("      trajCount--;")
+    c.append("      trajFreed++;")
+    c.append("    }")
+    c.append("    TrajPoint& a = trajBuf[trajHead];")
+    c.append("    if (trajCount >= 2) {")
+    c.append("      TrajPoint& b = trajBuf[(trajHead + 1) % TRAJ_SLOTS];")
+    c.append("      uint32_t span = b.t_ms - a.t_ms;")
+    c.append("      float u = (t <= a.t_ms || span == 0) ? 0.0f : (float)(t - a.t_ms) / (float)span;")
+    c.append("      for (uint8_t j = 0; j < JOINT_COUNT; j++) setJointTarget(j, a.deg[j] + (b.deg[j] - a.deg[j]) * u, 100.0f);")
+    c.append("    } else {")
+    c.append("      for (uint8_t j = 0; j < JOINT_COUNT; j++) setJointTarget(j, a.deg[j], 100.0f);")
+    c.append("      if (t >= a.t_ms) {")
+    c.append("        // Last buffered waypoint reached: done, or the host fell behind")
+    c.append("        trajCount = 0;")
+    c.append("        trajFreed++;")
+    c.append("        trajActive = false;")
+    c.append("        Serial.println(trajEnded ? \"TRAJ DONE\" : \"TRAJ UNDERRUN\");")
+    c.append("      }")
+    c.append("    }")
+    c.append("  }")
+    c.append("  if (trajFreed > 0) {")
+    c.append("    Serial.print(\"CREDITS \");")
+    c.append("    Serial.println(trajFreed);")
+    c.append("    trajFreed = 0;")
+    c.append("  }")
+    c.append("}")
+    c.append("")
+
+    c.append("void setJointTarget(uint8_t idx, float angle, float spd) {")
+    c.append("  if (idx >= JOINT_COUNT) return;")
+    if need_servo:
+        c.append("  if (jointKind[idx] == 0) applyServoTarget(jointSlot[idx], angle, spd);")
+    if need_stepper:
+        c.append("  if (jointKind[idx] == 1) applyStepperTarget(jointSlot[idx], angle, spd);")
+    c.append("}")
+    c.append("")
+
+    if need_servo:
+        c.append("void applyServoTarget(int i, float angle, float spd) {")
+        c.append("  sJoints[i].target_deg = constrain(angle, sJoints[i].min_limit, sJoints[i].max_limit);")
+        c.append("  sJoints[i].speed_pct = spd;")
+        c.append("}")
+        c.append("")
+
+    if need_stepper:
+        c.append("void applyStepperTarget(int i, float angle, float spd) {")
+        c.append("  stJoints[i].target_deg = constrain(angle, stJoints[i].min_limit, stJoints[i].max_limit);")
+        c.append("  stJoints[i].speed_pct = spd;")
+        c.append("  float sps = (spd / 100.0f) * MAX_SPEED_BASE;")
+        c.append("  stJoints[i].stepper.setMaxSpeed(max(50.0f, sps));")
+        c.append("  stJoints[i].stepper.moveTo((long)(stJoints[i].target_deg * stJoints[i].steps_per_deg));")
+        c.append("}")
+        c.append("")
+
     c.append("void parseCommand(String cmd) {")
     c.append("  cmd.trim(); if(cmd.length() == 0) return;")
     c.append("  if (cmd.equalsIgnoreCase(\"PING\")) {")
     c.append("    Serial.println(\"PONG\");")
     c.append("    return;")
     c.append("  }")
+    c.append("  if (cmd.startsWith(\"PING \")) {")
+    c.append("    // Sequence-numbered heartbeat: echo the number for RTT measurement")
+    c.append("    Serial.print(\"PONG \");")
+    c.append("    Serial.println(cmd.substring(5));")
+    c.append("    return;")
+    c.append("  }")
+    c.append(f"  if (cmd.equals(\"{BOARD_QUERY}\")) {{")
+    c.append(f"    Serial.println(\"BOARD {board or 0}\");")
+    c.append("    return;")
+    c.append("  }")
+    c.append(f"  if (cmd.equals(\"{PROTOCOL_QUERY}\")) {{")
+    c.append(f"    Serial.println(\"{PROTOCOL_REPLY}\");")
+    c.append("    binaryHost = true;")
+    c.append("    return;")
+    c.append("  }")
+    c.append("  if (cmd.startsWith(\"REPORT \")) {")
+    c.append("    reportHz = (uint16_t)constrain(cmd.substring(7).toInt(), 0L, 200L);")
+    c.append("    Serial.print(\"ACK REPORT \");")
+    c.append("    Serial.println(reportHz);")
+    c.append("    return;")
+    c.append("  }")
     c.append("  if (cmd.startsWith(\"PID:\")) {")
     c.append("    use_pid = (cmd.substring(4).toInt() == 1);")
     c.append("    for (int i=0; i<" + str(num_servo) + "; i++) { sJoints[i].integral = 0; sJoints[i].last_error = 0; }")
@@ -247,8 +552,7 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
     if need_servo:
         c.append(f"  for (int i = 0; i < {num_servo}; i++) {{")
         c.append("    if (name.equalsIgnoreCase(sJoints[i].name)) {")
-        c.append("      sJoints[i].target_deg = constrain(angle, sJoints[i].min_limit, sJoints[i].max_limit);")
-        c.append("      sJoints[i].speed_pct = spd;")
+        c.append("      applyServoTarget(i, angle, spd);")
         c.append("      Serial.print(\"💡 [HW] Pin \");")
         c.append("      Serial.print(sJoints[i].pin);")
         c.append("      Serial.print(\" -> Angle: \");")
@@ -260,11 +564,7 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
     if need_stepper:
         c.append(f"  for (int i = 0; i < {num_stepper}; i++) {{")
         c.append("    if (name.equalsIgnoreCase(stJoints[i].name)) {")
-        c.append("      stJoints[i].target_deg = constrain(angle, stJoints[i].min_limit, stJoints[i].max_limit);")
-        c.append("      stJoints[i].speed_pct = spd;")
-        c.append("      float sps = (spd / 100.0f) * MAX_SPEED_BASE;")
-        c.append("      stJoints[i].stepper.setMaxSpeed(max(50.0f, sps));")
-        c.append("      stJoints[i].stepper.moveTo((long)(stJoints[i].target_deg * stJoints[i].steps_per_deg));")
+        c.append("      applyStepperTarget(i, angle, spd);")
         c.append("      Serial.print(\"⚙️ [HW] Stepper '\");")
         c.append("      Serial.print(stJoints[i].name);")
         c.append("      Serial.print(\"' -> Steps: \");")
@@ -326,3 +626,14 @@ def generate_esp32_firmware(robot, default_speed=50, motor_assignments=None):
         c.append("}")
 
     return "\n".join(c)
+
+
+def generate_board_firmwares(robot, default_speed=50, motor_assignments=None, report_hz=REPORT_HZ):
+    """
+    One sketch per board for robots split across several controllers:
+    {board id: .ino string}, boards taken from motor_assignments[joint]["board"].
+    """
+    return {
+        board: generate_esp32_firmware(robot, default_speed, motor_assignments, report_hz, board=board)
+        for board in board_ids(robot, motor_assignments)
+    }
@@ -0,0 +1,54 @@
+import numpy as np
+
+from core.local_geometry import mesh_hull_vertices
+
+
+class ObjectGraspMetrics:
+    """
+    Shape metrics of a sim object, computed once in the mesh's local frame.
+
+    Holds the convex-hull vertices, the principal axes (PCA over all
+    vertices), the oriented bounding box along those axes and the object's
+    width along each of them. Moving the object does not change any of
+    this: world-space queries only rotate the cached axes or project the
+    hull, so a new instance is needed only when the mesh or its scale
+    changes.
+    """
+
+    def __init__(self, vertices, hull_vertices=None):
+        vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        if hull_vertices is None or len(hull_vertices) == 0:
+            hull_vertices = vertices
+        self.hull_vertices = np.asarray(hull_vertices, dtype=float).reshape(-1, 3)
+
+        self.centroid = vertices.mean(axis=0) if len(vertices) else np.zeros(3)
+        if len(vertices) >= 3:
+            # Rows: major, secondary, minor (narrowest) axis
+            _, _, vh = np.linalg.svd(vertices - self.centroid, full_matrices=False)
+            axes = np.eye(3)
+            axes[:len(vh)] = vh
+        else:
+            axes = np.eye(3)
+        self.principal_axes = axes
+
+        projected = self.hull_vertices @ axes.T
+        lo = projected.min(axis=0) if len(projected) else np.zeros(3)
+        hi = projected.max(axis=0) if len(projected) else np.zeros(3)
+        self.widths = hi - lo
+        self.obb_extents = self.widths
+        self.obb_center = ((lo + hi) / 2.0) @ axes
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        return cls(mesh.vertices, mesh_hull_vertices(mesh))
+
+    def width_along(self, t_world, axis_world):
+        """Object thickness along a world axis at pose `t_world`."""
+        local_axis = np.asarray(t_world, dtype=float)[:3, :3].T @ np.asarray(axis_world, dtype=float)
+        projected = self.hull_vertices @ local_axis
+        return float(np.ptp(projected)) if len(projected) else 0.0
+
+    def world_principal_axes(self, t_world):
+        """(major, secondary, minor) principal axes in world space at pose `t_world`."""
+        rot = np.asarray(t_world, dtype=float)[:3, :3]
+        return tuple(rot @ axis for axis in self.principal_axes)
@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+
+
+class JointFeedbackBuffer:
+    """
+    Ring buffer of joint position reports from the firmware.
+
+    Storage is preallocated: one row per report with the host receive time,
+    the firmware timestamp (ms) and every reported joint's angle, in the
+    order of `joint_names` (the protocol index order). Written by the
+    serial listener thread, read from the GUI.
+    """
+
+    def __init__(self, joint_names, capacity=2048):
+        self.joint_names = list(joint_names)
+        self.capacity = int(capacity)
+        self._t_host = np.zeros(self.capacity)
+        self._t_fw_ms = np.zeros(self.capacity, dtype=np.uint32)
+        self._angles = np.zeros((self.capacity, len(self.joint_names)))
+        self._head = 0    # Next row to write
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def push(self, t_host, t_fw_ms, angles):
+        n = min(len(angles), self._angles.shape[1])
+        with self._lock:
+            row = self._head
+            self._t_host[row] = t_host
+            self._t_fw_ms[row] = t_fw_ms
+            self._angles[row, :n] = angles[:n]
+            self._head = (row + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def latest(self):
+        """(host time, {joint: angle}) of the newest report, or None."""
+        with self._lock:
+            if not self._count:
+                return None
+            row = (self._head - 1) % self.capacity
+            return float(self._t_host[row]), dict(zip(self.joint_names, self._angles[row].tolist()))
+
+    def window(self, seconds=None):
+        """
+        Reports in arrival order as (host times, firmware ms, angles[n, joints]);
+        only the last `seconds` of them when given.
+        """
+        with self._lock:
+            order = (np.arange(self._count) + self._head - self._count) % self.capacity
+            t_host = self._t_host[order]
+            t_fw = self._t_fw_ms[order]
+            angles = self._angles[order]
+        if seconds is not None and len(t_host):
+            keep = t_host >= t_host[-1] - seconds
+            t_host, t_fw, angles = t_host[keep], t_fw[keep], angles[keep]
+        return t_host, t_fw, angles
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._count = 0
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class LinkStats:
+    """
+    Rolling link-quality figures for the hardware connection.
+
+    Round trips come from sequence-numbered pings the firmware echoes back
+    ("PING <seq>" -> "PONG <seq>"); the last RTT_WINDOW of them feed the
+    percentiles. Byte rates are averaged over RATE_WINDOW_S. Error and
+    reconnect counters run for the whole session. Updated from the serial
+    I/O and listener threads, read from the GUI.
+    """
+
+    RTT_WINDOW = 256
+    RATE_WINDOW_S = 2.0
+    PING_TIMEOUT_S = 5.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.tx_crc_errors = 0     # Frames the firmware rejected ("ERR CRC")
+        self.tx_parse_errors = 0   # Frames the firmware could not parse ("ERR LEN", ...)
+        self.reset()
+
+    def reset(self):
+        """Clears the rolling windows (called on every connect); session counters stay."""
+        with self._lock:
+            self._rtt_ms = deque(maxlen=self.RTT_WINDOW)
+            self._pings = {}          # seq -> time sent
+            self._tx = deque()        # (time, bytes)
+            self._rx = deque()
+            self.pings_sent = 0
+            self.pings_lost = 0
+
+    @property
+    def reconnects(self):
+        return max(0, self.connects - 1)
+
+    def ping_sent(self, seq, t=None):
+        t = time.time() if t is None else t
+        with self._lock:
+            self.pings_sent += 1
+            self._pings[seq] = t
+            for old, sent in list(self._pings.items()):
+                if t - sent > self.PING_TIMEOUT_S:
+                    del self._pings[old]
+                    self.pings_lost += 1
+
+    def pong_received(self, seq, t=None):
+        """Records the round trip of ping `seq`; returns it in ms, or None for an unknown seq."""
+        t = time.time() if t is None else t
+        with self._lock:
+            sent = self._pings.pop(seq, None)
+            if sent is None:
+                return None
+            rtt_ms = (t - sent) * 1000.0
+            self._rtt_ms.append(rtt_ms)
+            return rtt_ms
+
+    def _add(self, samples, n, t):
+        samples.append((t, n))
+        while samples and t - samples[0][0] > self.RATE_WINDOW_S:
+            samples.popleft()
+
+    def add_tx(self, n, t=None):
+        with self._lock:
+            self._add(self._tx, n, time.time() if t is None else t)
+
+    def add_rx(self, n, t=None):
+        with self._lock:
+            self._add(self._rx, n, time.time() if t is None else t)
+
+    def _rate(self, samples, now):
+        total = sum(n for t, n in samples if now - t <= self.RATE_WINDOW_S)
+        return total / self.RATE_WINDOW_S
+
+    def rtt_histogram(self, bins=10):
+        """(counts, bin edges in ms) of the RTT window, as np.histogram returns them."""
+        with self._lock:
+            rtt = np.array(self._rtt_ms, dtype=float)
+        if not len(rtt):
+            return np.zeros(bins, dtype=int), np.zeros(bins + 1)
+        return np.histogram(rtt, bins=bins)
+
+    def snapshot(self, rx_crc_errors=0, rx_parse_errors=0):
+        """
+        Current figures as a dict. RTT keys are None until the first pong.
+        The rx_* counts come from the host-side frame parser.
+        """
+        now = time.time()
+        with self._lock:
+            rtt = np.array(self._rtt_ms, dtype=float)
+            stats = {
+                "rtt_p50_ms": None,
+                "rtt_p95_ms": None,
+                "rtt_p99_ms": None,
+                "rtt_samples": int(len(rtt)),
+                "pings_sent": self.pings_sent,
+                "pings_lost": self.pings_lost,
+                "tx_bytes_per_s": self._rate(self._tx, now),
+                "rx_bytes_per_s": self._rate(self._rx, now),
+                "crc_errors": self.tx_crc_errors + rx_crc_errors,
+                "parse_errors": self.tx_parse_errors + rx_parse_errors,
+                "reconnects": self.reconnects,
+            }
+        if len(rtt):
+            p50, p95, p99 = np.percentile(rtt, [50, 95, 99])
+            stats.update(rtt_p50_ms=float(p50), rtt_p95_ms=float(p95), rtt_p99_ms=float(p99))
+        return stats
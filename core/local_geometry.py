@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def mesh_hull_vertices(mesh):
+    """Convex-hull vertices of a mesh in its own frame."""
+    try:
+        return np.asarray(mesh.convex_hull.vertices, dtype=float)
+    except Exception:
+        # No hull (flat mesh or no qhull): extents over all vertices are the same
+        return np.asarray(mesh.vertices, dtype=float)
+
+
+class LocalGeometryCache:
+    """
+    Values derived from a link's mesh in the link's own frame (hull
+    vertices, grasp metrics, surface templates...), kept per link name.
+
+    Poses never invalidate them; an entry is recomputed with compute(mesh)
+    only when the link holds another mesh object or the same object's
+    contents changed (hash(mesh), e.g. after an in-place rescale).
+    """
+
+    def __init__(self, compute):
+        self.compute = compute
+        self._entries = {}  # link name -> (mesh, hash(mesh), value)
+
+    def get(self, name, mesh):
+        mesh_hash = hash(mesh)
+        cached = self._entries.get(name)
+        if cached is not None and cached[0] is mesh and cached[1] == mesh_hash:
+            return cached[2]
+        value = self.compute(mesh)
+        self._entries[name] = (mesh, mesh_hash, value)
+        return value
+
+    def prune(self, names):
+        """Drops the entries of links not in `names`."""
+        for stale in [name for name in self._entries if name not in names]:
+            del self._entries[stale]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from core.mesh_store import default_cache_dir
+
+
+def default_tessellation_cache_dir():
+    """Tessellation cache: next to the mesh store, under <cache root>/tessellation."""
+    return os.path.join(os.path.dirname(default_cache_dir()), "tessellation")
+
+
+def file_sha1(file_path, chunk_size=4 * 1024 * 1024, progress=None):
+    """SHA-1 of a file, read in chunks; progress(fraction) is called per chunk."""
+    h = hashlib.sha1()
+    total = max(os.path.getsize(file_path), 1)
+    done = 0
+    with open(file_path, "rb") as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+            done += len(chunk)
+            if progress is not None:
+                progress(done / total)
+    return h.hexdigest()
+
+
+class TessellationCache:
+    """
+    Raw (unscaled) tessellations of imported CAD files, keyed by content.
+
+    An entry lives in <cache_dir>/<sha1>_<size>/ as vertices.npy (float64),
+    faces.npy (int64) and meta.json. A small index maps (path, size, mtime)
+    to the content hash, so an unchanged file is found without re-hashing
+    it; a copied or renamed file is still found by its hash.
+
+    Unit detection and scaling are not baked in: they are re-derived from
+    the cached raw bounds on every import, so the cache stays valid if the
+    unit rules change.
+
+    The cache holds at most `max_bytes`: prune() (run after every store)
+    removes the least recently used entries beyond that, and clear()
+    empties it.
+    """
+
+    INDEX_FILE = "index.json"
+    MAX_BYTES = 2 * 1024 ** 3
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or default_tessellation_cache_dir()
+        self.max_bytes = int(self.MAX_BYTES if max_bytes is None else max_bytes)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # --- index (path/size/mtime -> hash) ---
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _stat_key(file_path):
+        st = os.stat(file_path)
+        return os.path.abspath(file_path), st.st_size, st.st_mtime_ns
+
+    def lookup_hash(self, file_path):
+        """Content hash recorded for this exact file (same size/mtime), or None."""
+        path, size, mtime_ns = self._stat_key(file_path)
+        rec = self._read_index().get(path)
+        if rec and rec.get("size") == size and rec.get("mtime_ns") == mtime_ns:
+            return rec.get("sha1")
+        return None
+
+    def remember_hash(self, file_path, sha1):
+        path, size, mtime_ns = self._stat_key(file_path)
+        index = self._read_index()
+        index[path] = {"size": size, "mtime_ns": mtime_ns, "sha1": sha1}
+        self._write_index(index)
+
+    def _write_index(self, index):
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, self._index_path())
+
+    # --- entries ---
+    def entry_dir(self, sha1, size):
+        return os.path.join(self.cache_dir, f"{sha1}_{size}")
+
+    def has_entry(self, sha1, size):
+        folder = self.entry_dir(sha1, size)
+        return all(os.path.exists(os.path.join(folder, n)) for n in ("vertices.npy", "faces.npy", "meta.json"))
+
+    def find(self, file_path):
+        """Entry folder for a file when it is cached and unchanged, else None (no hashing)."""
+        sha1 = self.lookup_hash(file_path)
+        if sha1 is None:
+            return None
+        size = os.path.getsize(file_path)
+        return self.entry_dir(sha1, size) if self.has_entry(sha1, size) else None
+
+    def store(self, sha1, size, mesh, source_path):
+        """Writes a tessellated mesh as a new entry (atomically); returns its folder."""
+        folder = self.entry_dir(sha1, size)
+        if self.has_entry(sha1, size):
+            return folder
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=".entry_")
+        try:
+            np.save(os.path.join(tmp, "vertices.npy"), np.ascontiguousarray(mesh.vertices, dtype="<f8"))
+            np.save(os.path.join(tmp, "faces.npy"), np.ascontiguousarray(mesh.faces, dtype="<i8"))
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump({
+                    "source": os.path.basename(source_path),
+                    "sha1": sha1,
+                    "size": size,
+                    "n_vertices": int(len(mesh.vertices)),
+                    "n_faces": int(len(mesh.faces)),
+                    "bounds": np.asarray(mesh.bounds, dtype=float).tolist(),
+                    "created": time.time(),
+                }, f)
+            try:
+                os.replace(tmp, folder)
+            except OSError:
+                # Another import stored the same content first
+                shutil.rmtree(tmp, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return folder
+
+    def _entries(self):
+        """[(last used, bytes, folder)] of the stored entries."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            folder = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(folder):
+                continue
+            try:
+                files = [os.path.join(folder, n) for n in os.listdir(folder)]
+                entries.append((os.stat(folder).st_mtime, sum(os.path.getsize(f) for f in files), folder))
+            except OSError:
+                continue
+        return entries
+
+    def prune(self, max_bytes=None):
+        """Removes least recently used entries until the cache fits `max_bytes`; returns how many."""
+        max_bytes = self.max_bytes if max_bytes is None else int(max_bytes)
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, folder in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            index = self._read_index()
+            kept = {
+                path: rec for path, rec in index.items()
+                if os.path.isdir(self.entry_dir(rec.get("sha1"), rec.get("size")))
+            }
+            self._write_index(kept)
+        return removed
+
+    def clear(self):
+        """Removes every cached tessellation."""
+        return self.prune(0)
+
+    @staticmethod
+    def load(folder, mesh_store=None):
+        """Trimesh of a cache entry (memory-mapped when a MeshStore is given)."""
+        import trimesh
+        try:
+            os.utime(folder)  # Marks the entry as recently used for prune()
+        except OSError:
+            pass
+        if mesh_store is not None:
+            vertices = np.load(os.path.join(folder, "vertices.npy"), mmap_mode="c")
+            faces = np.load(os.path.join(folder, "faces.npy"), mmap_mode="c")
+        else:
+            vertices = np.load(os.path.join(folder, "vertices.npy"))
+            faces = np.load(os.path.join(folder, "faces.npy"))
+        return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+def run_import_job(file_path, cache_dir, queue):
+    """
+    Worker-process entry point: hash, tessellate and cache one CAD file.
+    Without a cache_dir (or when the cache cannot be written) the arrays
+    are sent back on the queue instead.
+
+    Messages put on `queue`:
+      ("progress", percent, text)
+      ("done", entry_folder, sha1, merged_scene)
+      ("mesh", vertices, faces, merged_scene)
+      ("missing_dependency", message) / ("error", message)
+    """
+    try:
+        cache = TessellationCache(cache_dir) if cache_dir else None
+        size = os.path.getsize(file_path)
+
+        if cache is not None:
+            queue.put(("progress", 0, "Hashing file..."))
+            sha1 = file_sha1(file_path, progress=lambda f: queue.put(("progress", int(10 * f), "Hashing file...")))
+            if cache.has_entry(sha1, size):
+                queue.put(("done", cache.entry_dir(sha1, size), sha1, False))
+                return
+
+        queue.put(("progress", 15, "Tessellating (this can take a while for STEP)..."))
+        import trimesh
+        loaded = trimesh.load(file_path)
+
+        merged_scene = isinstance(loaded, trimesh.Scene)
+        if merged_scene:
+            queue.put(("progress", 80, "Merging assembly/scene meshes..."))
+            mesh = loaded.to_mesh()
+        else:
+            mesh = loaded
+        if not hasattr(mesh, "vertices") or len(mesh.vertices) == 0:
+            queue.put(("error", "Imported mesh has 0 vertices! The file might be empty or incompatible."))
+            return
+
+        if cache is not None:
+            queue.put(("progress", 90, "Writing tessellation cache..."))
+            try:
+                folder = cache.store(sha1, size, mesh, file_path)
+            except OSError:
+                pass  # Full or read-only disk: hand the mesh over uncached
+            else:
+                cache.prune()
+                queue.put(("progress", 100, "Done"))
+                queue.put(("done", folder, sha1, merged_scene))
+                return
+        queue.put(("progress", 100, "Done"))
+        queue.put(("mesh", np.asarray(mesh.vertices, dtype="<f8"), np.asarray(mesh.faces, dtype="<i8"), merged_scene))
+    except ImportError as ie:
+        queue.put(("missing_dependency", str(ie)))
+    except Exception as e:
+        queue.put(("error", str(e)))
+
+
+def start_import_process(file_path, cache_dir=None):
+    """Starts run_import_job in a spawned process (uncached without cache_dir); returns (process, queue)."""
+    import multiprocessing
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_import_job, args=(file_path, cache_dir, queue), daemon=True)
+    process.start()
+    return process, queue
@@ -0,0 +1,89 @@
+import os
+import tempfile
+
+import numpy as np
+
+from core.project_format import mesh_content_hash
+
+
+def default_cache_dir():
+    """Mesh cache location: $TOROTRON_CACHE_DIR or ~/.torotron/cache, plus /meshes."""
+    root = os.environ.get("TOROTRON_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".torotron", "cache")
+    return os.path.join(root, "meshes")
+
+
+def mmap_meshes_requested():
+    """True when memory-mapped mesh storage is switched on ($TOROTRON_MMAP_MESHES=1)."""
+    return os.environ.get("TOROTRON_MMAP_MESHES", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class MeshStore:
+    """
+    Content-addressed, memory-mapped storage for link geometry.
+
+    Vertex (float64) and face (int64) arrays are written once as .npy files
+    under <cache_dir>/<hash>/ and opened with np.memmap in copy-on-write mode,
+    already in the dtypes trimesh and pyvista use, so wrapping them does not
+    copy. Every session or worker process that opens the same mesh shares the
+    same page-cache pages; writes (e.g. apply_scale) stay private to the
+    process that makes them.
+
+    Meshes below `min_faces` are not worth a file and are left in RAM.
+    """
+
+    def __init__(self, cache_dir=None, min_faces=100_000):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.min_faces = int(min_faces)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # Same ids as the project archive's mesh entries
+    mesh_id = staticmethod(mesh_content_hash)
+
+    def _paths(self, mesh_id):
+        folder = os.path.join(self.cache_dir, mesh_id)
+        return os.path.join(folder, "vertices.npy"), os.path.join(folder, "faces.npy")
+
+    def contains(self, mesh_id):
+        return all(os.path.exists(p) for p in self._paths(mesh_id))
+
+    def _write_atomic(self, path, array):
+        # Another process may be writing the same content; last rename wins
+        # and readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.lib.format.write_array(fh, array, allow_pickle=False)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def put(self, vertices, faces):
+        """Stores arrays (if not already present) and returns their mesh id."""
+        vertices = np.ascontiguousarray(vertices, dtype="<f8")
+        faces = np.ascontiguousarray(faces, dtype="<i8")
+        mesh_id = self.mesh_id(vertices, faces)
+        if not self.contains(mesh_id):
+            v_path, f_path = self._paths(mesh_id)
+            os.makedirs(os.path.dirname(v_path), exist_ok=True)
+            self._write_atomic(v_path, vertices)
+            self._write_atomic(f_path, faces)
+        return mesh_id
+
+    def open_arrays(self, mesh_id):
+        """Zero-copy (vertices, faces) memmaps of a stored mesh."""
+        v_path, f_path = self._paths(mesh_id)
+        return np.load(v_path, mmap_mode="c"), np.load(f_path, mmap_mode="c")
+
+    def load(self, mesh_id):
+        """A trimesh whose vertex/face arrays are the memmaps themselves."""
+        import trimesh
+        vertices, faces = self.open_arrays(mesh_id)
+        return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+    def adopt(self, mesh):
+        """Moves a large mesh's arrays into the store; small meshes are returned unchanged."""
+        if mesh is None or len(getattr(mesh, "faces", ())) < self.min_faces:
+            return mesh
+        return self.load(self.put(mesh.vertices, mesh.faces))
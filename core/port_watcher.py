@@ -0,0 +1,214 @@
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import sys
+import threading
+
+import serial.tools.list_ports
+
+try:
+    import pyudev
+except ImportError:  # Optional: netlink hotplug events through udev
+    pyudev = None
+
+# Serial device nodes: USB-UART bridges, native USB CDC, vendor CH34x drivers, Bluetooth, on-board UARTs
+_TTY_NAME = re.compile(r"^(ttyUSB|ttyACM|ttyCH\w*USB|rfcomm|ttyAMA|ttyTHS)\d+$")
+
+# linux/inotify.h
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class PortWatcher:
+    """
+    Notices serial ports appearing and disappearing without polling.
+
+    On Linux it listens for udev tty events over netlink (pyudev, when
+    installed) or for device nodes created and removed in /dev (inotify
+    through libc); elsewhere it falls back to listing the ports every
+    POLL_INTERVAL_S (5 s) on its own thread. Either way events are debounced
+    for DEBOUNCE_S, the port list is read once, and on_change(devices, added,
+    removed) is called from the watcher thread only when the set of
+    devices actually changed. While paused (around uploads and connects
+    that reset the board) changes are held back and reported on resume().
+    """
+
+    DEBOUNCE_S = 0.05
+    POLL_INTERVAL_S = 5.0
+
+    def __init__(self, on_change):
+        self.on_change = on_change
+        self.devices = set()
+        self.backend = None
+        self._paused = False
+        self._stop = False
+        self._woken = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()  # Lets select() in the event loop see wake-ups
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.devices = self._list_devices()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop = True
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            if self._thread.is_alive():
+                return  # Still selecting on the wake pipe; leave it open
+            self._thread = None
+        self._close_wake_pipe()
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        """Reports whatever changed while paused."""
+        self._paused = False
+        self._wake()
+
+    def _wake(self):
+        self._woken.set()
+        if self._wake_w is None:
+            return
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    def _close_wake_pipe(self):
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+
+    @staticmethod
+    def _list_devices():
+        return {p.device for p in serial.tools.list_ports.comports()}
+
+    def _check(self):
+        if self._paused:
+            return
+        devices = self._list_devices()
+        if devices == self.devices:
+            return
+        added, removed = devices - self.devices, self.devices - devices
+        self.devices = devices
+        try:
+            self.on_change(devices, added, removed)
+        except Exception as e:
+            print(f"[PortWatcher] change handler failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Event sources: (fd, drain() -> True when a serial port was involved, close())
+    # ------------------------------------------------------------------
+    def _udev_source(self):
+        context = pyudev.Context()
+        monitor = pyudev.Monitor.from_netlink(context)
+        monitor.filter_by(subsystem="tty")
+        monitor.start()
+
+        def drain():
+            relevant = False
+            while True:
+                device = monitor.poll(timeout=0)
+                if device is None:
+                    return relevant
+                relevant = relevant or device.action in ("add", "remove")
+
+        return monitor.fileno(), drain, monitor.stop
+
+    def _inotify_source(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+        if libc.inotify_add_watch(fd, b"/dev", mask) < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch(/dev) failed")
+
+        def drain():
+            relevant = False
+            while True:
+                try:
+                    data = os.read(fd, 4096)
+                except BlockingIOError:
+                    return relevant
+                pos = 0
+                while pos + _INOTIFY_EVENT.size <= len(data):
+                    _wd, _mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, pos)
+                    name = data[pos + _INOTIFY_EVENT.size:pos + _INOTIFY_EVENT.size + length].rstrip(b"\0")
+                    relevant = relevant or bool(_TTY_NAME.match(name.decode("ascii", errors="ignore")))
+                    pos += _INOTIFY_EVENT.size + length
+
+        return fd, drain, lambda: os.close(fd)
+
+    def _open_source(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        if pyudev is not None:
+            try:
+                source = self._udev_source()
+                self.backend = "udev"
+                return source
+            except Exception as e:
+                print(f"[PortWatcher] udev monitor unavailable, trying inotify: {e}")
+        try:
+            source = self._inotify_source()
+            self.backend = "inotify"
+            return source
+        except Exception as e:
+            print(f"[PortWatcher] inotify unavailable, polling instead: {e}")
+        return None
+
+    def _drain_wake(self):
+        try:
+            os.read(self._wake_r, 64)
+        except OSError:
+            pass
+
+    def _run(self):
+        source = self._open_source()
+        if source is None:
+            self.backend = "poll"
+            while not self._stop:
+                self._woken.wait(self.POLL_INTERVAL_S)
+                self._woken.clear()
+                if not self._stop:
+                    self._check()
+            return
+
+        fd, drain, close = source
+        try:
+            self._watch(fd, drain)
+        finally:
+            close()
+
+    def _watch(self, fd, drain):
+        while not self._stop:
+            # Blocks until something happens in /dev (or udev); no timeout, no idle wakeups
+            ready, _, _ = select.select([fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                self._drain_wake()
+                if self._stop:
+                    break
+                self._check()
+            if fd in ready and drain():
+                # Let a burst (node, symlinks, permissions) settle before listing ports once
+                while select.select([fd], [], [], self.DEBOUNCE_S)[0]:
+                    drain()
+                self._check()
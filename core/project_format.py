@@ -0,0 +1,224 @@
+import hashlib
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# v1: robot.json + meshes/<link>.stl, everything ZIP_DEFLATED
+# v2: robot.json + meshes/<hash>/{vertices,faces}.npy, stored uncompressed and
+#     shared by every link whose geometry is identical
+PROJECT_FORMAT_VERSION = 2
+
+PROJECT_JSON = "robot.json"
+MESH_DIR = "meshes"
+
+
+def project_format_version(robot_data):
+    """Format version of a parsed robot.json (projects without one are v1)."""
+    meta = robot_data.get("meta", {}) if isinstance(robot_data, dict) else {}
+    try:
+        return int(meta.get("format_version", 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def mesh_arrays(mesh):
+    """
+    Little-endian, C-contiguous (vertices float32, faces int32/int64) arrays
+    of a mesh, given as a trimesh or a (vertices, faces) pair.
+    """
+    if isinstance(mesh, tuple):
+        vertices, faces = mesh
+    else:
+        vertices, faces = mesh.vertices, mesh.faces
+    vertices = np.ascontiguousarray(np.asarray(vertices), dtype="<f4")
+    faces = np.asarray(faces)
+    face_dtype = "<i4" if faces.size == 0 or int(faces.max()) < 2**31 - 1 else "<i8"
+    faces = np.ascontiguousarray(faces, dtype=face_dtype)
+    return vertices, faces
+
+
+def mesh_content_hash(vertices, faces):
+    """Content hash of the stored arrays; identical geometry gives an identical id."""
+    h = hashlib.sha1()
+    for arr in (vertices, faces):
+        h.update(f"{arr.dtype.str}{arr.shape}".encode("ascii"))
+        h.update(memoryview(arr).cast("B"))
+    return h.hexdigest()
+
+
+def _write_npy(zipf, arcname, array):
+    """Streams an array into the archive as an uncompressed .npy entry."""
+    info = zipfile.ZipInfo(arcname, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_STORED
+    info.external_attr = 0o644 << 16
+    with zipf.open(info, "w", force_zip64=array.nbytes > 2**30) as fh:
+        np.lib.format.write_array(fh, array, allow_pickle=False)
+
+
+def write_project_archive(file_path, robot_data, link_meshes):
+    """
+    Writes a v2 .trn archive directly, without a temp directory.
+
+    robot_data:  the robot.json dict; its "links" entries get a "mesh_id"
+    link_meshes: {link name: trimesh or (vertices, faces)} for every link entry
+
+    Meshes are deduplicated by content hash. Returns the number of unique
+    meshes written.
+    """
+    robot_data.setdefault("meta", {})["format_version"] = PROJECT_FORMAT_VERSION
+    mesh_table = {}
+
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for l_data in robot_data.get("links", []):
+            mesh = link_meshes.get(l_data["name"])
+            if mesh is None:
+                continue
+            vertices, faces = mesh_arrays(mesh)
+            mesh_id = mesh_content_hash(vertices, faces)
+            l_data["mesh_id"] = mesh_id
+            if mesh_id in mesh_table:
+                continue
+
+            entry = {
+                "vertices": f"{MESH_DIR}/{mesh_id}/vertices.npy",
+                "faces": f"{MESH_DIR}/{mesh_id}/faces.npy",
+                "n_vertices": int(len(vertices)),
+                "n_faces": int(len(faces)),
+            }
+            _write_npy(zipf, entry["vertices"], vertices)
+            _write_npy(zipf, entry["faces"], faces)
+            mesh_table[mesh_id] = entry
+
+        robot_data["meshes"] = mesh_table
+        zipf.writestr(PROJECT_JSON, json.dumps(robot_data, separators=(",", ":")))
+
+    return len(mesh_table)
+
+
+def read_project_json(zipf):
+    """Parses robot.json straight from an open archive."""
+    if PROJECT_JSON not in zipf.namelist():
+        raise Exception("Invalid project file: robot.json missing")
+    return json.loads(zipf.read(PROJECT_JSON))
+
+
+def read_mesh_arrays(zipf, robot_data, mesh_id):
+    """Returns (vertices, faces) of a v2 mesh entry, or None when it is missing."""
+    entry = robot_data.get("meshes", {}).get(mesh_id)
+    if entry is None:
+        return None
+    names = set(zipf.namelist())
+    if entry["vertices"] not in names or entry["faces"] not in names:
+        return None
+    with zipf.open(entry["vertices"]) as fh:
+        vertices = np.lib.format.read_array(fh, allow_pickle=False)
+    with zipf.open(entry["faces"]) as fh:
+        faces = np.lib.format.read_array(fh, allow_pickle=False)
+    return vertices, faces
+
+
+def build_trimesh(vertices, faces):
+    """Wraps stored arrays in a trimesh without re-processing (they were saved processed)."""
+    import trimesh
+    return trimesh.Trimesh(
+        vertices=np.asarray(vertices, dtype=np.float64),
+        faces=np.asarray(faces, dtype=np.int64),
+        process=False,
+    )
+
+
+class ProjectMeshReader:
+    """Loads v2 link meshes from an open archive, decoding each unique mesh once."""
+
+    def __init__(self, zipf, robot_data):
+        self.zipf = zipf
+        self.robot_data = robot_data
+        self._arrays = {}
+
+    def mesh_for_link(self, l_data):
+        """A trimesh for one link entry, or None when its mesh is missing."""
+        mesh_id = l_data.get("mesh_id")
+        if mesh_id is None:
+            return None
+        if mesh_id not in self._arrays:
+            self._arrays[mesh_id] = read_mesh_arrays(self.zipf, self.robot_data, mesh_id)
+        arrays = self._arrays[mesh_id]
+        if arrays is None:
+            return None
+        # Every link gets its own trimesh; shared geometry is only decoded once
+        return build_trimesh(*arrays)
+
+
+def _decode_stl_entry(file_path, arcname):
+    """Parses one v1 STL entry straight from the archive (no extraction)."""
+    import trimesh
+    with zipfile.ZipFile(file_path, "r") as zipf:
+        data = zipf.read(arcname)
+    mesh = trimesh.load(io.BytesIO(data), file_type=os.path.splitext(arcname)[1].lstrip(".").lower() or "stl")
+    if isinstance(mesh, trimesh.Scene):
+        mesh = mesh.to_mesh()
+    return mesh
+
+
+def _decode_npy_entry(file_path, robot_data, mesh_id):
+    with zipfile.ZipFile(file_path, "r") as zipf:
+        return read_mesh_arrays(zipf, robot_data, mesh_id)
+
+
+class ProjectMeshLoader:
+    """
+    Decodes a project's link meshes on a thread pool (phase 2 of loading).
+
+    submit() returns a concurrent.futures.Future per link. Each worker opens
+    its own handle on the archive; v2 geometry shared by several links is
+    decoded once, and every link still gets its own trimesh. With a
+    MeshStore, large meshes are handed over to memory-mapped storage by the
+    worker that decoded them.
+    """
+
+    def __init__(self, file_path, robot_data, max_workers=None, mesh_store=None):
+        self.file_path = file_path
+        self.robot_data = robot_data
+        self.mesh_store = mesh_store
+        self.version = project_format_version(robot_data)
+        with zipfile.ZipFile(file_path, "r") as zipf:
+            self._names = set(zipf.namelist())
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="mesh-load",
+        )
+        self._sources = {}  # mesh_id / mesh_file -> Future
+
+    def has_mesh(self, l_data):
+        """True when the archive holds the mesh a link entry refers to."""
+        if self.version >= 2:
+            entry = self.robot_data.get("meshes", {}).get(l_data.get("mesh_id"))
+            return entry is not None and entry["vertices"] in self._names and entry["faces"] in self._names
+        return l_data.get("mesh_file") in self._names
+
+    def submit(self, l_data):
+        """Queues the decode of one link's mesh; returns a Future of a trimesh."""
+        if self.version < 2:
+            return self._pool.submit(
+                lambda: self._adopt(_decode_stl_entry(self.file_path, l_data["mesh_file"]))
+            )
+
+        mesh_id = l_data["mesh_id"]
+        source = self._sources.get(mesh_id)
+        if source is None:
+            source = self._pool.submit(_decode_npy_entry, self.file_path, self.robot_data, mesh_id)
+            self._sources[mesh_id] = source
+        # Queued after its source, so a worker never waits on an unstarted task
+        return self._pool.submit(lambda: self._adopt(build_trimesh(*source.result())))
+
+    def _adopt(self, mesh):
+        if self.mesh_store is None:
+            return mesh
+        return self.mesh_store.adopt(mesh)
+
+    def shutdown(self, cancel=False):
+        self._pool.shutdown(wait=False, cancel_futures=cancel)
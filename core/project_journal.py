@@ -0,0 +1,350 @@
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import zipfile
+
+import numpy as np
+
+from core.mesh_store import default_cache_dir
+from core.project_format import (
+    mesh_arrays, mesh_content_hash, project_format_version, read_mesh_arrays,
+    read_project_json, write_project_archive,
+)
+
+# robot.json sections that are journaled entry by entry. List sections are
+# keyed by each entry's "name"; dict sections by their own keys.
+_LIST_SECTIONS = ("links", "joints")
+_DICT_SECTIONS = ("meta", "joint_relations", "ui_state")
+
+
+def untitled_project_path():
+    """Where an unsaved session journals its changes."""
+    return os.path.join(os.path.dirname(default_cache_dir()), "untitled.trn")
+
+
+def _session_view(robot_data):
+    """
+    robot_data without the keys only an archive carries (format version,
+    mesh table, v1 mesh file names); the live session never produces them,
+    so journaling them would record spurious deletions.
+    """
+    data = dict(robot_data)
+    data.pop("meshes", None)
+    data["meta"] = {k: v for k, v in (robot_data.get("meta") or {}).items() if k != "format_version"}
+    data["links"] = [
+        {k: v for k, v in l_data.items() if k != "mesh_file"} for l_data in robot_data.get("links", [])
+    ]
+    return data
+
+
+def _sections(robot_data):
+    out = {}
+    for section in _LIST_SECTIONS:
+        out[section] = {entry["name"]: entry for entry in robot_data.get(section, [])}
+    for section in _DICT_SECTIONS:
+        out[section] = dict(robot_data.get(section, {}) or {})
+    return out
+
+
+def _robot_data(sections):
+    data = {section: list(sections.get(section, {}).values()) for section in _LIST_SECTIONS}
+    for section in _DICT_SECTIONS:
+        data[section] = dict(sections.get(section, {}))
+    return data
+
+
+class ProjectJournal:
+    """
+    Append-only autosave log that sits next to a project file.
+
+      <project>.journal          one JSON record per line
+      <project>.journal.meshes/  <mesh_id>/{vertices,faces}.npy, written once
+      <project>.autosave.trn     compacted state (base of the journal)
+
+    The first record names the base archive the journal applies to; the
+    others set or delete single entries (a link, a joint, a ui_state key...).
+    Meshes are referenced by the same content hash as format v2 projects and
+    written only when first seen. Disk writes happen on a background thread
+    in submission order, so a mesh is always on disk before the record that
+    references it.
+    """
+
+    COMPACT_RECORDS = 500
+
+    def __init__(self, project_path):
+        self.project_path = project_path
+        self.journal_path = project_path + ".journal"
+        self.mesh_dir = project_path + ".journal.meshes"
+        self.autosave_path = project_path + ".autosave.trn"
+
+        self.base_trn = None
+        self.records_since_base = 0
+        self._state = {}       # section -> key -> canonical JSON of the last journaled value
+        self._mesh_ids = {}    # link name -> (mesh object, hash(mesh), mesh_id)
+        self._blobs = set()    # mesh ids with data on disk (journal dir or base archive)
+
+        self._queue = queue.Queue()
+        self._thread = None  # Writer thread, started with the first write
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _put(self, job):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._thread.start()
+        self._queue.put(job)
+
+    def _writer_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                job()
+            except Exception as e:
+                print(f"[Journal] write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _append(self, records):
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_blob(self, mesh_id, vertices, faces):
+        folder = os.path.join(self.mesh_dir, mesh_id)
+        if os.path.exists(os.path.join(folder, "faces.npy")):
+            return
+        tmp = folder + ".tmp"
+        os.makedirs(tmp, exist_ok=True)
+        np.save(os.path.join(tmp, "vertices.npy"), vertices)
+        np.save(os.path.join(tmp, "faces.npy"), faces)
+        os.replace(tmp, folder)
+
+    def _base_mesh_ids(self, base_trn):
+        if not base_trn or not os.path.exists(base_trn):
+            return set()
+        try:
+            with zipfile.ZipFile(base_trn, "r") as zipf:
+                data = read_project_json(zipf)
+        except Exception:
+            return set()
+        return set(data.get("meshes", {})) if project_format_version(data) >= 2 else set()
+
+    def start(self, base_trn, robot_data):
+        """
+        Starts a fresh journal on top of `base_trn` (the file just saved or
+        loaded, or None for an empty session). `robot_data` is the state that
+        file holds, so it is not re-journaled.
+        """
+        self.flush()
+        self.base_trn = base_trn
+        self.records_since_base = 0
+        self._mesh_ids = {}
+        self._blobs = self._base_mesh_ids(base_trn)
+        if os.path.isdir(self.mesh_dir):
+            self._blobs.update(os.listdir(self.mesh_dir))
+
+        self._state = {}
+        for section, entries in _sections(_session_view(robot_data)).items():
+            self._state[section] = {k: json.dumps(v, sort_keys=True) for k, v in entries.items()}
+        for l_data in robot_data.get("links", []):
+            if l_data.get("mesh_id"):
+                # Trust the archive's id for whichever mesh object the link holds first
+                self._mesh_ids[l_data["name"]] = (None, None, l_data["mesh_id"])
+
+        header = {"op": "base", "trn": base_trn, "time": time.time()}
+        self._put(lambda: self._reset_file(header))
+        if base_trn != self.autosave_path:
+            # Saved, or recovery declined: the compacted archive is stale
+            self._put(self._remove_autosave)
+
+    def _remove_autosave(self):
+        if os.path.exists(self.autosave_path):
+            os.remove(self.autosave_path)
+
+    def _reset_file(self, header):
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.journal_path)
+
+    def _mesh_id_for(self, name, link):
+        """Content id of a link's mesh, recomputed only when the mesh object or its data changed."""
+        cached = self._mesh_ids.get(name)
+        if getattr(link, "mesh_pending", False):
+            return cached[2] if cached else None
+        mesh = link.mesh
+        if mesh is None:
+            return None
+        if cached is not None and cached[0] is None:
+            # Seeded from the loaded archive: adopt this object as that content
+            self._mesh_ids[name] = (mesh, hash(mesh), cached[2])
+            return cached[2]
+        if cached is not None and cached[0] is mesh and cached[1] == hash(mesh):
+            return cached[2]
+
+        vertices, faces = mesh_arrays(mesh)
+        mesh_id = mesh_content_hash(vertices, faces)
+        self._mesh_ids[name] = (mesh, hash(mesh), mesh_id)
+        if mesh_id not in self._blobs:
+            self._blobs.add(mesh_id)
+            self._put(lambda: self._write_blob(mesh_id, vertices, faces))
+        return mesh_id
+
+    def record(self, robot_data, links):
+        """
+        Journals whatever changed since the last call. `robot_data` is the
+        project dict without meshes; `links` maps link name -> Link.
+        Returns the number of records appended.
+        """
+        for l_data in robot_data.get("links", []):
+            link = links.get(l_data["name"])
+            mesh_id = self._mesh_id_for(l_data["name"], link) if link is not None else None
+            if mesh_id is not None:
+                l_data["mesh_id"] = mesh_id
+        for name in list(self._mesh_ids):
+            if name not in links:
+                del self._mesh_ids[name]
+
+        now = time.time()
+        records = []
+        for section, entries in _sections(robot_data).items():
+            old = self._state.setdefault(section, {})
+            for key, value in entries.items():
+                canon = json.dumps(value, sort_keys=True)
+                if old.get(key) != canon:
+                    old[key] = canon
+                    records.append({"op": "set", "section": section, "key": key, "value": value, "time": now})
+            for key in [k for k in old if k not in entries]:
+                del old[key]
+                records.append({"op": "del", "section": section, "key": key, "time": now})
+
+        if records:
+            self.records_since_base += len(records)
+            self._put(lambda: self._append(records))
+        return len(records)
+
+    def flush(self):
+        """Waits until every queued write is on disk."""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Recovery and compaction
+    # ------------------------------------------------------------------
+    def read_records(self):
+        """(base record or None, [delta records]); a torn last line is ignored."""
+        if not os.path.exists(self.journal_path):
+            return None, []
+        base, records = None, []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    break  # Crash mid-write: everything before it is intact
+                if rec.get("op") == "base":
+                    base, records = rec, []
+                else:
+                    records.append(rec)
+        return base, records
+
+    def has_recoverable_changes(self):
+        """
+        True when the journal holds edits the project file does not: records
+        after the base, or a base that is the compacted autosave archive.
+        """
+        base, records = self.read_records()
+        if records:
+            return True
+        return bool(base) and base.get("trn") == self.autosave_path and os.path.exists(self.autosave_path)
+
+    def replay(self):
+        """Base state + journal deltas -> (robot_data, base_trn)."""
+        base, records = self.read_records()
+        base_trn = base.get("trn") if base else None
+        if base_trn and os.path.exists(base_trn):
+            with zipfile.ZipFile(base_trn, "r") as zipf:
+                sections = _sections(read_project_json(zipf))
+        else:
+            sections = _sections({})
+
+        for rec in records:
+            entries = sections.setdefault(rec["section"], {})
+            if rec["op"] == "set":
+                entries[rec["key"]] = rec["value"]
+            elif rec["op"] == "del":
+                entries.pop(rec["key"], None)
+        return _robot_data(sections), base_trn
+
+    def _mesh_arrays(self, mesh_id, base_zip, base_data):
+        folder = os.path.join(self.mesh_dir, mesh_id)
+        if os.path.exists(os.path.join(folder, "faces.npy")):
+            return np.load(os.path.join(folder, "vertices.npy")), np.load(os.path.join(folder, "faces.npy"))
+        if base_zip is not None:
+            return read_mesh_arrays(base_zip, base_data, mesh_id)
+        return None
+
+    def compact(self):
+        """
+        Folds base + journal into <project>.autosave.trn and restarts the
+        journal on top of it. Mesh blobs no longer referenced are removed.
+        Returns the path of the compacted archive.
+        """
+        self.flush()
+        robot_data, base_trn = self.replay()
+
+        base_zip = base_data = None
+        if base_trn and os.path.exists(base_trn):
+            base_zip = zipfile.ZipFile(base_trn, "r")
+            base_data = read_project_json(base_zip)
+        try:
+            link_meshes = {}
+            for l_data in robot_data["links"]:
+                arrays = self._mesh_arrays(l_data.get("mesh_id"), base_zip, base_data) if l_data.get("mesh_id") else None
+                if arrays is None and base_zip is not None and l_data.get("mesh_file") in base_zip.namelist():
+                    import io
+                    import trimesh
+                    arrays = trimesh.load(io.BytesIO(base_zip.read(l_data["mesh_file"])), file_type="stl")
+                if arrays is not None:
+                    link_meshes[l_data["name"]] = arrays
+            robot_data.pop("meshes", None)
+            tmp = self.autosave_path + ".tmp"
+            write_project_archive(tmp, robot_data, link_meshes)
+        finally:
+            if base_zip is not None:
+                base_zip.close()
+        os.replace(tmp, self.autosave_path)
+
+        self.start(self.autosave_path, robot_data)
+        self.flush()
+        referenced = {l.get("mesh_id") for l in robot_data["links"]}
+        if os.path.isdir(self.mesh_dir):
+            for mesh_id in os.listdir(self.mesh_dir):
+                if mesh_id not in referenced:
+                    shutil.rmtree(os.path.join(self.mesh_dir, mesh_id), ignore_errors=True)
+        return self.autosave_path
+
+    def discard(self):
+        """Deletes the journal, its mesh blobs and the autosave archive."""
+        self.flush()
+        for path in (self.journal_path, self.autosave_path):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self.mesh_dir, ignore_errors=True)
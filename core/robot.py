@@ -3,6 +3,7 @@ import numpy as np
 class Link:
     def __init__(self, name, mesh=None):
         self.name = name
+        self._mesh_future = None  # Pending background decode (project loading)
         self.mesh = mesh  # trimesh object
         self.color = "lightgray"
         self.is_base = False
@@ -19,6 +20,33 @@ class Link:
         self.child_joints = []
         self.custom_tcp_offset = None # Optional [x, y, z] relative to link frame (Live Point)
 
+    @property
+    def mesh(self):
+        """The link's trimesh. While it is still being decoded, waits for just this mesh."""
+        future = self._mesh_future
+        if future is not None:
+            self._mesh_future = None
+            try:
+                self._mesh = future.result()
+            except Exception:
+                self._mesh = None
+        return self._mesh
+
+    @mesh.setter
+    def mesh(self, value):
+        self._mesh_future = None
+        self._mesh = value
+
+    def set_pending_mesh(self, future):
+        """Attaches a concurrent.futures.Future that will produce this link's mesh."""
+        self._mesh = None
+        self._mesh_future = future
+
+    @property
+    def mesh_pending(self):
+        """True while the link's mesh is still being decoded in the background."""
+        return self._mesh_future is not None and not self._mesh_future.done()
+
 class Joint:
     def __init__(self, name, parent_link, child_link, joint_type="revolute"):
         self.name = name
@@ -62,13 +90,14 @@ class Joint:
     def current_deg(self, val: float):
         self.current_value = float(val)
 
-    def get_matrix(self):
+    def get_matrix(self, value=None):
         """
-        Returns the transform matrix for this joint.
+        Returns the transform matrix for this joint (at `value` degrees, or
+        at its current value).
         Math: T = T(origin) * R(axis, theta) * T(-origin)
         This rotates the frame around the defined 'origin' point.
         """
-        theta = np.radians(self.current_value)
+        theta = np.radians(self.current_value if value is None else value)
         
         # 1. Rotation Matrix (R)
         R = self._rotation_matrix(self.axis, theta)
@@ -106,6 +135,7 @@ class Robot:
         self.joints = {}
         self.base_link = None
         self.joint_relations = {} # {master_name: [(slave_name, ratio), ...]}
+        self.kinematics_version = 0 # Bumped whenever link world transforms are recomputed
 
     def add_joint_relation(self, master, slave, ratio=1.0):
         if master not in self.joint_relations:
@@ -194,11 +224,31 @@ class Robot:
         self.update_kinematics()
 
     def update_kinematics(self):
-        visited = set()
-        
+        for name, t_world in self.world_transforms().items():
+            self.links[name].t_world = t_world
+        self.kinematics_version += 1
+
+    def world_transforms(self, joint_values=None):
+        """
+        Link world transforms {link name: 4x4} for the given joint values,
+        without touching the robot's state. Joints missing from
+        `joint_values` keep their current value, except relation slaves of
+        a given master, which follow it (master * ratio, within limits).
+        """
+        values = dict(joint_values or {})
+        for master, slaves in self.joint_relations.items():
+            if master not in values:
+                continue
+            for slave_id, ratio in slaves:
+                slave = self.joints.get(slave_id)
+                if slave is not None and slave_id not in values:
+                    values[slave_id] = float(np.clip(values[master] * ratio, slave.min_limit, slave.max_limit))
+
+        transforms = {}
+
         # 1. Identify Roots
         roots = [l for l in self.links.values() if l.parent_joint is None]
-        
+
         # 2. Prioritize Base
         if self.base_link and self.base_link in roots:
             roots.remove(self.base_link)
@@ -206,30 +256,30 @@ class Robot:
 
         # 3. Propagate
         for root in roots:
-            if root.name in visited: continue
-            
-            root.t_world = root.t_offset
-            visited.add(root.name)
-            
+            if root.name in transforms: continue
+
+            transforms[root.name] = root.t_offset
+
             stack = [root]
             while stack:
                 parent = stack.pop()
-                
+
                 for joint in parent.child_joints:
                     child = joint.child_link
-                    if child.name in visited: continue
-                    
+                    if child.name in transforms: continue
+
                     # Compute kinematic transform
                     # Child_World = Parent_World * Joint_Transform * Child_Offset
                     # Joint_Transform = T(p) * R * T(-p) (Rotation about pivot in Parent Frame)
                     # Child_Offset = Static position of child relative to Parent Frame
-                    
-                    joint_matrix = joint.get_matrix()
-                    child.t_world = parent.t_world @ joint_matrix @ child.t_offset
-                    
-                    visited.add(child.name)
+
+                    joint_matrix = joint.get_matrix(values.get(joint.name))
+                    transforms[child.name] = transforms[parent.name] @ joint_matrix @ child.t_offset
+
                     stack.append(child)
 
+        return transforms
+
     def get_kinematic_chain(self, tcp_link):
         """Returns the list of joints from the root to the TCP link, excluding slaves."""
         chain = []
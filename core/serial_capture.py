@@ -0,0 +1,234 @@
+import os
+import struct
+import threading
+import time
+
+import serial
+
+# Capture file: FILE_HEADER, then one RECORD header + data per chunk written
+# to or read from the port, in the order they happened.
+#   magic 8s | wall-clock start f64 | monotonic start ns u64
+#   monotonic ns u64 | direction u8 | len u16 | data[len]
+CAPTURE_MAGIC = b"TRNCAP1\n"
+FILE_HEADER = struct.Struct("<8sdQ")
+RECORD = struct.Struct("<QBH")
+MAX_RECORD_DATA = 0xFFFF
+
+CAPTURE_TX = 0   # Host -> firmware
+CAPTURE_RX = 1   # Firmware -> host
+
+
+def capture_path_requested():
+    """
+    Capture file asked for with $TOROTRON_SERIAL_CAPTURE, or None. A path
+    is used as is; "1" records to ~/.torotron/captures/serial-<time>.trncap.
+    """
+    value = os.environ.get("TOROTRON_SERIAL_CAPTURE", "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        root = os.path.join(os.path.expanduser("~"), ".torotron", "captures")
+        return os.path.join(root, time.strftime("serial-%Y%m%d-%H%M%S.trncap"))
+    return os.path.expanduser(value)
+
+
+class SerialCapture:
+    """
+    Records the raw serial traffic to a compact binary capture file.
+
+    record() only copies into one of two preallocated buffers; a background
+    thread writes a full (or FLUSH_INTERVAL_S old) buffer to disk while
+    the other one fills, so the serial threads never wait on the disk.
+    When the flush thread falls behind and both buffers are full, new
+    records are dropped and counted instead of blocking. Files rotate like
+    logging's RotatingFileHandler: at max_bytes `path` becomes `path.1`,
+    keeping `backups` old files; every file starts with its own header.
+    Starting a capture at `path` replaces an earlier one there, backups
+    included.
+    """
+
+    FLUSH_INTERVAL_S = 0.5
+
+    def __init__(self, path, max_bytes=16 * 1024 * 1024, backups=3, buffer_size=256 * 1024):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.backups = int(backups)
+        self._buffers = [bytearray(buffer_size), bytearray(buffer_size)]
+        self._active = 0
+        self._fill = 0
+        self._full = None       # (index, length) of the buffer waiting for the flush thread
+        self._cond = threading.Condition()
+        self._closed = False
+        self.records = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self._file = None
+        self._file_size = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        for old in capture_files(path)[:-1]:
+            os.remove(old)  # Backups of an earlier capture at this path
+        self._open_file()
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    def record(self, direction, data, t_ns=None):
+        t_ns = time.monotonic_ns() if t_ns is None else t_ns
+        for start in range(0, len(data), MAX_RECORD_DATA):
+            chunk = data[start:start + MAX_RECORD_DATA]
+            size = RECORD.size + len(chunk)
+            with self._cond:
+                if self._closed:
+                    return
+                buf = self._buffers[self._active]
+                if self._fill + size > len(buf):
+                    if self._full is not None or size > len(buf):
+                        self.dropped += 1
+                        continue
+                    self._swap()
+                    buf = self._buffers[self._active]
+                RECORD.pack_into(buf, self._fill, t_ns, direction, len(chunk))
+                buf[self._fill + RECORD.size:self._fill + size] = chunk
+                self._fill += size
+                self.records += 1
+
+    def _swap(self):
+        """Hands the active buffer to the flush thread (caller holds the lock)."""
+        self._full = (self._active, self._fill)
+        self._active ^= 1
+        self._fill = 0
+        self._cond.notify_all()
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._full is not None or self._closed, self.FLUSH_INTERVAL_S)
+                if self._full is None and self._fill:
+                    self._swap()
+                full, closed = self._full, self._closed
+            if full is not None:
+                index, length = full
+                try:
+                    self._write(memoryview(self._buffers[index])[:length])
+                except Exception as e:
+                    print(f"[Capture] write failed: {e}")
+                with self._cond:
+                    self._full = None
+                    self._cond.notify_all()
+            elif closed:
+                return
+
+    def _open_file(self):
+        self._file = open(self.path, "wb")
+        self._file.write(FILE_HEADER.pack(CAPTURE_MAGIC, time.time(), time.monotonic_ns()))
+        self._file_size = FILE_HEADER.size
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._open_file()
+
+    def _write(self, data):
+        if self._file_size + len(data) > self.max_bytes and self._file_size > FILE_HEADER.size:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._file_size += len(data)
+        self.bytes_written += len(data)
+
+    def close(self):
+        """Writes out everything recorded so far and closes the file."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._fill:
+            self._write(memoryview(self._buffers[self._active])[:self._fill])
+            self._fill = 0
+        self._file.close()
+
+
+def capture_files(path):
+    """`path` and the rotated files before it that exist, oldest first."""
+    backups = []
+    while os.path.exists(f"{path}.{len(backups) + 1}"):
+        backups.append(f"{path}.{len(backups) + 1}")
+    return backups[::-1] + [path]
+
+
+def _read_capture_file(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    magic, wall_start, mono_start = FILE_HEADER.unpack_from(raw, 0)
+    if magic != CAPTURE_MAGIC:
+        raise ValueError(f"{path} is not a serial capture")
+    records = []
+    pos = FILE_HEADER.size
+    while pos + RECORD.size <= len(raw):
+        t_ns, direction, length = RECORD.unpack_from(raw, pos)
+        pos += RECORD.size
+        if pos + length > len(raw):
+            break  # Truncated by a crash mid-flush
+        records.append((t_ns, direction, raw[pos:pos + length]))
+        pos += length
+    return wall_start, mono_start, records
+
+
+def read_capture(path, rotated=True):
+    """
+    Reads a capture: (wall-clock start, [(t_s, direction, data)]), with
+    t_s in seconds since the capture was started. With `rotated` the
+    rotated files (path.N ... path.1) still on disk are read first, so the
+    records run from the oldest one kept.
+    """
+    files = capture_files(path) if rotated else [path]
+    wall_start = mono_start = None
+    records = []
+    for name in files:
+        file_wall, file_mono, file_records = _read_capture_file(name)
+        if mono_start is None:
+            wall_start, mono_start = file_wall, file_mono
+        records.extend(((t_ns - mono_start) / 1e9, direction, data) for t_ns, direction, data in file_records)
+    return wall_start, records
+
+
+def replay_capture(records, port, speed=1.0, on_rx=None, baudrate=115200):
+    """
+    Re-sends the TX records of a capture to `port` with their original
+    spacing divided by `speed` (0 sends back to back). Whatever the device
+    answers is passed to on_rx(t_s, data). Returns the number of bytes sent.
+    """
+    tx = [(t, data) for t, direction, data in records if direction == CAPTURE_TX]
+    if not tx:
+        return 0
+    sent = 0
+    stop = threading.Event()
+    with serial.Serial(port=port, baudrate=baudrate, timeout=0.1, write_timeout=1.0) as ser:
+        t0 = time.perf_counter()
+
+        def reader():
+            while not stop.is_set():
+                data = ser.read(max(1, ser.in_waiting))
+                if data and on_rx is not None:
+                    on_rx(time.perf_counter() - t0, data)
+
+        rx_thread = threading.Thread(target=reader, daemon=True)
+        rx_thread.start()
+        first = tx[0][0]
+        for t, data in tx:
+            if speed > 0:
+                delay = (t - first) / speed - (time.perf_counter() - t0)
+                if delay > 0:
+                    time.sleep(delay)
+            ser.write(data)
+            sent += len(data)
+        time.sleep(0.2)  # Let the last replies arrive
+        stop.set()
+        rx_thread.join()
+    return sent
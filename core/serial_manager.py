@@ -1,9 +1,20 @@
+import queue
 import serial
 import serial.tools.list_ports
 import threading
 import time
 from collections import defaultdict
 
+from core.serial_protocol import (
+    BOARD_QUERY, EVENT_BOARD, EVENT_CREDITS, EVENT_ERROR, EVENT_FRAME, EVENT_PONG, EVENT_PROTOCOL, EVENT_TRAJ, FRAME_POS, FRAME_SYNC,
+    FRAME_TRAJ_RESET, MAX_JOINTS_PER_FRAME, PROTOCOL_QUERY, FrameParser, decode_pos_payload, encode_frame,
+    encode_joint_frame, protocol_joint_names,
+)
+from core.joint_feedback import JointFeedbackBuffer
+from core.serial_capture import CAPTURE_RX, CAPTURE_TX, SerialCapture
+from core.link_stats import LinkStats
+from core.trajectory_streamer import TrajectoryStreamer
+
 
 ESP32_VIDS = {
     0x303A,  # Espressif native USB (S2/S3/C3)
@@ -14,23 +25,64 @@ ESP32_VIDS = {
 
 
 class SerialManager:
-    def __init__(self, main_window):
+    """
+    Owns the serial link to the ESP32.
+
+    All writes happen on one I/O thread: lines and frames are queued, and
+    joint targets are coalesced per joint (latest wins) and flushed by a
+    fixed-rate scheduler, so callers on the GUI thread never block on the
+    port. The listener thread reads the port in chunks, parses them into
+    SerialEvents and dispatches those to subscribers (see subscribe()).
+    """
+
+    TX_RATE_HZ = 50             # Joint target flushes per second
+    TX_QUEUE_MAX = 512          # Queued lines/frames before new ones are dropped
+    TEXT_LINES_PER_TICK = 4     # Text firmware parses one line at a time; don't flood its RX buffer
+    HEARTBEAT_PERIOD_S = 1.0
+    TX_LOG_INTERVAL_S = 1.0     # Binary joint frames go to the terminal at most this often
+    READ_TIMEOUT_S = 0.25       # Longest a blocking read waits; bounds how fast the listener notices a stop
+    RECONNECT_DELAYS_S = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0)  # Pauses between reconnect attempts after a replug
+
+    def __init__(self, main_window, board=None, motor_assignments=None):
         self.mw = main_window
+        self.board = board  # Set when this link drives one board of a multi-board robot
+        self.motor_assignments = motor_assignments
+        self.remote_board = None  # What the firmware says it was built for (BOARD_QUERY)
+        self.commands_blocked = False  # Set while the firmware is another board's
         self.serial_port = None
         self.is_connected = False
         self.baudrate = 115200
         self.port_name = None
         self.last_heartbeat_rx = 0
-        self.stop_heartbeat = False
+        self.stop_io = False
         self.stop_listener = False
-        self._write_lock = threading.Lock()
+        self._tx_queue = queue.Queue(maxsize=self.TX_QUEUE_MAX)  # Encoded lines/frames, in order
+        self._pending = {}  # {joint_id: (angle, speed, force)}, flushed each scheduler tick
+        self._pending_lock = threading.Lock()
+        self._seq_lock = threading.Lock()
+        self._tx_counters = defaultdict(int)  # coalesced, dropped, deadband, lines, frames, bytes
         self._last_sent = {}  # {joint_id: (angle, speed, timestamp)}
-        self._min_send_interval_s = 0.02  # 50 Hz per joint max TX rate
         self._angle_deadband_deg = 0.1
         self._speed_deadband = 0.5
-        self._rx_counters = defaultdict(int)
+        self._refresh_interval_s = 0.5  # Unchanged targets are still resent this often (board reset, lost frame)
+        self._tx_log_time = 0.0
+        self._tx_log_skipped = 0
+        self._rx_counters = defaultdict(int)  # Events received, by kind
+        self._parser = FrameParser()
+        self._subscribers = []  # [(callback, kinds or None)]
+        self._subscribers_lock = threading.Lock()
+        self.link_stats = LinkStats()
+        self.feedback = JointFeedbackBuffer([])  # Position reports, recreated per connection
+        self._ping_seq = 0
         self.last_error = ""
         self._port_meta = {}  # {label: {device, is_esp32, vid, pid}}
+        self._reconnect_generation = 0
+        self.protocol = "text"  # "binary" once the firmware answers PROTOCOL_QUERY
+        self._tx_seq = 0
+        self._joint_index = {}  # {joint_id: protocol index}, see protocol_joint_names
+        self.trajectory = TrajectoryStreamer(self)
+        self.capture = None  # SerialCapture while recording, see start_capture()
+        self.subscribe(self._log_event)
 
     def _log(self, message):
         """Thread-safe log dispatch to MainWindow console."""
@@ -73,7 +125,7 @@ class SerialManager:
         ports = serial.tools.list_ports.comports()
 
         entries = []
-        self._port_meta = {}
+        port_meta = {}  # Swapped in whole: the port watcher calls this off the GUI thread
 
         for p in ports:
             parts = []
@@ -98,7 +150,7 @@ class SerialManager:
                 label = f"{p.device} (ESP32 Candidate | {details})"
 
             entries.append((0 if is_esp else 1, p.device, label))
-            self._port_meta[label] = {
+            port_meta[label] = {
                 "device": p.device,
                 "is_esp32": is_esp,
                 "vid": vid,
@@ -106,9 +158,10 @@ class SerialManager:
             }
 
         entries.sort(key=lambda x: (x[0], x[1]))
+        self._port_meta = port_meta
         return [entry[2] for entry in entries]
         
-    def connect(self, port_name, baudrate=115200):
+    def connect(self, port_name, baudrate=115200, attempts=5):
         """Opens the serial connection. Supports 'COMx' or 'COMx (Desc)' formats."""
         raw_port = port_name.split("(", 1)[0].strip()
         self.last_error = ""
@@ -117,13 +170,13 @@ class SerialManager:
             self.disconnect()
 
         last_exc = None
-        for attempt in range(1, 6):
+        for attempt in range(1, attempts + 1):
             try:
                 # Open with defaults first
                 self.serial_port = serial.Serial(
                     port=raw_port, 
                     baudrate=baudrate, 
-                    timeout=0.08, 
+                    timeout=self.READ_TIMEOUT_S, 
                     write_timeout=0.25
                 )
                 
@@ -148,6 +201,14 @@ class SerialManager:
                 self.last_heartbeat_rx = time.time()
                 self._last_sent.clear()
                 self._rx_counters.clear()
+                self._parser.reset()
+                self.link_stats.reset()
+                self.link_stats.connects += 1
+                self._tx_counters.clear()
+                self._clear_tx()
+                self.protocol = "text"
+                self.remote_board = None
+                self._build_joint_index()
                 self.mw.log_signal.emit(f"✅ Connected to {raw_port} @ {baudrate} baud.")
 
                 # Start a background listener thread
@@ -155,11 +216,15 @@ class SerialManager:
                 self.listener_thread = threading.Thread(target=self._listen_loop, daemon=True)
                 self.listener_thread.start()
 
-                # Start Heartbeat thread
-                self.stop_heartbeat = False
-                self.heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
-                self.heartbeat_thread.start()
+                # Start the I/O thread (TX queue, target scheduler, heartbeat)
+                self.stop_io = False
+                self.io_thread = threading.Thread(target=self._io_loop, daemon=True)
+                self.io_thread.start()
 
+                # Ask for the binary protocol; older firmware ignores this line
+                self._write_line(PROTOCOL_QUERY)
+                if self.board is not None:
+                    self._write_line(BOARD_QUERY)
                 # Initial ping to establish liveness quickly after connect
                 self._write_line("PING")
                 return True
@@ -174,7 +239,7 @@ class SerialManager:
                 self.serial_port = None
 
                 # Retries help with transient USB re-enumeration right after reset/upload.
-                if attempt < 5:
+                if attempt < attempts:
                     time.sleep(0.5 + (attempt * 0.15))
 
         self.is_connected = False
@@ -182,6 +247,74 @@ class SerialManager:
         self._log(f"Failed to connect to {port_name}: {self.last_error}")
         return False
 
+    def _build_joint_index(self):
+        joint_names = (
+            protocol_joint_names(self.mw.robot, self.motor_assignments, self.board)
+            if getattr(self.mw, "robot", None) else []
+        )
+        self._joint_index = {name: i for i, name in enumerate(joint_names)}
+        self.feedback = JointFeedbackBuffer(joint_names)
+        self._last_sent.clear()
+        self.commands_blocked = False
+
+    def set_motor_assignments(self, motor_assignments, board=None):
+        """
+        Adopts the joint -> board mapping the firmware was generated with
+        and the board this link drives (None: all joints of the robot).
+        When connected the joint indices are rebuilt right away and the
+        firmware is asked which board it was built for again.
+        """
+        self.motor_assignments = motor_assignments
+        self.board = board
+        if self.is_connected:
+            self._build_joint_index()
+            if board is not None:
+                self._write_line(BOARD_QUERY)
+
+    def connect_async(self, port_name, on_done, baudrate=115200):
+        """
+        connect() on a background thread, so its retries never block the GUI.
+        on_done(ok) is called from that thread; pass a signal's emit to get
+        back onto the GUI thread.
+        """
+        def task():
+            ok = False
+            try:
+                ok = self.connect(port_name, baudrate)
+            finally:
+                on_done(ok)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def reconnect_async(self, port_name, on_done, baudrate=None):
+        """
+        Reconnects to a port that was just plugged back in. A freshly
+        enumerated ESP32 often refuses the first opens while it boots, so
+        single-attempt connects are retried after each of RECONNECT_DELAYS_S.
+        Runs on a background thread; on_done(ok) is called from it. A newer
+        reconnect or a manual connect/disconnect cancels this one.
+        """
+        self._reconnect_generation += 1
+        generation = self._reconnect_generation
+        baudrate = baudrate or self.baudrate
+
+        def task():
+            ok = False
+            for delay in self.RECONNECT_DELAYS_S:
+                time.sleep(delay)
+                if generation != self._reconnect_generation:
+                    return
+                if self.is_connected or self.connect(port_name, baudrate, attempts=1):
+                    ok = True
+                    break
+            if generation == self._reconnect_generation:
+                on_done(ok)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def cancel_reconnect(self):
+        self._reconnect_generation += 1
+
     def _diagnose_connect_error(self, raw_port, exc):
         """Return a user-facing serial connection diagnosis with probable causes."""
         if exc is None:
@@ -218,44 +351,307 @@ class SerialManager:
     def disconnect(self):
         """Closes the serial connection."""
         self.stop_listener = True
-        self.stop_heartbeat = True
+        self.stop_io = True
         if self.serial_port and self.serial_port.is_open:
             try:
                 self.serial_port.close()
             except Exception:
                 pass
         self.is_connected = False
+        self.protocol = "text"
+        self.trajectory.cancel()
+        self._clear_tx()
         self._log("Disconnected from serial port.")
 
-    def _write_line(self, line):
-        """Thread-safe serial line write with newline termination."""
-        if not self.is_connected or not self.serial_port or not self.serial_port.is_open:
+    # ------------------------------------------------------------------
+    # TX: queue + scheduler, everything written by _io_loop
+    # ------------------------------------------------------------------
+    def _clear_tx(self):
+        with self._pending_lock:
+            self._pending.clear()
+        while True:
+            try:
+                self._tx_queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _enqueue(self, data):
+        """Queues bytes for the I/O thread; never blocks. False when dropped."""
+        if not self.is_connected:
+            return False
+        try:
+            self._tx_queue.put_nowait(data)
+        except queue.Full:
+            self._tx_counters["dropped"] += 1
             return False
-        payload = (line if line.endswith("\n") else f"{line}\n").encode("utf-8")
-        with self._write_lock:
-            self.serial_port.write(payload)
         return True
+
+    def _write_line(self, line):
+        """Queues one newline-terminated line."""
+        return self._enqueue((line if line.endswith("\n") else f"{line}\n").encode("utf-8"))
+
+    def _write_frame(self, frame):
+        """Queues one encoded binary frame."""
+        return self._enqueue(bytes(frame))
+
+    def _next_seq(self):
+        with self._seq_lock:
+            self._tx_seq = (self._tx_seq + 1) & 0xFF
+            return self._tx_seq
+
+    def _port_write(self, data, kind):
+        self.serial_port.write(data)
+        capture = self.capture
+        if capture is not None:
+            capture.record(CAPTURE_TX, data)
+        self._tx_counters[kind] += 1
+        self._tx_counters["bytes"] += len(data)
+        self.link_stats.add_tx(len(data))
+
+    def _send_ping(self):
+        """Heartbeat. Binary-capable firmware echoes a sequence number, which gives the RTT."""
+        if self.protocol != "binary":
+            self._port_write(b"PING\n", "lines")
+            return
+        self._ping_seq = (self._ping_seq + 1) & 0xFFFF
+        self.link_stats.ping_sent(self._ping_seq)
+        self._port_write(f"PING {self._ping_seq}\n".encode("ascii"), "lines")
+
+    def _io_loop(self):
+        """Writes queued data as it arrives; flushes joint targets and pings on a fixed clock."""
+        period = 1.0 / self.TX_RATE_HZ
+        next_tick = time.perf_counter()
+        next_ping = next_tick + self.HEARTBEAT_PERIOD_S
+        while not self.stop_io and self.is_connected:
+            try:
+                try:
+                    data = self._tx_queue.get(timeout=max(0.0, next_tick - time.perf_counter()))
+                except queue.Empty:
+                    data = None
+                if data is not None:
+                    self._port_write(data, "frames" if data.startswith(FRAME_SYNC) else "lines")
+
+                now = time.perf_counter()
+                if now < next_tick:
+                    continue
+                # No catch-up bursts after a stall: the next tick is one period from now
+                next_tick = max(next_tick + period, now)
+                self._flush_targets()
+                if now >= next_ping:
+                    next_ping = now + self.HEARTBEAT_PERIOD_S
+                    self._send_ping()
+            except Exception as e:
+                if self.is_connected and not self.stop_io:
+                    self._log(f"Serial Send Error: {e}")
+                    self.disconnect()
+                return
+
+    def _take_targets(self):
+        """Pending targets due this tick: everything on binary firmware, a few lines on text firmware."""
+        with self._pending_lock:
+            if self.protocol == "binary" or len(self._pending) <= self.TEXT_LINES_PER_TICK:
+                batch, self._pending = self._pending, {}
+                return batch
+            batch = {}
+            for jid in list(self._pending)[:self.TEXT_LINES_PER_TICK]:
+                batch[jid] = self._pending.pop(jid)
+            return batch
+
+    def _flush_targets(self):
+        batch = self._take_targets()
+        if not batch:
+            return
+
+        now = time.time()
+        due = []  # [(joint_id, angle, speed)]
+        for jid, (angle, speed, force) in batch.items():
+            prev = self._last_sent.get(jid)
+            if prev and not force:
+                prev_angle, prev_speed, prev_ts = prev
+                if (
+                    abs(angle - prev_angle) <= self._angle_deadband_deg and
+                    abs(speed - prev_speed) <= self._speed_deadband and
+                    (now - prev_ts) < self._refresh_interval_s
+                ):
+                    self._tx_counters["deadband"] += 1
+                    continue
+            due.append((jid, angle, speed))
+            self._last_sent[jid] = (angle, speed, now)
+
+        if self.protocol == "binary":
+            entries = [(jid, self._joint_index[jid], angle, speed) for jid, angle, speed in due if jid in self._joint_index]
+            for start in range(0, len(entries), MAX_JOINTS_PER_FRAME):
+                chunk = entries[start:start + MAX_JOINTS_PER_FRAME]
+                seq = self._next_seq()
+                self._port_write(encode_joint_frame(seq, [(index, a, s) for _, index, a, s in chunk]), "frames")
+                self._log_tx_frame(seq, chunk, now)
+            return
+
+        for jid, angle, speed in due:
+            # Format: joint_id:angle:speed\n
+            # e.g. shoulder:45.00:10.00\n
+            command = f"{jid}:{angle:.2f}:{speed:.2f}\n"
+            self._port_write(command.encode("utf-8"), "lines")
+            # Log to terminal so user can see the 'Digital Twin' signals
+            self.mw.log_signal.emit(f"📡 [TX]: {command.strip()}")
+
+    def _log_tx_frame(self, seq, chunk, now):
+        """Terminal echo of binary joint frames, throttled: at 50 Hz it would flood the log."""
+        if now - self._tx_log_time < self.TX_LOG_INTERVAL_S:
+            self._tx_log_skipped += 1
+            return
+        text = ", ".join(f"{jid}:{a:.2f}:{s:.2f}" for jid, _, a, s in chunk)
+        skipped = f" (+{self._tx_log_skipped} frames)" if self._tx_log_skipped else ""
+        self.mw.log_signal.emit(f"📡 [TX #{seq}]: {text}{skipped}")
+        self._tx_log_time = now
+        self._tx_log_skipped = 0
+
+    @property
+    def tx_stats(self):
+        """Snapshot of the TX path: queue depth, pending joints and the running counters."""
+        with self._pending_lock:
+            pending = len(self._pending)
+        stats = dict(self._tx_counters)
+        stats["queue_depth"] = self._tx_queue.qsize()
+        stats["pending_joints"] = pending
+        return stats
+
+    @property
+    def joint_index(self):
+        """{joint_id: protocol index} of the joints the firmware drives."""
+        return self._joint_index
         
+    # ------------------------------------------------------------------
+    # RX: chunked reads, parsed events, subscribers
+    # ------------------------------------------------------------------
+    def subscribe(self, callback, kinds=None):
+        """
+        Calls callback(event) for every SerialEvent (or only those whose kind
+        is in `kinds`). Callbacks run on the listener thread; GUI code should
+        forward to a Qt signal. Returns the callback, for unsubscribe().
+        """
+        with self._subscribers_lock:
+            self._subscribers.append((callback, frozenset(kinds) if kinds else None))
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._subscribers_lock:
+            self._subscribers = [(cb, kinds) for cb, kinds in self._subscribers if cb is not callback]
+
     def _listen_loop(self):
-        """Background thread to read incoming messages from ESP32."""
+        """Background thread: blocking chunked reads, no polling."""
         while not self.stop_listener and self.is_connected:
             try:
-                if self.serial_port and self.serial_port.in_waiting > 0:
-                    line = self.serial_port.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        if line.startswith("PONG") or "ACK" in line or "READY" in line or line.startswith("BOOT"):
-                            self.last_heartbeat_rx = time.time()
-                            if line.startswith("PONG"):
-                                self._rx_counters["PONG"] += 1
-                                continue
-                            if line.startswith("ACK"):
-                                self._rx_counters["ACK"] += 1
-                            
-                        # Print ESP32 messages to the main console
-                        self.mw.log_signal.emit(f"[ESP32]: {line}")
-            except Exception:
+                port = self.serial_port
+                # Blocks until at least one byte arrives (or READ_TIMEOUT_S), then takes the whole backlog
+                data = port.read(max(1, port.in_waiting))
+            except Exception as e:
+                # Unplugged or the driver went away: drop the link like a failed write does
+                if self.is_connected and not self.stop_listener:
+                    self._log(f"Serial Read Error: {e}")
+                    self.disconnect()
                 break
-            time.sleep(0.01)
+            if data:
+                capture = self.capture
+                if capture is not None:
+                    capture.record(CAPTURE_RX, data)
+                self.link_stats.add_rx(len(data))
+                for event in self._parser.events(data, time.time()):
+                    self._dispatch(event)
+
+    def _dispatch(self, event):
+        self.last_heartbeat_rx = event.t
+        self._rx_counters[event.kind] += 1
+
+        if event.kind == EVENT_PROTOCOL:
+            self.protocol = event.data
+            self._log("🔗 Firmware supports binary joint frames; using them for TX.")
+        elif event.kind == EVENT_BOARD:
+            self.remote_board = event.data
+            # Another board's sketch numbers other joints: indices sent to it would move the wrong motors
+            self.commands_blocked = self.board is not None and event.data != self.board
+            if self.commands_blocked:
+                self._log(
+                    f"⚠️ {self.port_name} runs the firmware for board {event.data}, "
+                    f"but is connected as board {self.board}. Joint commands to it are blocked; "
+                    f"check the port assignment."
+                )
+        elif event.kind in (EVENT_CREDITS, EVENT_TRAJ):
+            self.trajectory.handle_line(event.text)
+        elif event.kind == EVENT_PONG and event.data:
+            try:
+                self.link_stats.pong_received(int(event.data), event.t)
+            except ValueError:
+                pass
+        elif event.kind == EVENT_FRAME and event.data[0] == FRAME_POS:
+            try:
+                t_ms, angles = decode_pos_payload(event.data[2])
+            except Exception:
+                self._parser.parse_errors += 1
+            else:
+                self.feedback.push(event.t, t_ms, angles)
+        elif event.kind == EVENT_ERROR and event.data:
+            if event.data[0] == "CRC":
+                self.link_stats.tx_crc_errors += 1
+            elif event.data[0] == "LEN":
+                self.link_stats.tx_parse_errors += 1
+
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for callback, kinds in subscribers:
+            if kinds is not None and event.kind not in kinds:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[Serial] subscriber failed: {e}")
+
+    def _log_event(self, event):
+        """Default subscriber: firmware messages to the main console."""
+        if event.kind in (EVENT_PONG, EVENT_CREDITS, EVENT_PROTOCOL) or not event.text:
+            # Heartbeats and flow-control grants are too frequent to log
+            return
+        self.mw.log_signal.emit(f"[ESP32]: {event.text}")
+
+    def start_capture(self, path, **kwargs):
+        """
+        Records all serial traffic to `path` (see SerialCapture for the
+        size/rotation options) until stop_capture(). Survives reconnects.
+        """
+        self.stop_capture()
+        self.capture = SerialCapture(path, **kwargs)
+        self._log(f"⏺ Recording serial traffic to {path}")
+        return self.capture
+
+    def stop_capture(self):
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            capture.close()
+            self._log(f"⏹ Serial capture closed: {capture.records} records, {capture.dropped} dropped.")
+
+    def set_report_rate(self, hz):
+        """Changes how often the firmware reports joint positions (0 turns reports off)."""
+        return self._write_line(f"REPORT {max(0, int(hz))}")
+
+    def actual_joint_values(self, max_age_s=0.5):
+        """{joint_id: angle} from the newest position report, or None when none is recent."""
+        latest = self.feedback.latest()
+        if latest is None or time.time() - latest[0] > max_age_s:
+            return None
+        return latest[1]
+
+    @property
+    def link_quality(self):
+        """RTT percentiles, byte rates, error and reconnect counts (see LinkStats.snapshot)."""
+        return self.link_stats.snapshot(self._parser.crc_errors, self._parser.parse_errors)
+
+    @property
+    def rx_stats(self):
+        """Events received by kind, plus the parser's CRC and parse error counts."""
+        stats = dict(self._rx_counters)
+        stats["crc_errors"] = self._parser.crc_errors
+        stats["parse_errors"] = self._parser.parse_errors
+        return stats
 
     def send_raw(self, line):
         """Sends a raw string command to the ESP32."""
@@ -267,33 +663,54 @@ class SerialManager:
             self._log(f"Serial Send Raw Error: {e}")
 
     def send_command(self, joint_id, angle, speed=0):
-        """Sends a joint command to the ESP32: 'joint_id:angle:speed\\n'"""
+        """
+        Sets a joint target for the ESP32 ('joint_id:angle:speed\\n' on text
+        firmware, a joint frame on binary firmware). Targets are sent by the
+        I/O thread on its next tick; a newer target for the same joint
+        replaces one that has not gone out yet.
+        """
         if not self.is_connected or not self.serial_port:
             return
-            
-        try:
-            # Coalesce near-identical high-frequency commands per joint
-            now = time.time()
-            prev = self._last_sent.get(joint_id)
-            if prev:
-                prev_angle, prev_speed, prev_ts = prev
-                if (
-                    abs(angle - prev_angle) <= self._angle_deadband_deg and
-                    abs(float(speed) - prev_speed) <= self._speed_deadband and
-                    (now - prev_ts) < self._min_send_interval_s
-                ):
-                    return
+        self.send_joints({joint_id: (angle, speed)})
+
+    def send_joints(self, targets, force=False):
+        """
+        Sets several joint targets at once: {joint_id: (angle, speed)}.
+        On binary firmware they go out together in one frame per
+        MAX_JOINTS_PER_FRAME joints; joints the firmware does not address
+        (relation slaves) are skipped. force=True bypasses the deadband
+        against the last value sent. Nothing is sent while commands are
+        blocked (the firmware is another board's).
+        """
+        if not self.is_connected or not self.serial_port or self.commands_blocked:
+            return
+        with self._pending_lock:
+            for jid, (angle, speed) in targets.items():
+                if jid in self._pending:
+                    self._tx_counters["coalesced"] += 1
+                    force = force or self._pending[jid][2]
+                self._pending[jid] = (float(angle), float(speed), force)
+
+    def stream_trajectory(self, points):
+        """
+        Streams [(t_seconds, {joint_id: value})] into the firmware's
+        trajectory buffer, played back on the firmware clock from the
+        first waypoint on. Returns False when the firmware only speaks the
+        text protocol; callers then fall back to send_command.
+        """
+        if not self.is_connected or self.protocol != "binary" or self.commands_blocked:
+            return False
+        self.trajectory.start(points)
+        return True
 
-            # Format: joint_id:angle:speed\n
-            # e.g. shoulder:45.00:10.00\n
-            command = f"{joint_id}:{angle:.2f}:{speed:.2f}\n"
-            if self._write_line(command):
-                # Log to terminal so user can see the 'Digital Twin' signals
-                self.mw.log_signal.emit(f"📡 [TX]: {command.strip()}")
-            self._last_sent[joint_id] = (float(angle), float(speed), now)
-        except Exception as e:
-            self._log(f"Serial Send Error: {e}")
-            self.disconnect()
+    def stop_trajectory(self):
+        """Abandons a streamed trajectory; the firmware drops what it has buffered and holds."""
+        self.trajectory.cancel()
+        if self.is_connected and self.protocol == "binary":
+            try:
+                self._write_frame(encode_frame(FRAME_TRAJ_RESET, self._next_seq()))
+            except Exception as e:
+                self._log(f"Serial Send Error: {e}")
 
     def sync_all_to_hardware(self, speed=None):
         """Immediately broadcast the robot's current 3D state to the physical board."""
@@ -302,21 +719,10 @@ class SerialManager:
             
         self._log("📡 Initializing full hardware state sync...")
         speed = float(getattr(self.mw, 'current_speed', 50) if speed is None else speed)
-        for jid, joint in self.mw.robot.joints.items():
-            self.send_command(jid, joint.current_deg, speed=speed)
-            time.sleep(0.01) # Small gap between initial bulk messages
+        # Queued as one batch; the I/O thread paces it for text firmware
+        self.send_joints({jid: (joint.current_deg, speed) for jid, joint in self.mw.robot.joints.items()}, force=True)
         self._log("✅ All joint signals synchronized.")
 
-    def _heartbeat_loop(self):
-        """Sends a periodic 'PING' command to check if ESP32 is alive."""
-        while not self.stop_heartbeat and self.is_connected:
-            try:
-                if self.serial_port and self.serial_port.is_open:
-                    self._write_line("PING")
-            except:
-                pass
-            time.sleep(1.0)
-
     @property
     def is_alive(self):
         """Returns True if we've heard from the ESP32 in the last 5 seconds."""
@@ -0,0 +1,265 @@
+import os
+import threading
+
+from core.serial_manager import SerialManager
+from core.serial_protocol import board_ids, joint_board, protocol_joint_names
+
+
+class SerialConnectionPool:
+    """
+    Serial links to a robot whose joints are split across several boards.
+
+    Joints are mapped to boards by motor_assignments[joint]["board"] (the
+    same mapping generate_board_firmwares builds the sketches from) and
+    each board gets its own SerialManager: its own I/O thread, coalescing
+    TX scheduler, heartbeat and listener. Targets are split per board and
+    handed to every board's scheduler at once, so each board's frames go
+    out in parallel and a slow or stalled board only delays its own joints.
+    The motion calls mirror SerialManager's.
+
+    The main window uses the pool as its serial_mgr. A robot on one board
+    gets a single link addressing the whole robot, as before; calls about
+    "the" port (port_name, get_available_ports, ...) go to the link of the
+    lowest board, the primary.
+    """
+
+    def __init__(self, main_window, motor_assignments=None):
+        self.mw = main_window
+        self.managers = {}      # {board: SerialManager}
+        self._joint_board = {}  # {joint_id: board}
+        self._capture_path = None
+        self.set_motor_assignments(motor_assignments)
+
+    def set_motor_assignments(self, motor_assignments):
+        """Re-maps joints to boards; links of boards that no longer drive any joint are closed."""
+        self.motor_assignments = dict(motor_assignments or {})
+        robot = getattr(self.mw, "robot", None)
+        boards = board_ids(robot, self.motor_assignments) if robot is not None else [0]
+        multi = len(boards) > 1
+        for board in list(self.managers):
+            if board not in boards:
+                sm = self.managers.pop(board)
+                if sm.is_connected:
+                    sm.disconnect()
+                sm.stop_capture()
+        for board in boards:
+            sm = self.managers.get(board)
+            if sm is None:
+                sm = self.managers[board] = SerialManager(self.mw)
+                if self._capture_path:
+                    sm.start_capture(self._board_capture_path(board))
+            # A single board runs the whole-robot sketch and its indices
+            sm.set_motor_assignments(self.motor_assignments, board if multi else None)
+        names = protocol_joint_names(robot) if robot is not None else []
+        self._joint_board = {
+            name: joint_board(self.motor_assignments, name) if multi else boards[0] for name in names
+        }
+
+    @property
+    def is_multi_board(self):
+        return len(self.managers) > 1
+
+    @property
+    def boards(self):
+        return sorted(self.managers)
+
+    @property
+    def primary(self):
+        """Link of the lowest board; the only one for a single-board robot."""
+        return self.managers[min(self.managers)]
+
+    def manager(self, board=None):
+        """SerialManager of `board` (the primary for None or an unknown board)."""
+        return self.managers.get(board) or self.primary
+
+    def board_of(self, joint_id):
+        """Board that drives `joint_id`, or None for joints no board addresses (relation slaves)."""
+        if not self.is_multi_board:
+            return min(self.managers)  # The whole-robot sketch also takes slaves by name
+        return self._joint_board.get(joint_id)
+
+    # ------------------------------------------------------------------
+    # Ports (the primary's, for a single port choice)
+    # ------------------------------------------------------------------
+    def get_available_ports(self):
+        return self.primary.get_available_ports()
+
+    def is_esp32_label(self, label):
+        return self.primary.is_esp32_label(label)
+
+    @property
+    def port_name(self):
+        return self.primary.port_name
+
+    @property
+    def port_names(self):
+        """{board: port} of the connected boards."""
+        return {board: sm.port_name for board, sm in self.managers.items() if sm.is_connected}
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+    def connect(self, ports, baudrate=115200):
+        """
+        Opens {board: port} in parallel (each connect may retry for a few
+        seconds); returns {board: connected}.
+        """
+        self.set_motor_assignments(self.motor_assignments)  # Joints may have changed since
+        results = {}
+
+        def task(board, port):
+            results[board] = self.managers[board].connect(port, baudrate)
+
+        threads = [
+            threading.Thread(target=task, args=(board, port), daemon=True)
+            for board, port in ports.items() if board in self.managers
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def connect_async(self, ports, on_done, baudrate=115200):
+        """connect() on a background thread; on_done({board: connected}) is called from it."""
+        threading.Thread(target=lambda: on_done(self.connect(ports, baudrate)), daemon=True).start()
+
+    def reconnect_async(self, board, port_name, on_done):
+        """Re-opens one board's link (after a replug or upload) with its SerialManager.reconnect_async."""
+        self.manager(board).reconnect_async(port_name, on_done)
+
+    def cancel_reconnect(self):
+        for sm in self.managers.values():
+            sm.cancel_reconnect()
+
+    def disconnect(self, board=None):
+        """Closes every link, or only `board`'s."""
+        for b, sm in self.managers.items():
+            if (board is None or b == board) and sm.is_connected:
+                sm.disconnect()
+
+    @property
+    def is_connected(self):
+        """True while any board is connected; its joints can be driven."""
+        return any(sm.is_connected for sm in self.managers.values())
+
+    @property
+    def all_connected(self):
+        return all(sm.is_connected for sm in self.managers.values())
+
+    @property
+    def connected_boards(self):
+        return [board for board, sm in self.managers.items() if sm.is_connected]
+
+    @property
+    def is_alive(self):
+        """Every connected board has been heard from recently."""
+        return self.is_connected and all(sm.is_alive for sm in self.managers.values() if sm.is_connected)
+
+    # ------------------------------------------------------------------
+    # Motion, fanned out per board
+    # ------------------------------------------------------------------
+    def _split(self, values):
+        per_board = {}
+        for jid, value in values.items():
+            board = self.board_of(jid)
+            if board is not None:
+                per_board.setdefault(board, {})[jid] = value
+        return per_board
+
+    def send_command(self, joint_id, angle, speed=0):
+        sm = self.managers.get(self.board_of(joint_id))
+        if sm is not None:
+            sm.send_command(joint_id, angle, speed)
+
+    def send_joints(self, targets, force=False):
+        """{joint_id: (angle, speed)}; each board gets its share, coalesced by its own scheduler."""
+        for board, share in self._split(targets).items():
+            self.managers[board].send_joints(share, force=force)
+
+    def sync_all_to_hardware(self, speed=None):
+        if not self.is_connected or not self.mw.robot:
+            return
+        speed = float(getattr(self.mw, 'current_speed', 50) if speed is None else speed)
+        self.send_joints({jid: (joint.current_deg, speed) for jid, joint in self.mw.robot.joints.items()}, force=True)
+
+    def stream_trajectory(self, points):
+        """
+        Streams [(t_seconds, {joint_id: value})] to every board. Each board
+        plays its share on its own clock, started by its first waypoint, so
+        boards stay within one frame delivery of each other. Returns False
+        (and streams nothing) unless every board is connected and speaks
+        the binary protocol.
+        """
+        if not self.all_connected or any(sm.protocol != "binary" or sm.commands_blocked for sm in self.managers.values()):
+            return False
+        shares = {board: [] for board in self.managers}
+        for t_s, values in points:
+            split = self._split(values)
+            for board, share in shares.items():
+                share.append((t_s, split.get(board, {})))
+        for board, share in shares.items():
+            if any(values for _, values in share):
+                self.managers[board].stream_trajectory(share)
+        return True
+
+    def stop_trajectory(self):
+        for sm in self.managers.values():
+            sm.stop_trajectory()
+
+    def set_report_rate(self, hz):
+        for sm in self.managers.values():
+            if sm.is_connected:
+                sm.set_report_rate(hz)
+
+    def actual_joint_values(self, max_age_s=0.5):
+        """Newest reported angles of all boards merged, or None when no board has reported recently."""
+        merged = {}
+        for sm in self.managers.values():
+            if sm.is_connected:
+                merged.update(sm.actual_joint_values(max_age_s) or {})
+        return merged or None
+
+    # ------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------
+    @property
+    def link_quality(self):
+        """SerialManager.link_quality of the connected boards combined: worst RTTs, summed rates and counts."""
+        qualities = [sm.link_quality for sm in self.managers.values() if sm.is_connected]
+        if len(qualities) <= 1:
+            return qualities[0] if qualities else self.primary.link_quality
+        merged = {}
+        for key in qualities[0]:
+            values = [q[key] for q in qualities if q[key] is not None]
+            if key.startswith("rtt_p"):
+                merged[key] = max(values) if values else None
+            else:
+                merged[key] = sum(values)
+        return merged
+
+    @property
+    def board_link_quality(self):
+        """{board: SerialManager.link_quality}."""
+        return {board: sm.link_quality for board, sm in self.managers.items()}
+
+    @property
+    def tx_stats(self):
+        return {board: sm.tx_stats for board, sm in self.managers.items()}
+
+    def _board_capture_path(self, board):
+        if board == min(self.managers):
+            return self._capture_path
+        root, ext = os.path.splitext(self._capture_path)
+        return f"{root}-board{board}{ext}"
+
+    def start_capture(self, path, **kwargs):
+        """Records every board's traffic: the primary's to `path`, board N's to <path>-boardN.<ext>."""
+        self._capture_path = path
+        for board, sm in self.managers.items():
+            sm.start_capture(self._board_capture_path(board), **kwargs)
+
+    def stop_capture(self):
+        self._capture_path = None
+        for sm in self.managers.values():
+            sm.stop_capture()
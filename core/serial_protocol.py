@@ -0,0 +1,350 @@
+import re
+import struct
+
+# Binary frame (host <-> ESP32), little-endian:
+#   A5 5A | type u8 | seq u8 | len u8 | payload[len] | crc16 u16
+# The CRC (CRC-16/CCITT-FALSE) covers type, seq, len and the payload.
+# 0xA5 0x5A can never start a line of UTF-8 text, so frames and text lines
+# share one stream.
+FRAME_SYNC = b"\xA5\x5A"
+FRAME_HEADER = struct.Struct("<BBB")
+FRAME_CRC = struct.Struct("<H")
+FRAME_OVERHEAD = len(FRAME_SYNC) + FRAME_HEADER.size + FRAME_CRC.size
+MAX_PAYLOAD = 255
+
+# Frame types
+FRAME_JOINTS = 0x01       # count u8, then count x (index u8, angle i16, speed u16)
+FRAME_TRAJ = 0x02         # t_ms u32, count u8, then count x (index u8, angle i16)
+FRAME_TRAJ_RESET = 0x03   # empty; clears the trajectory buffer
+FRAME_POS = 0x04          # firmware -> host: t_ms u32, count u8, then count x angle i16 (index order)
+FRAME_TRAJ_END = 0x05     # empty; no waypoints follow, the last buffered one ends the trajectory
+
+# Joint entries: angle in centi-degrees, speed in hundredths of a percent
+JOINT_ENTRY = struct.Struct("<BhH")
+ANGLE_SCALE = 100.0
+SPEED_SCALE = 100.0
+MAX_JOINTS_PER_FRAME = (MAX_PAYLOAD - 1) // JOINT_ENTRY.size
+
+# Trajectory waypoints: time since trajectory start, then angles. Joints left
+# out of a waypoint keep their value from the previous one.
+TRAJ_HEADER = struct.Struct("<IB")
+TRAJ_ENTRY = struct.Struct("<Bh")
+MAX_JOINTS_PER_WAYPOINT = (MAX_PAYLOAD - TRAJ_HEADER.size) // TRAJ_ENTRY.size
+
+# Waypoint slots in the firmware ring buffer. After a FRAME_TRAJ_RESET the
+# firmware answers "TRAJ READY <slots> <seq>"; every waypoint it consumes is
+# granted back as "CREDITS <n>". Reaching the last buffered waypoint reports
+# "TRAJ DONE" once the host has sent FRAME_TRAJ_END, and "TRAJ UNDERRUN"
+# (hold, restart the clock with the next waypoint) while more are expected.
+TRAJ_SLOTS = 32
+
+# Position reports: every joint's measured/estimated angle, in protocol index
+# order, sent by the firmware at REPORT_HZ once the host has negotiated the
+# binary protocol. "REPORT <hz>" changes the rate at runtime (0 = off).
+POS_HEADER = struct.Struct("<IB")
+POS_ENTRY = struct.Struct("<h")
+REPORT_HZ = 20
+
+# Negotiation: the host asks once after connecting; firmware that speaks the
+# binary protocol answers with PROTOCOL_REPLY, older firmware ignores it and
+# the connection stays on the text protocol.
+PROTOCOL_QUERY = "PROTO?"
+PROTOCOL_REPLY = "PROTO BIN1"
+
+# Multi-board robots: every sketch knows which board it was generated for
+# and answers BOARD_QUERY with "BOARD <id>", so a pool can check its ports.
+BOARD_QUERY = "BOARD?"
+
+
+def _crc16_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16_ccitt(data, crc=0xFFFF):
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), as computed by the firmware."""
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16_TABLE[((crc >> 8) ^ byte) & 0xFF]
+    return crc
+
+
+def joint_board(motor_assignments, joint_name):
+    """Board (controller) a joint's motor is wired to: motor_assignments[joint]["board"], 0 by default."""
+    data = (motor_assignments or {}).get(joint_name)
+    if isinstance(data, dict):
+        try:
+            return int(data.get("board", 0))
+        except (TypeError, ValueError):
+            return 0
+    return 0
+
+
+def protocol_joint_names(robot, motor_assignments=None, board=None):
+    """
+    Joints addressed by the firmware, in protocol index order: every joint
+    that is not a relation slave, in the robot's joint order. The firmware
+    generator uses the same list, so index i means the same joint on both ends.
+    With `board` given, only that board's joints (see joint_board) are
+    listed and indices are per board.
+    """
+    slave_ids = {s_id for slaves in robot.joint_relations.values() for s_id, _ in slaves}
+    names = [name for name in robot.joints if name not in slave_ids]
+    if board is None:
+        return names
+    return [name for name in names if joint_board(motor_assignments, name) == board]
+
+
+def board_ids(robot, motor_assignments=None):
+    """Sorted ids of the boards that drive at least one joint ([0] for a single-board robot)."""
+    return sorted({joint_board(motor_assignments, name) for name in protocol_joint_names(robot)}) or [0]
+
+
+def encode_frame(frame_type, seq, payload=b""):
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Frame payload too large ({len(payload)} > {MAX_PAYLOAD} bytes)")
+    body = FRAME_HEADER.pack(frame_type & 0xFF, seq & 0xFF, len(payload)) + bytes(payload)
+    return FRAME_SYNC + body + FRAME_CRC.pack(crc16_ccitt(body))
+
+
+def _fixed(value, scale, lo, hi):
+    return max(lo, min(hi, int(round(float(value) * scale))))
+
+
+def encode_joint_payload(entries):
+    """entries: iterable of (index, angle_deg, speed_pct)."""
+    entries = list(entries)
+    if len(entries) > MAX_JOINTS_PER_FRAME:
+        raise ValueError(f"At most {MAX_JOINTS_PER_FRAME} joints fit in one frame")
+    out = bytearray([len(entries)])
+    for index, angle, speed in entries:
+        out += JOINT_ENTRY.pack(
+            int(index),
+            _fixed(angle, ANGLE_SCALE, -32768, 32767),
+            _fixed(speed, SPEED_SCALE, 0, 65535),
+        )
+    return bytes(out)
+
+
+def decode_joint_payload(payload):
+    """Inverse of encode_joint_payload: [(index, angle_deg, speed_pct)]."""
+    count = payload[0] if payload else 0
+    entries = []
+    for k in range(count):
+        index, angle, speed = JOINT_ENTRY.unpack_from(payload, 1 + k * JOINT_ENTRY.size)
+        entries.append((index, angle / ANGLE_SCALE, speed / SPEED_SCALE))
+    return entries
+
+
+def encode_joint_frame(seq, entries):
+    return encode_frame(FRAME_JOINTS, seq, encode_joint_payload(entries))
+
+
+def encode_traj_payload(t_ms, entries):
+    """entries: iterable of (index, angle_deg) for the waypoint at `t_ms`."""
+    entries = list(entries)
+    if len(entries) > MAX_JOINTS_PER_WAYPOINT:
+        raise ValueError(f"At most {MAX_JOINTS_PER_WAYPOINT} joints fit in one waypoint")
+    out = bytearray(TRAJ_HEADER.pack(int(t_ms) & 0xFFFFFFFF, len(entries)))
+    for index, angle in entries:
+        out += TRAJ_ENTRY.pack(int(index), _fixed(angle, ANGLE_SCALE, -32768, 32767))
+    return bytes(out)
+
+
+def decode_traj_payload(payload):
+    """Inverse of encode_traj_payload: (t_ms, [(index, angle_deg)])."""
+    t_ms, count = TRAJ_HEADER.unpack_from(payload, 0)
+    entries = []
+    for k in range(count):
+        index, angle = TRAJ_ENTRY.unpack_from(payload, TRAJ_HEADER.size + k * TRAJ_ENTRY.size)
+        entries.append((index, angle / ANGLE_SCALE))
+    return t_ms, entries
+
+
+def encode_traj_frame(seq, t_ms, entries):
+    return encode_frame(FRAME_TRAJ, seq, encode_traj_payload(t_ms, entries))
+
+
+def encode_pos_payload(t_ms, angles):
+    """Position report payload, as the firmware builds it: angles in index order."""
+    angles = list(angles)
+    out = bytearray(POS_HEADER.pack(int(t_ms) & 0xFFFFFFFF, len(angles)))
+    for angle in angles:
+        out += POS_ENTRY.pack(_fixed(angle, ANGLE_SCALE, -32768, 32767))
+    return bytes(out)
+
+
+def decode_pos_payload(payload):
+    """(t_ms, [angle_deg per protocol index]) of a FRAME_POS payload."""
+    t_ms, count = POS_HEADER.unpack_from(payload, 0)
+    count = min(count, (len(payload) - POS_HEADER.size) // POS_ENTRY.size)
+    angles = struct.unpack_from(f"<{count}h", payload, POS_HEADER.size)
+    return t_ms, [a / ANGLE_SCALE for a in angles]
+
+
+# ----------------------------------------------------------------------
+# Receive path
+# ----------------------------------------------------------------------
+# Event kinds produced by FrameParser.events()
+EVENT_PONG = "pong"
+EVENT_ACK = "ack"
+EVENT_READY = "ready"           # Boot banner ("READY", "BOOT...", "... Online")
+EVENT_PROTOCOL = "protocol"     # PROTOCOL_REPLY
+EVENT_FEEDBACK = "feedback"     # Per-joint echo of an applied target
+EVENT_CREDITS = "credits"       # data: granted slots
+EVENT_TRAJ = "traj"             # "TRAJ READY/DONE ..."
+EVENT_ERROR = "error"           # "ERR ..." from the firmware
+EVENT_FRAME = "frame"           # data: (frame type, seq, payload)
+EVENT_BOARD = "board"           # data: board id the firmware was built for
+EVENT_TEXT = "text"             # Anything else the firmware prints
+
+_FEEDBACK_SERVO = re.compile(r"\[HW\] Pin (-?\d+) -> Angle: (-?[\d.]+)")
+_FEEDBACK_STEPPER = re.compile(r"\[HW\] Stepper '([^']*)' -> Steps: (-?\d+)")
+
+
+class SerialEvent:
+    """One message from the firmware: its kind, the raw text (if any) and parsed data."""
+
+    __slots__ = ("kind", "text", "data", "t")
+
+    def __init__(self, kind, text="", data=None, t=0.0):
+        self.kind = kind
+        self.text = text
+        self.data = data
+        self.t = t
+
+    def __repr__(self):
+        return f"SerialEvent({self.kind!r}, {self.text!r}, {self.data!r})"
+
+
+def parse_line(line, t=0.0):
+    """Classifies one text line from the firmware into a SerialEvent."""
+    if line.startswith("PONG"):
+        return SerialEvent(EVENT_PONG, line, line[4:].strip() or None, t)
+    if line == PROTOCOL_REPLY:
+        return SerialEvent(EVENT_PROTOCOL, line, "binary", t)
+    if line.startswith("CREDITS"):
+        try:
+            return SerialEvent(EVENT_CREDITS, line, int(line.split()[1]), t)
+        except (IndexError, ValueError):
+            return SerialEvent(EVENT_ERROR, line, None, t)
+    if line.startswith("TRAJ "):
+        return SerialEvent(EVENT_TRAJ, line, line.split()[1:], t)
+    if line.startswith("ERR"):
+        return SerialEvent(EVENT_ERROR, line, line.split()[1:], t)
+    if line.startswith("BOARD "):
+        try:
+            return SerialEvent(EVENT_BOARD, line, int(line.split()[1]), t)
+        except (IndexError, ValueError):
+            return SerialEvent(EVENT_TEXT, line, None, t)
+    if line.startswith("ACK"):
+        return SerialEvent(EVENT_ACK, line, line[3:].strip() or None, t)
+    if "READY" in line or line.startswith("BOOT") or line.endswith("Online"):
+        return SerialEvent(EVENT_READY, line, None, t)
+    m = _FEEDBACK_SERVO.search(line)
+    if m:
+        return SerialEvent(EVENT_FEEDBACK, line, {"pin": int(m.group(1)), "angle": float(m.group(2))}, t)
+    m = _FEEDBACK_STEPPER.search(line)
+    if m:
+        return SerialEvent(EVENT_FEEDBACK, line, {"joint": m.group(1), "steps": int(m.group(2))}, t)
+    return SerialEvent(EVENT_TEXT, line, None, t)
+
+
+class FrameParser:
+    """
+    Splits the firmware's byte stream into text lines and binary frames.
+
+    feed() takes whatever chunk the port returned and yields complete
+    messages only; partial lines and frames wait for the next chunk.
+    Frames are only recognised at a message boundary, like the firmware
+    does on its side; text is plain ASCII, so a sync pair inside what
+    looks like a line also starts a frame. A frame with a bad CRC is
+    dropped and counted in crc_errors. Parsing resumes where its length
+    says it ends when a sync pair or text follows there, otherwise at the
+    next sync pair, never right after its sync bytes, so its payload is
+    not taken for text. Fragments cut short by a frame and unterminated
+    lines over MAX_LINE bytes are discarded and counted in parse_errors.
+    """
+
+    MAX_LINE = 1024
+
+    def __init__(self):
+        self._buf = bytearray()
+        self.crc_errors = 0
+        self.parse_errors = 0
+
+    def reset(self):
+        self._buf.clear()
+
+    def feed(self, data):
+        """Yields ("line", str) and ("frame", (type, seq, payload)) in stream order."""
+        buf = self._buf
+        buf += data
+        while buf:
+            if buf[0] == FRAME_SYNC[0]:
+                if len(buf) < 2:
+                    return
+                if buf[1] == FRAME_SYNC[1]:
+                    if len(buf) < len(FRAME_SYNC) + FRAME_HEADER.size:
+                        return
+                    frame_type, seq, length = FRAME_HEADER.unpack_from(buf, len(FRAME_SYNC))
+                    total = FRAME_OVERHEAD + length
+                    if len(buf) < total:
+                        return
+                    body = bytes(buf[len(FRAME_SYNC):total - FRAME_CRC.size])
+                    (crc,) = FRAME_CRC.unpack_from(buf, total - FRAME_CRC.size)
+                    if crc16_ccitt(body) == crc:
+                        del buf[:total]
+                        yield "frame", (frame_type, seq, body[FRAME_HEADER.size:])
+                    else:
+                        self.crc_errors += 1
+                        del buf[:self._resync_point(buf, total)]
+                    continue
+
+            end = buf.find(b"\n")
+            sync = buf.find(FRAME_SYNC, 1)
+            if sync >= 0 and (end < 0 or sync < end):
+                self.parse_errors += 1
+                del buf[:sync]
+                continue
+            if end < 0:
+                if len(buf) > self.MAX_LINE:
+                    self.parse_errors += 1
+                    buf.clear()
+                return
+            line = buf[:end].decode("utf-8", errors="ignore").strip()
+            del buf[:end + 1]
+            if line:
+                yield "line", line
+
+    @staticmethod
+    def _resync_point(buf, total):
+        """Where parsing resumes after the corrupt frame of `total` bytes at the start of `buf`."""
+        # Payload or CRC damage: the length was right if a message starts where it points
+        tail = bytes(buf[total:total + MAX_PAYLOAD])
+        line = tail.split(b"\n", 1)[0]
+        if tail.startswith(FRAME_SYNC) or all(0x20 <= b < 0x7F or b == 0x0D for b in line):
+            return total
+        # Header damage: skip to the next sync pair
+        sync = buf.find(FRAME_SYNC, len(FRAME_SYNC))
+        if sync >= 0:
+            return sync
+        # None yet: drop what arrived, but keep a trailing first sync byte
+        return len(buf) - 1 if buf[-1] == FRAME_SYNC[0] else len(buf)
+
+    def events(self, data, t=0.0):
+        """feed(), with every message turned into a SerialEvent stamped `t`."""
+        out = []
+        for kind, item in self.feed(data):
+            if kind == "frame":
+                out.append(SerialEvent(EVENT_FRAME, "", item, t))
+            else:
+                out.append(parse_line(item, t))
+        return out
@@ -0,0 +1,144 @@
+import threading
+import time
+
+from core.serial_protocol import FRAME_TRAJ_END, FRAME_TRAJ_RESET, TRAJ_SLOTS, encode_frame, encode_traj_frame
+
+
+def linear_trajectory(start_vals, target_vals, steps, step_delay):
+    """
+    Evenly timed waypoints from start_vals to target_vals:
+    [(t_seconds, {joint: value})], the first one being the start pose.
+    This is the same interpolation the 3D view animates, so streaming it
+    keeps hardware and view on one timeline.
+    """
+    steps = max(1, int(steps))
+    points = []
+    for i in range(steps + 1):
+        a = i / steps
+        values = {}
+        for n, v0 in start_vals.items():
+            v1 = target_vals.get(n, v0)
+            values[n] = float(v0 + (v1 - v0) * a)
+        points.append((i * float(step_delay), values))
+    return points
+
+
+class TrajectoryStreamer:
+    """
+    Streams time-stamped waypoints into the firmware's trajectory buffer.
+
+    Flow control is credit based: after a reset the firmware grants
+    TRAJ_SLOTS credits, each waypoint sent spends one and each waypoint the
+    firmware plays back is granted again ("CREDITS <n>"), so the host never
+    overruns the buffer. A waypoint the TX queue drops gets its credit back
+    and is queued again. After the last waypoint a FRAME_TRAJ_END tells the
+    firmware the buffer running empty is the end ("TRAJ DONE") rather than
+    the host falling behind. Sending runs on its own thread; starting a new
+    trajectory (or cancel()) abandons the one in progress.
+    """
+
+    READY_TIMEOUT_S = 1.0
+    CREDIT_TIMEOUT_S = 2.0
+    REQUEUE_DELAY_S = 0.01  # TX queue full: wait this long before queuing a frame again
+
+    def __init__(self, serial_mgr):
+        self.sm = serial_mgr
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._reset_seq = None   # seq of the reset frame the next READY must echo
+        self._ready = False
+        self._credits = 0
+
+    def handle_line(self, line):
+        """Consumes the firmware's trajectory replies; returns False for other lines."""
+        parts = line.split()
+        if not parts:
+            return False
+        with self._cond:
+            if parts[0] == "CREDITS" and len(parts) >= 2:
+                self._credits += int(parts[1])
+            elif parts[:2] == ["TRAJ", "READY"]:
+                seq = int(parts[3]) if len(parts) >= 4 else None
+                if seq is not None and seq != self._reset_seq:
+                    return True  # Reply to an abandoned reset
+                self._credits = int(parts[2]) if len(parts) >= 3 else TRAJ_SLOTS
+                self._ready = True
+            elif parts[:2] in (["TRAJ", "DONE"], ["TRAJ", "UNDERRUN"]):
+                pass
+            else:
+                return False
+            self._cond.notify_all()
+        return True
+
+    def start(self, points):
+        """Streams [(t_seconds, {joint: value})] in the background."""
+        with self._cond:
+            self._generation += 1
+            generation = self._generation
+            self._ready = False
+            self._credits = 0
+            self._cond.notify_all()
+        threading.Thread(target=self._run, args=(generation, list(points)), daemon=True).start()
+
+    def cancel(self):
+        with self._cond:
+            self._generation += 1
+            self._cond.notify_all()
+
+    def _stale(self, generation):
+        return generation != self._generation or not self.sm.is_connected
+
+    def _requeue_wait(self, generation, deadline):
+        """Pause before queuing a dropped frame again; False when the stream should stop."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._stale(generation), self.REQUEUE_DELAY_S)
+            if self._stale(generation):
+                return False
+        if time.monotonic() > deadline:
+            self.sm._log("⚠️ [TRAJ] Serial TX queue stayed full; trajectory stream stopped.")
+            return False
+        return True
+
+    def _run(self, generation, points):
+        index = dict(self.sm.joint_index)
+        with self._cond:
+            seq = self.sm._next_seq()
+            self._reset_seq = seq
+        try:
+            if not self.sm._write_frame(encode_frame(FRAME_TRAJ_RESET, seq)):
+                return
+            with self._cond:
+                if not self._cond.wait_for(lambda: self._stale(generation) or self._ready, self.READY_TIMEOUT_S):
+                    self.sm._log("⚠️ [TRAJ] Firmware did not acknowledge the trajectory reset.")
+                    return
+
+            for t_s, values in points:
+                entries = [(index[n], v) for n, v in values.items() if n in index]
+                t_ms = int(round(t_s * 1000.0))
+                deadline = time.monotonic() + self.CREDIT_TIMEOUT_S
+                while True:
+                    with self._cond:
+                        ok = self._cond.wait_for(
+                            lambda: self._stale(generation) or self._credits > 0, self.CREDIT_TIMEOUT_S
+                        )
+                        if self._stale(generation):
+                            return
+                        if not ok:
+                            self.sm._log("⚠️ [TRAJ] No credits from firmware; trajectory stream stopped.")
+                            return
+                        self._credits -= 1
+                        seq = self.sm._next_seq()
+                    if self.sm._write_frame(encode_traj_frame(seq, t_ms, entries)):
+                        break
+                    # Dropped before it reached the port: the firmware never spends this credit
+                    with self._cond:
+                        self._credits += 1
+                    if not self._requeue_wait(generation, deadline):
+                        return
+
+            deadline = time.monotonic() + self.CREDIT_TIMEOUT_S
+            while not self.sm._write_frame(encode_frame(FRAME_TRAJ_END, self.sm._next_seq())):
+                if not self._requeue_wait(generation, deadline):
+                    return
+        except Exception as e:
+            self.sm._log(f"Serial Trajectory Error: {e}")
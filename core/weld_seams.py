@@ -0,0 +1,258 @@
+import numpy as np
+
+from core.feature_edges import FeatureEdgeIndex
+
+
+def _points_to_triangles(points, tris, chunk_elems=2_000_000):
+    """
+    Vectorized point-to-triangle distance.
+
+    Returns (distance, triangle index) of the closest triangle for every point.
+    Work is chunked so the (points x triangles) temporaries stay bounded.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    n_pts, n_tris = len(points), len(tris)
+    best_d = np.full(n_pts, np.inf)
+    best_t = np.full(n_pts, -1, dtype=np.int64)
+    if n_pts == 0 or n_tris == 0:
+        return best_d, best_t
+
+    a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+    ab, ac = b - a, c - a
+    normal = np.cross(ab, ac)
+    n_len = np.linalg.norm(normal, axis=1)
+    unit_n = np.divide(normal, n_len[:, None], out=np.zeros_like(normal), where=n_len[:, None] > 1e-12)
+
+    # Barycentric setup shared by every point
+    d00 = np.einsum("ij,ij->i", ab, ab)
+    d01 = np.einsum("ij,ij->i", ab, ac)
+    d11 = np.einsum("ij,ij->i", ac, ac)
+    denom = d00 * d11 - d01 * d01
+    denom = np.where(np.abs(denom) < 1e-18, np.inf, denom)
+
+    def _seg_dist(p, s0, s1):
+        seg = s1 - s0
+        seg_len2 = np.maximum(np.einsum("kj,kj->k", seg, seg), 1e-18)
+        t = np.clip(np.einsum("pkj,kj->pk", p[:, None, :] - s0[None], seg) / seg_len2, 0.0, 1.0)
+        closest = s0[None] + t[..., None] * seg[None]
+        return np.linalg.norm(p[:, None, :] - closest, axis=2)
+
+    step = max(1, int(chunk_elems // max(n_tris, 1)))
+    for start in range(0, n_pts, step):
+        p = points[start:start + step]
+        ap = p[:, None, :] - a[None]
+        plane_d = np.einsum("pkj,kj->pk", ap, unit_n)
+
+        d20 = np.einsum("pkj,kj->pk", ap, ab)
+        d21 = np.einsum("pkj,kj->pk", ap, ac)
+        v = (d11 * d20 - d01 * d21) / denom
+        w = (d00 * d21 - d01 * d20) / denom
+        inside = (v >= 0.0) & (w >= 0.0) & (v + w <= 1.0)
+
+        edge_d = np.minimum(np.minimum(_seg_dist(p, a, b), _seg_dist(p, b, c)), _seg_dist(p, c, a))
+        dist = np.where(inside, np.abs(plane_d), edge_d)
+
+        idx = np.argmin(dist, axis=1)
+        best_t[start:start + step] = idx
+        best_d[start:start + step] = dist[np.arange(len(p)), idx]
+
+    return best_d, best_t
+
+
+def _world_aabb(points_world, pad=0.0):
+    lo = points_world.min(axis=0) - pad
+    hi = points_world.max(axis=0) + pad
+    return lo, hi
+
+
+def _aabb_overlap(box_a, box_b):
+    return bool(np.all(box_a[0] <= box_b[1]) and np.all(box_b[0] <= box_a[1]))
+
+
+def _runs(mask):
+    """Yields (start, stop) index pairs of consecutive True values."""
+    start = None
+    for i, flag in enumerate(mask):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            yield start, i
+            start = None
+    if start is not None:
+        yield start, len(mask)
+
+
+def _covered_by(points, polylines, tol):
+    """True when every point lies within `tol` of one of the polylines."""
+    tol = max(tol, 1e-9)
+    for line in polylines:
+        if len(line) < 2:
+            continue
+        s0, s1 = line[:-1], line[1:]
+        seg = s1 - s0
+        seg_len2 = np.maximum(np.einsum("kj,kj->k", seg, seg), 1e-18)
+        t = np.clip(np.einsum("pkj,kj->pk", points[:, None, :] - s0[None], seg) / seg_len2, 0.0, 1.0)
+        closest = s0[None] + t[..., None] * seg[None]
+        if np.all(np.linalg.norm(points[:, None, :] - closest, axis=2).min(axis=1) <= tol):
+            return True
+    return False
+
+
+def _polyline_length(points):
+    if len(points) < 2:
+        return 0.0
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+
+def detect_weld_seams(parts, contact_tol, min_length=0.0, indices=None, progress=None, cancel=None):
+    """
+    Finds weld seams over a whole assembly in one pass.
+
+    parts:    list of (name, vertices_local, faces, t_world)
+    indices:  optional {name: FeatureEdgeIndex} already built for those meshes
+    progress: optional callable(done, total, message)
+    cancel:   optional callable() -> bool, checked between parts
+
+    Two kinds of seams are reported:
+      - "concave": inside-corner feature seams of a single part (an assembly
+        imported as one mesh, or a part with a machined fillet groove);
+      - "contact": feature seams of one part lying on the surface of another
+        part within `contact_tol` (e.g. a plate standing on a base plate).
+
+    Returns (seams, indices). Each seam is a dict with link, contact_link,
+    kind, closed, points_world, normals_local (face A/B in the link frame)
+    and dihedral_deg. `indices` includes any index built here so callers can
+    cache it.
+    """
+    indices = dict(indices or {})
+    total = len(parts) * 2
+    done = 0
+
+    def _report(message):
+        if progress is not None:
+            progress(done, total, message)
+
+    # --- 1. Per-part feature indices + world-space geometry ---
+    world = {}
+    for name, verts, faces, t_world in parts:
+        if cancel is not None and cancel():
+            return [], indices
+        index = indices.get(name)
+        if index is None:
+            index = FeatureEdgeIndex(verts, faces)
+            indices[name] = index
+        t_world = np.asarray(t_world, dtype=float)
+        verts_w = (t_world[:3, :3] @ index.vertices.T).T + t_world[:3, 3]
+        world[name] = {
+            "index": index,
+            "t_world": t_world,
+            "verts_w": verts_w,
+            "tris_w": verts_w[index.faces] if len(index.faces) else np.zeros((0, 3, 3)),
+            "aabb": _world_aabb(verts_w, contact_tol) if len(verts_w) else None,
+        }
+        done += 1
+        _report(f"Indexed {name}: {len(index)} feature seam(s)")
+
+    seams = []
+
+    # --- 2. Concave seams inside each part ---
+    for name, data in world.items():
+        index = data["index"]
+        for pid in range(len(index)):
+            if not index.seam_is_concave(pid):
+                continue
+            pts_w = data["verts_w"][index.polylines[pid]]
+            if _polyline_length(pts_w) < min_length:
+                continue
+            n_a, n_b, dihedral = index.seam_normals(pid)
+            seams.append({
+                "link": name,
+                "contact_link": None,
+                "kind": "concave",
+                "closed": bool(index.closed[pid]),
+                "points_world": pts_w,
+                "normals_local": [n_a, n_b],
+                "dihedral_deg": dihedral,
+            })
+
+    # --- 3. Contact seams between parts ---
+    names = list(world.keys())
+    pair_seams = {}  # {frozenset((a, b)): [points_world of seams already reported]}
+    for name_a in names:
+        if cancel is not None and cancel():
+            return seams, indices
+        data_a = world[name_a]
+        index_a = data_a["index"]
+        rot_a = data_a["t_world"][:3, :3]
+
+        for name_b in names:
+            if name_b == name_a:
+                continue
+            data_b = world[name_b]
+            if data_a["aabb"] is None or data_b["aabb"] is None:
+                continue
+            if not _aabb_overlap(data_a["aabb"], data_b["aabb"]) or len(data_b["tris_w"]) == 0:
+                continue
+
+            # Only B triangles near A matter; cull by AABB before the N x M test
+            tris_b = data_b["tris_w"]
+            lo, hi = data_a["aabb"]
+            tri_lo, tri_hi = tris_b.min(axis=1), tris_b.max(axis=1)
+            near = np.all(tri_lo <= hi, axis=1) & np.all(tri_hi >= lo, axis=1)
+            if not np.any(near):
+                continue
+            tris_b = tris_b[near]
+            tri_ids_b = np.flatnonzero(near)
+            # FeatureEdgeIndex normals live in B's own frame
+            face_normals_b = data_b["index"].face_normals @ data_b["t_world"][:3, :3].T
+
+            for pid in range(len(index_a)):
+                pts_w = data_a["verts_w"][index_a.polylines[pid]]
+                if len(pts_w) < 2:
+                    continue
+                if not (np.all(pts_w.max(axis=0) >= data_b["aabb"][0]) and np.all(pts_w.min(axis=0) <= data_b["aabb"][1])):
+                    continue
+
+                mids = 0.5 * (pts_w[:-1] + pts_w[1:])
+                d_pts, _ = _points_to_triangles(pts_w, tris_b)
+                d_mid, t_mid = _points_to_triangles(mids, tris_b)
+                seg_contact = (d_pts[:-1] <= contact_tol) & (d_pts[1:] <= contact_tol) & (d_mid <= contact_tol)
+
+                for start, stop in _runs(seg_contact):
+                    run_pts = pts_w[start:stop + 1]
+                    if _polyline_length(run_pts) < min_length:
+                        continue
+
+                    # B's surface normal along the run (world), expressed in A's frame
+                    n_b_world = face_normals_b[tri_ids_b[t_mid[start:stop]]].mean(axis=0)
+                    n_b_norm = np.linalg.norm(n_b_world)
+                    if n_b_norm < 1e-9:
+                        continue
+                    n_b_local = rot_a.T @ (n_b_world / n_b_norm)
+
+                    # Of A's two faces at this seam, the one pressed against B
+                    # is the most anti-parallel to B's normal; the other one is
+                    # the visible side that forms the weld corner with B.
+                    n_1, n_2, _ = index_a.seam_normals(pid, segment_range=(start, stop))
+                    side = n_2 if np.dot(n_1, n_b_local) < np.dot(n_2, n_b_local) else n_1
+                    dihedral = float(np.degrees(np.arccos(np.clip(np.dot(side, n_b_local), -1.0, 1.0))))
+
+                    # B-on-A already reported this joint from the other side
+                    if _covered_by(run_pts, pair_seams.get(frozenset((name_a, name_b)), []), contact_tol):
+                        continue
+                    seam = {
+                        "link": name_a,
+                        "contact_link": name_b,
+                        "kind": "contact",
+                        "closed": bool(index_a.closed[pid]) and start == 0 and stop == len(seg_contact),
+                        "points_world": run_pts,
+                        "normals_local": [side, n_b_local],
+                        "dihedral_deg": dihedral,
+                    }
+                    seams.append(seam)
+                    pair_seams.setdefault(frozenset((name_a, name_b)), []).append(run_pts)
+
+        done += 1
+        _report(f"Checked contacts for {name_a}")
+
+    return seams, indices
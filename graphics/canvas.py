@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 from PyQt5 import QtWidgets, QtCore, QtGui
+import contextlib
+import time
 import numpy as np
 
+from core.feature_edges import FeatureEdgeIndex
+
 pv = None
 QtInteractor = None
 vtkRenderingCore = None
 vtkCommonCore = None
+vtkCommonDataModel = None
 
 
 def _ensure_3d_imports():
-    global pv, QtInteractor, vtkRenderingCore, vtkCommonCore
+    global pv, QtInteractor, vtkRenderingCore, vtkCommonCore, vtkCommonDataModel
     if pv is not None:
         return
 
@@ -18,11 +23,13 @@ def _ensure_3d_imports():
     from pyvistaqt import QtInteractor as _QtInteractor
     import vtkmodules.vtkRenderingCore as _vtkRenderingCore
     import vtkmodules.vtkCommonCore as _vtkCommonCore
+    import vtkmodules.vtkCommonDataModel as _vtkCommonDataModel
 
     pv = _pv
     QtInteractor = _QtInteractor
     vtkRenderingCore = _vtkRenderingCore
     vtkCommonCore = _vtkCommonCore
+    vtkCommonDataModel = _vtkCommonDataModel
 
 class RobotCanvas(QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -44,11 +51,21 @@ class RobotCanvas(QtWidgets.QWidget):
         self.grid_units_per_cm = 10.0 
         self.grid_cm_size = 1000.0    # Reduced to 1000cm (10m) workspace
         
+        self._overlay_pool = {}  # Overlay name -> {'kind', 'actor', 'mesh'}
+
         # Custom dynamic grid system (3D Graph)
         self._init_custom_grids()
         self._init_axis_labels()
         
-        # Observe camera changes to update grid visibility
+        # Observe camera changes to update grid visibility. Interactor events
+        # fire for every mouse step while orbiting, so they only (re)start a
+        # short single-shot timer; the Python-side grid/label update runs once
+        # the camera settles.
+        self._camera_view_state = None
+        self._camera_change_timer = QtCore.QTimer(self)
+        self._camera_change_timer.setSingleShot(True)
+        self._camera_change_timer.setInterval(60)
+        self._camera_change_timer.timeout.connect(self._apply_camera_change)
         self.plotter.interactor.AddObserver("InteractionEvent", self._on_camera_change)
         self.plotter.interactor.AddObserver("ModifiedEvent", self._on_camera_change)
 
@@ -75,6 +92,37 @@ class RobotCanvas(QtWidgets.QWidget):
         self.picker = vtkRenderingCore.vtkPropPicker()
         self.cell_picker = vtkRenderingCore.vtkCellPicker()
         self.cell_picker.SetTolerance(0.0005)
+
+        # Hover/pivot picking: mouse moves only record the cursor position; the
+        # pick runs when a wheel or rotate event needs the pivot, at most once
+        # per cursor position and camera state. Wheel steps arriving faster
+        # than the rate limit are accumulated and zoomed in one deferred step.
+        # It uses its own picker limited to links and grids, backed by cached
+        # static cell locators.
+        self.hover_picker = vtkRenderingCore.vtkCellPicker()
+        self.hover_picker.SetTolerance(0.0005)
+        self.hover_picker.PickFromListOn()
+        self._pick_locators = {}  # Pick target name -> (locator, dataset, dataset mtime)
+        self._hover_pos = None
+        self._hover_pick_key = None
+        self._hover_pick_time = 0.0
+        self._hover_pick_interval = 0.03  # seconds
+        self._current_hover_pt = None
+        self._pending_zoom = 1.0
+        self._zoom_timer = QtCore.QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.timeout.connect(self._apply_pending_zoom)
+
+        # Transform bookkeeping and optional static-geometry batching
+        self._applied_t_world = {}  # Link name -> t_world last pushed to its actor
+        self.static_batching = True
+        self._static_batch_actor = None
+        self._static_batch_key = None
+        self._static_batch_hidden = {}  # Batched link name -> its visibility before batching
+        self._static_batch_robot = None
+
+        # Translucent "actual" pose reported by the hardware
+        self._actual_actors = {}  # Link name -> (source polydata, ghost actor)
         
         # Override interactor events
         self.plotter.interactor.AddObserver("MouseMoveEvent", self._on_mouse_move)
@@ -100,12 +148,12 @@ class RobotCanvas(QtWidgets.QWidget):
         self.picking_edge = False
         self.picking_color = "orange"
         self.enable_drag = True
-        self._selection_dim_actors = []
         
         self.interaction_mode = "rotate" # 'rotate'
         self.picking_focus_point = False  # Focus point picking mode
         self.on_edge_picked_callback = None
         self._live_point_actor_name = "live_point_marker"
+        self._feature_edge_cache = {}  # Link name -> FeatureEdgeIndex (local space)
 
     def _dist_point_to_segment(self, p, a, b):
         """Calculates distance from point p to line segment (a, b)"""
@@ -524,8 +572,35 @@ class RobotCanvas(QtWidgets.QWidget):
         self.picking_color = color
         self.mw_log(f"Edge Picking Active: Click an edge on the 3D model...")
 
+    def get_feature_edge_index(self, link_name, build=True):
+        """Returns the cached feature-edge index of a link, building it on first use."""
+        if link_name not in self.actors:
+            return None
+
+        index = self._feature_edge_cache.get(link_name)
+        if index is None and build:
+            poly = pv.wrap(self.actors[link_name].GetMapper().GetInput())
+            if not poly.is_all_triangles:
+                poly = poly.triangulate()
+            faces = np.asarray(poly.faces).reshape(-1, 4)[:, 1:]
+            index = FeatureEdgeIndex(np.asarray(poly.points), faces)
+            self._feature_edge_cache[link_name] = index
+        return index
+
+    def cache_feature_edge_index(self, link_name, index):
+        """Stores an index built elsewhere (e.g. by a worker thread) for a live link actor."""
+        if link_name in self.actors and index is not None:
+            self._feature_edge_cache[link_name] = index
+
+    def invalidate_feature_edges(self, link_name=None):
+        """Drops cached feature edges for one link (or all links) after a mesh change."""
+        if link_name is None:
+            self._feature_edge_cache.clear()
+        else:
+            self._feature_edge_cache.pop(link_name, None)
+
     def _on_edge_pick_click(self, click_pos):
-        """Pick an edge from the mesh under the cursor."""
+        """Pick the real feature seam (or, failing that, the triangle edge) under the cursor."""
         self.cell_picker.Pick(click_pos[0], click_pos[1], 0, self.plotter.renderer)
         cell_id = self.cell_picker.GetCellId()
         actor = self.cell_picker.GetActor()
@@ -533,51 +608,95 @@ class RobotCanvas(QtWidgets.QWidget):
         if cell_id != -1 and actor:
             link_name = next((name for name, a in self.actors.items() if a == actor), None)
             if link_name:
-                mesh = pv.wrap(actor.GetMapper().GetInput())
-                
-                # Find the closest edge of the picked cell to the click point
-                cell = mesh.GetCell(cell_id)
-                n_edges = cell.GetNumberOfEdges()
-                
                 mat = actor.user_matrix
                 inv_mat = np.linalg.inv(mat)
                 world_pick_pt = self.cell_picker.GetPickPosition()
                 local_pick_pt = (inv_mat @ np.append(world_pick_pt, 1))[:3]
-                
-                best_edge_pts = None
-                min_dist = float('inf')
-                
-                for i in range(n_edges):
-                    edge = cell.GetEdge(i)
-                    p1 = np.array(mesh.GetPoint(edge.GetPointId(0)))
-                    p2 = np.array(mesh.GetPoint(edge.GetPointId(1)))
-                    d = self._dist_point_to_segment(local_pick_pt, p1, p2)
-                    if d < min_dist:
-                        min_dist = d
-                        best_edge_pts = (p1, p2)
-                
-                if best_edge_pts:
-                    p1_w = (mat @ np.append(best_edge_pts[0], 1))[:3]
-                    p2_w = (mat @ np.append(best_edge_pts[1], 1))[:3]
-                    
+
+                seam = self._pick_feature_seam(link_name, local_pick_pt, mat)
+                if seam is not None:
+                    pts_w = seam["points"]
+                    p1_w = pts_w[0]
+                    p2_w = pts_w[-2] if seam["closed"] else pts_w[-1]
                     if self.on_edge_picked_callback:
-                        self.on_edge_picked_callback(link_name, p1_w, p2_w)
-                    
-                    # Visual Highlight
-                    edge_mesh = pv.Line(p1_w, p2_w)
-                    self.plotter.add_mesh(
-                        edge_mesh,
-                        color=self.picking_color,
-                        line_width=8,
-                        name=f"edge_highlight_{link_name}_{cell_id}",
-                        pickable=False
-                    )
-                    
+                        self.on_edge_picked_callback(link_name, p1_w, p2_w, seam=seam)
+                    self.highlight_seam(pts_w, f"edge_highlight_{link_name}_{cell_id}")
+                else:
+                    best_edge_pts = self._pick_cell_edge(actor, cell_id, local_pick_pt)
+                    if best_edge_pts:
+                        p1_w = (mat @ np.append(best_edge_pts[0], 1))[:3]
+                        p2_w = (mat @ np.append(best_edge_pts[1], 1))[:3]
+
+                        if self.on_edge_picked_callback:
+                            self.on_edge_picked_callback(link_name, p1_w, p2_w)
+                        self.highlight_seam([p1_w, p2_w], f"edge_highlight_{link_name}_{cell_id}")
+
                 self.picking_edge = False
                 self.plotter.render()
                 return True
         return False
 
+    def _pick_feature_seam(self, link_name, local_pick_pt, matrix):
+        """Snap a local pick point to the nearest feature seam; returns a seam dict or None."""
+        try:
+            index = self.get_feature_edge_index(link_name)
+        except Exception:
+            return None
+        if index is None or len(index) == 0:
+            return None
+
+        # Snap radius: a few percent of the part size so clicks on flat faces
+        # far from any real edge still fall back to triangle-edge picking.
+        extent = np.ptp(index.vertices, axis=0) if len(index.vertices) else np.zeros(3)
+        snap_radius = max(float(np.linalg.norm(extent)) * 0.05, 1e-6)
+        pid, _ = index.nearest(local_pick_pt, max_dist=snap_radius)
+        if pid is None:
+            return None
+
+        pts_local = index.polyline_points(pid)
+        pts_world = (matrix[:3, :3] @ pts_local.T).T + matrix[:3, 3]
+        normal_a, normal_b, dihedral = index.seam_normals(pid)
+        return {
+            "points": [np.array(p, dtype=float) for p in pts_world],
+            "closed": bool(index.closed[pid]),
+            "face_normals_local": [normal_a, normal_b],
+            "dihedral_deg": dihedral,
+            "concave": index.seam_is_concave(pid),
+        }
+
+    def _pick_cell_edge(self, actor, cell_id, local_pick_pt):
+        """Returns the local endpoints of the picked triangle's edge closest to the click."""
+        mesh = pv.wrap(actor.GetMapper().GetInput())
+        cell = mesh.GetCell(cell_id)
+        n_edges = cell.GetNumberOfEdges()
+
+        best_edge_pts = None
+        min_dist = float('inf')
+        for i in range(n_edges):
+            edge = cell.GetEdge(i)
+            p1 = np.array(mesh.GetPoint(edge.GetPointId(0)))
+            p2 = np.array(mesh.GetPoint(edge.GetPointId(1)))
+            d = self._dist_point_to_segment(local_pick_pt, p1, p2)
+            if d < min_dist:
+                min_dist = d
+                best_edge_pts = (p1, p2)
+        return best_edge_pts
+
+    def highlight_seam(self, points_world, name, color=None):
+        """Draws a picked edge or seam polyline as a thick overlay."""
+        pts = np.asarray(points_world, dtype=float)
+        if len(pts) < 2:
+            return
+        seam_mesh = pv.PolyData(pts)
+        seam_mesh.lines = np.hstack([[len(pts)], np.arange(len(pts))])
+        self.plotter.add_mesh(
+            seam_mesh,
+            color=color or self.picking_color,
+            line_width=8,
+            name=name,
+            pickable=False
+        )
+
     def deselect_all(self):
         """Standard CAD behavior: Escape or blank click clears everything."""
         self.selected_name = None
@@ -589,6 +708,7 @@ class RobotCanvas(QtWidgets.QWidget):
         to_remove = [a for a in self.plotter.renderer.actors if "edge_highlight" in a or "pick_highlight" in a]
         for a in to_remove:
             self.plotter.remove_actor(a)
+        self.hide_overlays("dim_")
             
         self.plotter.render()
         self.mw_log("Selection cleared.")
@@ -648,6 +768,12 @@ class RobotCanvas(QtWidgets.QWidget):
             pass
 
     def _on_left_down(self, obj, event):
+        # Click picks resolve link actors by identity, so batched links are
+        # shown as themselves for the duration of the handler.
+        with self._static_batch_suspended():
+            self._handle_left_down(obj, event)
+
+    def _handle_left_down(self, obj, event):
         click_pos = self.plotter.interactor.GetEventPosition()
         
         # --- DOUBLE-CLICK DETECTION (CUSTOM) ---
@@ -885,8 +1011,8 @@ class RobotCanvas(QtWidgets.QWidget):
 
         # CASE 3: We clicked on empty space or we are starting a camera interaction
         # AUTO-PIVOT: If we have a hover point, set it as the center of rotation now.
-        if hasattr(self, '_current_hover_pt') and self._current_hover_pt is not None:
-            P = self._current_hover_pt
+        P = self._pick_hover_point(click_pos)
+        if P is not None:
             old_focal = np.array(self.plotter.camera.focal_point)
             offset = P - old_focal
             # Update position and focal point to pan to the new pivot silently
@@ -956,27 +1082,94 @@ class RobotCanvas(QtWidgets.QWidget):
                 mat[1, 3] += move_vector[1]
                 mat[2, 3] += move_vector[2]
                 actor.user_matrix = mat
+                self._applied_t_world.pop(self.selected_name, None)
                 
                 self.last_pos = curr_pos
                 self.plotter.render()
             return 
             
         # --- DYNAMIC CAMERA TRACKING (POTENTIAL PIVOT) ---
-        # We track the point under the cursor so we can zoom/rotate around it live.
+        # Only remember where the cursor is; the point under it is picked
+        # lazily by the wheel/rotate handler that actually needs a pivot.
         if not self.is_dragging and not self.picking_face and not getattr(self, 'picking_point', False):
-            curr_pos = self.plotter.interactor.GetEventPosition()
-            self.cell_picker.Pick(curr_pos[0], curr_pos[1], 0, self.plotter.renderer)
-            picked_actor = self.cell_picker.GetActor()
-            
-            if picked_actor and (picked_actor in self.actors.values() or picked_actor in self.grids.values()):
-                # We store the point but we DON'T move the camera yet 
-                # to avoid jumpy "sliding" views while simply hovering.
-                self._current_hover_pt = np.array(self.cell_picker.GetPickPosition())
-            else:
-                self._current_hover_pt = None
+            self._hover_pos = tuple(self.plotter.interactor.GetEventPosition())
                 
         self.plotter.interactor.GetInteractorStyle().OnMouseMove()
 
+    def _sync_pick_locators(self):
+        """Keeps one vtkStaticCellLocator per pickable dataset, rebuilt only when the mesh changes."""
+        # While the batch is suspended (click handlers) it is hidden and the
+        # batched links are shown as themselves, so those are picked instead
+        batch = self._static_batch_actor
+        batched = batch is not None and batch.GetVisibility()
+        targets = {
+            name: actor for name, actor in self.actors.items()
+            if not (batched and name in self._static_batch_hidden)
+        }
+        if batched:
+            targets["_static_batch"] = batch
+        for key, actor in self.grids.items():
+            if actor.GetVisibility():
+                targets[f"_grid_{key}"] = actor
+
+        for name in list(self._pick_locators):
+            # Locators of the batch and its links are kept across suspensions
+            kept = name in self._static_batch_hidden or (name == "_static_batch" and batch is not None)
+            if name not in targets and not kept:
+                self.hover_picker.RemoveLocator(self._pick_locators.pop(name)[0])
+
+        self.hover_picker.InitializePickList()
+        for name, actor in targets.items():
+            self.hover_picker.AddPickList(actor)
+            dataset = actor.GetMapper().GetInput()
+            entry = self._pick_locators.get(name)
+            if entry is not None and entry[1] is dataset and entry[2] == dataset.GetMTime():
+                continue
+            if entry is not None:
+                self.hover_picker.RemoveLocator(entry[0])
+            locator = vtkCommonDataModel.vtkStaticCellLocator()
+            locator.SetDataSet(dataset)
+            locator.BuildLocator()
+            self.hover_picker.AddLocator(locator)
+            self._pick_locators[name] = (locator, dataset, dataset.GetMTime())
+
+    def invalidate_hover_pick(self):
+        """Forgets the memoized hover point (scene moved under a still cursor)."""
+        self._hover_pick_key = None
+
+    def _hover_pick_view_key(self, pos):
+        """Memo key of a hover pick: the cursor pixel plus everything that maps it to a ray."""
+        return (pos, self.plotter.camera.GetMTime(), tuple(self.plotter.renderer.GetSize()))
+
+    def _hover_pick_wait(self, pos):
+        """Seconds until a pick at `pos` may run; 0 when it is memoized or allowed now."""
+        if pos is None or self._hover_pick_view_key(pos) == self._hover_pick_key or self._hover_pick_key is None:
+            return 0.0
+        return max(0.0, self._hover_pick_interval - (time.monotonic() - self._hover_pick_time))
+
+    def _pick_hover_point(self, pos=None):
+        """
+        World point on a link or grid under the cursor, or None.
+        Memoized per cursor position and camera state, so repeated requests
+        at a still cursor and view do not re-pick. Callers that fire in
+        bursts (wheel steps) wait out _hover_pick_wait() first.
+        """
+        pos = tuple(pos) if pos is not None else self._hover_pos
+        if pos is None:
+            return None
+        key = self._hover_pick_view_key(pos)
+        if key == self._hover_pick_key:
+            return self._current_hover_pt
+
+        self._sync_pick_locators()
+        if self.hover_picker.Pick(pos[0], pos[1], 0, self.plotter.renderer):
+            self._current_hover_pt = np.array(self.hover_picker.GetPickPosition())
+        else:
+            self._current_hover_pt = None
+        self._hover_pick_key = key
+        self._hover_pick_time = time.monotonic()
+        return self._current_hover_pt
+
     def _on_wheel_forward(self, obj, event):
         self._zoom_at_cursor(1.2)
         try:
@@ -997,17 +1190,25 @@ class RobotCanvas(QtWidgets.QWidget):
         Calculates new camera position and focal point such that the 
         point under the cursor remains at the same pixel location.
         """
-        curr_pos = self.plotter.interactor.GetEventPosition()
-        self.cell_picker.Pick(curr_pos[0], curr_pos[1], 0, self.plotter.renderer)
-        picked_actor = self.cell_picker.GetActor()
-        
+        curr_pos = tuple(self.plotter.interactor.GetEventPosition())
+
+        # A new pick is due sooner than the rate limit allows: accumulate the
+        # step and zoom once the pick can run, instead of zooming about a
+        # point picked under another pixel or camera.
+        self._pending_zoom *= amount
+        wait = self._hover_pick_wait(curr_pos)
+        if wait > 0.0:
+            if not self._zoom_timer.isActive():
+                self._zoom_timer.start(max(1, int(round(wait * 1000))))
+            return
+        self._zoom_timer.stop()
+        amount, self._pending_zoom = self._pending_zoom, 1.0
+
         # Determine the pivot point for the zoom
-        # Priority: Exact actor under cursor > Exact grid under cursor > Last known hover pt > Focal point
-        if picked_actor and (picked_actor in self.actors.values() or picked_actor in self.grids.values()):
-            P = np.array(self.cell_picker.GetPickPosition())
-        elif hasattr(self, '_current_hover_pt') and self._current_hover_pt is not None:
-            P = self._current_hover_pt
-        else:
+        # Priority: Link/grid under cursor > Focal point
+        P = self._pick_hover_point(curr_pos)
+        picked = P is not None
+        if P is None:
             P = np.array(self.plotter.camera.focal_point)
 
         C = np.array(self.plotter.camera.position)
@@ -1023,12 +1224,24 @@ class RobotCanvas(QtWidgets.QWidget):
         # Apply transformation
         self.plotter.camera.position = new_C
         self.plotter.camera.focal_point = new_F
+        if picked:
+            # The dolly keeps P under the same pixel: the pick is still valid for the new view
+            self._hover_pick_key = self._hover_pick_view_key(curr_pos)
         self._update_axis_labels()
         self.plotter.render()
+
+    def _apply_pending_zoom(self):
+        if self._pending_zoom != 1.0:
+            self._zoom_at_cursor(1.0)
+
     def update_link_mesh(self, link_name, mesh, transform, color="silver"):
         """Adds or updates a link mesh in the scene."""
         if link_name in self.actors:
             self.plotter.remove_actor(self.actors[link_name])
+        self.invalidate_feature_edges(link_name)
+        self.invalidate_hover_pick()
+        if link_name in self._static_batch_hidden:
+            self._clear_static_batch()
         
         # Convert trimesh to pyvista if needed
         import trimesh
@@ -1041,6 +1254,7 @@ class RobotCanvas(QtWidgets.QWidget):
         actor = self.plotter.add_mesh(poly, color=color, show_edges=False, name=link_name)
         # Apply transform
         actor.user_matrix = transform
+        self._applied_t_world.pop(link_name, None)
         self.actors[link_name] = actor
         self.plotter.render()
 
@@ -1048,6 +1262,8 @@ class RobotCanvas(QtWidgets.QWidget):
         """Changes the color of an existing actor."""
         if name in self.actors:
             self.actors[name].GetProperty().SetColor(QtGui.QColor(hex_color).getRgbF()[:3])
+            if name in self._static_batch_hidden and self._static_batch_robot is not None:
+                self._update_static_batch(self._static_batch_robot)
             self.plotter.render()
 
     def select_actor(self, name):
@@ -1056,6 +1272,8 @@ class RobotCanvas(QtWidgets.QWidget):
             return
         
         self.selected_name = name
+        if name in self._static_batch_hidden:
+            self._clear_static_batch()  # Rebuilt without the selection on the next update
         # Highlight
         for n, actor in self.actors.items():
             if n == name:
@@ -1070,21 +1288,97 @@ class RobotCanvas(QtWidgets.QWidget):
         if name in self.actors:
             if self.selected_name == name:
                 self.deselect_all()
+            if name in self._static_batch_hidden:
+                self._clear_static_batch()
             self.plotter.remove_actor(self.actors[name])
+            self._applied_t_world.pop(name, None)
             del self.actors[name]
+            self.invalidate_feature_edges(name)
+            self.invalidate_hover_pick()
             self.plotter.render()
 
+    # ------------------------------------------------------------------
+    # Overlay actor pool
+    # ------------------------------------------------------------------
+    # Named overlays (dimension lines and their billboards) are created
+    # once and then updated in place: new points, new text, visibility toggles.
+    # Removing and re-adding VTK actors on every selection or slider tick is
+    # far more expensive than mutating an existing one.
+
+    def _pooled_overlay(self, name, kind, factory):
+        """Returns the pooled overlay entry `name`, creating it with `factory()` once."""
+        entry = self._overlay_pool.get(name)
+        if entry is None or entry["kind"] != kind:
+            if entry is not None:
+                self.plotter.renderer.RemoveActor(entry["actor"])
+            actor, mesh = factory()
+            entry = {"kind": kind, "actor": actor, "mesh": mesh}
+            self._overlay_pool[name] = entry
+        return entry
+
+    def set_overlay_line(self, name, points, color, line_width=2, visible=True):
+        """Shows a pooled polyline overlay through `points` (world space)."""
+        pts = np.asarray(points, dtype=float).reshape(-1, 3)
+
+        def factory():
+            mesh = pv.PolyData(pts.copy())
+            mesh.lines = np.hstack([[len(pts)], np.arange(len(pts))])
+            actor = self.plotter.add_mesh(
+                mesh, color=color, line_width=line_width,
+                pickable=False, lighting=False, name=f"_overlay_{name}"
+            )
+            return actor, mesh
+
+        entry = self._pooled_overlay(name, "line", factory)
+        mesh = entry["mesh"]
+        if mesh.n_points != len(pts):
+            mesh.points = pts.copy()
+            mesh.lines = np.hstack([[len(pts)], np.arange(len(pts))])
+        else:
+            mesh.points = pts
+        prop = entry["actor"].GetProperty()
+        prop.SetColor(pv.Color(color).float_rgb)
+        prop.SetLineWidth(line_width)
+        entry["actor"].SetVisibility(bool(visible))
+        return entry["actor"]
+
+    def set_overlay_text(self, name, position, text, color, font_size=12, bold=True, visible=True):
+        """Shows a pooled camera-facing text label at `position` (world space)."""
+        def factory():
+            import vtkmodules.vtkRenderingCore as vtkRC
+            txt_actor = vtkRC.vtkBillboardTextActor3D()
+            txt_actor.GetTextProperty().SetFontFamilyToArial()
+            txt_actor.GetTextProperty().SetJustificationToCentered()
+            txt_actor.SetPickable(False)
+            self.plotter.renderer.AddActor(txt_actor)
+            return txt_actor, None
+
+        actor = self._pooled_overlay(name, "text", factory)["actor"]
+        actor.SetInput(str(text))
+        actor.SetPosition(float(position[0]), float(position[1]), float(position[2]))
+        prop = actor.GetTextProperty()
+        prop.SetFontSize(int(font_size))
+        prop.SetColor(pv.Color(color).float_rgb)
+        prop.SetBold(bool(bold))
+        actor.SetVisibility(bool(visible))
+        return actor
+
+    def set_overlay_visible(self, name, visible):
+        """Toggles a pooled overlay without destroying it. Unknown names are ignored."""
+        entry = self._overlay_pool.get(name)
+        if entry is not None:
+            entry["actor"].SetVisibility(bool(visible))
+
+    def hide_overlays(self, prefix):
+        """Hides every pooled overlay whose name starts with `prefix`."""
+        for name, entry in self._overlay_pool.items():
+            if name.startswith(prefix):
+                entry["actor"].SetVisibility(False)
+
     def _update_selection_visuals(self):
         """Draws dimension lines and labels around the selected object."""
-        # 1. Clean up old actors
-        if not hasattr(self, '_selection_dim_actors'):
-             self._selection_dim_actors = []
-             
-        for actor in self._selection_dim_actors:
-            self.plotter.renderer.RemoveActor(actor)
-        self._selection_dim_actors = []
-
         if not self.selected_name or self.selected_name not in self.actors:
+            self.hide_overlays("dim_")
             return
 
         actor = self.actors[self.selected_name]
@@ -1101,62 +1395,166 @@ class RobotCanvas(QtWidgets.QWidget):
             # Draw 3 representative dimension lines: X, Y, Z
             # X dimension line (bottom edge)
             self._create_dim_line(
-                (b[0], b[2]-pad, b[4]), (b[1], b[2]-pad, b[4]), 
+                "x", (b[0], b[2]-pad, b[4]), (b[1], b[2]-pad, b[4]),
                 f"X: {(b[1]-b[0])/ratio:.1f} cm", "#1976d2"
             )
             
             # Y dimension line
             self._create_dim_line(
-                (b[1]+pad, b[2], b[4]), (b[1]+pad, b[3], b[4]), 
+                "y", (b[1]+pad, b[2], b[4]), (b[1]+pad, b[3], b[4]),
                 f"Y: {(b[3]-b[2])/ratio:.1f} cm", "#388E3C"
             )
             
             # Z dimension line
             self._create_dim_line(
-                (b[0]-pad, b[2]-pad, b[4]), (b[0]-pad, b[2]-pad, b[5]), 
+                "z", (b[0]-pad, b[2]-pad, b[4]), (b[0]-pad, b[2]-pad, b[5]),
                 f"Z: {(b[5]-b[4])/ratio:.1f} cm", "#D32F2F"
             )
 
         except Exception as e:
             print(f"Error drawing dimensions: {e}")
 
-    def _create_dim_line(self, start, end, label, color):
-        """Helper to create a 3D line with a centered billboard label."""
-        import vtkmodules.vtkRenderingCore as vtkRC
-        
-        # 1. The Line
+    def _create_dim_line(self, key, start, end, label, color):
+        """Helper to place a pooled 3D line with a centered billboard label."""
         try:
-            line_mesh = pv.Line(start, end)
-            actor = self.plotter.add_mesh(
-                line_mesh, color=color, line_width=2, 
-                pickable=False, lighting=False, name=f"_dim_line_{label}"
-            )
-            self._selection_dim_actors.append(actor)
-            
-            # 2. The Label (Billboard)
+            self.set_overlay_line(f"dim_line_{key}", [start, end], color, line_width=2)
             mid = [(start[i] + end[i])/2.0 for i in range(3)]
-            txt_actor = vtkRC.vtkBillboardTextActor3D()
-            txt_actor.SetInput(label)
-            txt_actor.SetPosition(mid[0], mid[1], mid[2])
-            txt_actor.GetTextProperty().SetFontSize(12)
-            txt_actor.GetTextProperty().SetColor(pv.Color(color))
-            txt_actor.GetTextProperty().SetBold(True)
-            txt_actor.GetTextProperty().SetFontFamilyToArial()
-            txt_actor.GetTextProperty().SetJustificationToCentered()
-            txt_actor.SetPickable(False)
-            
-            self.plotter.renderer.AddActor(txt_actor)
-            self._selection_dim_actors.append(txt_actor)
+            self.set_overlay_text(f"dim_label_{key}", mid, label, color, font_size=12)
         except Exception:
             pass
 
     def update_transforms(self, robot):
         """Updates all actor transforms based on robot's current kinematics state."""
+        moved = False
         for name, link in robot.links.items():
-            if name in self.actors:
-                self.actors[name].user_matrix = link.t_world
+            if name not in self.actors:
+                continue
+            # Skip links whose pose is unchanged since the last frame
+            last = self._applied_t_world.get(name)
+            if last is not None and np.array_equal(last, link.t_world):
+                continue
+            self.actors[name].user_matrix = link.t_world
+            self._applied_t_world[name] = np.array(link.t_world, dtype=float, copy=True)
+            moved = True
+        if moved:
+            self.invalidate_hover_pick()
+        self._update_static_batch(robot)
+        self.plotter.render()
+
+    # ------------------------------------------------------------------
+    # Static geometry batching
+    # ------------------------------------------------------------------
+    # Links that no joint can move (the base and anything hanging off it
+    # through zero-range joints) can be merged into one polydata drawn by a
+    # single actor. Their own actors stay in self.actors, hidden, so every
+    # name-based lookup keeps working; the batch is rebuilt only when the
+    # static set, a member's pose/colour or its mesh changes.
+    def set_static_batching(self, enabled, robot=None):
+        """Turns static-geometry batching on or off."""
+        self.static_batching = bool(enabled)
+        if not self.static_batching:
+            self._clear_static_batch()
+        elif robot is not None:
+            self._update_static_batch(robot)
         self.plotter.render()
 
+    def _static_link_names(self, robot):
+        """Names of link actors that no joint can move and that are safe to batch."""
+        static = set()
+        for name, link in robot.links.items():
+            actor = self.actors.get(name)
+            if actor is None or name == self.selected_name:
+                continue
+            if not self._static_batch_hidden.get(name, actor.GetVisibility()):
+                continue
+            if actor.GetProperty().GetOpacity() < 1.0:
+                continue
+
+            node = link
+            while node.parent_joint is not None:
+                joint = node.parent_joint
+                if joint.max_limit > joint.min_limit:
+                    break
+                node = joint.parent_link
+            else:
+                if node.name in self.fixed_actors:
+                    static.add(name)
+        return static
+
+    def _update_static_batch(self, robot):
+        """(Re)builds the batched static actor when the static set has changed."""
+        self._static_batch_robot = robot
+        if not self.static_batching:
+            return
+
+        static = sorted(self._static_link_names(robot))
+        key = tuple(
+            (name, id(self.actors[name]), robot.links[name].t_world.tobytes(), self.actors[name].GetProperty().GetColor())
+            for name in static
+        )
+        if key == self._static_batch_key:
+            return
+
+        self._clear_static_batch()
+        self._static_batch_key = key
+        if not static:
+            return
+
+        import vtkmodules.vtkFiltersCore as vtkFC
+        appender = vtkFC.vtkAppendPolyData()
+        for name in static:
+            actor = self.actors[name]
+            part = pv.wrap(actor.GetMapper().GetInput()).copy()
+            part = part.transform(np.asarray(robot.links[name].t_world, dtype=float), inplace=False)
+            rgb = np.round(np.array(actor.GetProperty().GetColor()) * 255).astype(np.uint8)
+            part.point_data["static_rgb"] = np.tile(rgb, (part.n_points, 1))
+            appender.AddInputData(part)
+
+            self._static_batch_hidden[name] = bool(actor.GetVisibility())
+            actor.SetVisibility(False)
+        appender.Update()
+
+        merged = pv.wrap(appender.GetOutput())
+        self._static_batch_actor = self.plotter.add_mesh(
+            merged, scalars="static_rgb", rgb=True, show_edges=False,
+            name="_static_batch", reset_camera=False
+        )
+        self.invalidate_hover_pick()
+
+    def _clear_static_batch(self):
+        """Removes the batched actor and shows the member link actors again."""
+        if self._static_batch_actor is not None:
+            self.plotter.remove_actor(self._static_batch_actor, render=False)
+            self._static_batch_actor = None
+        for name, visible in self._static_batch_hidden.items():
+            if name in self.actors:
+                self.actors[name].SetVisibility(visible)
+        self._static_batch_hidden = {}
+        self._static_batch_key = None
+        self.invalidate_hover_pick()
+
+    @contextlib.contextmanager
+    def _static_batch_suspended(self):
+        """Temporarily shows the real link actors instead of the batch (no render)."""
+        batch = self._static_batch_actor
+        if batch is None:
+            yield
+            return
+        hidden = dict(self._static_batch_hidden)
+        batch.SetVisibility(False)
+        for name, visible in hidden.items():
+            if name in self.actors:
+                self.actors[name].SetVisibility(visible)
+        try:
+            yield
+        finally:
+            # The handler may have cleared or rebuilt the batch itself
+            if self._static_batch_actor is batch:
+                batch.SetVisibility(True)
+                for name in self._static_batch_hidden:
+                    if name in self.actors:
+                        self.actors[name].SetVisibility(False)
+
 
     def _init_custom_grids(self):
         """Creates the 3 principal plane grids for the '3D Graph' system."""
@@ -1327,17 +1725,35 @@ class RobotCanvas(QtWidgets.QWidget):
         # Re-initialize everything with new scale/size
         self._init_custom_grids() 
         self._init_axis_labels()  
+        self._camera_view_state = None
+        self._axis_label_state = None
+        self._apply_camera_change()
         self.plotter.render()
 
+    def _camera_direction(self):
+        """Unit view direction (camera -> focal point), or None when degenerate."""
+        cam_pos = np.array(self.plotter.camera.position)
+        focal = np.array(self.plotter.camera.focal_point)
+        direction = focal - cam_pos
+        norm = np.linalg.norm(direction)
+        if norm < 1e-6:
+            return None, 0.0
+        return direction / norm, norm
+
     def _update_axis_labels(self):
-        """Update axis label & center line visibility based on camera view and zoom."""
+        """
+        Update axis label & center line visibility based on camera view and zoom.
+        Returns True if anything changed. The per-label loop only runs when the
+        (visible grids, label step) state differs from the last applied one.
+        """
         if not hasattr(self, '_axis_labels'):
-            return
+            return False
         
+        direction, cam_dist = self._camera_direction()
+        if direction is None:
+            return False
+
         # Camera distance in CM for zoom logic
-        cam_pos = np.array(self.plotter.camera.position)
-        focal = np.array(self.plotter.camera.focal_point)
-        cam_dist = np.linalg.norm(cam_pos - focal)
         cam_dist_cm = cam_dist / self.grid_units_per_cm
         
         # Dynamic label granularity based on zoom (Requested: 10cm close, 50cm far)
@@ -1351,23 +1767,22 @@ class RobotCanvas(QtWidgets.QWidget):
             target_step_cm = 500
         
         # Which grids are visible (snapped view detection)
-        direction = focal - cam_pos
-        norm = np.linalg.norm(direction)
-        if norm < 1e-6:
-            return
-        direction /= norm
         abs_dir = np.abs(direction)
         tol = 0.95
         
-        show_xy = abs_dir[2] > tol
-        show_xz = abs_dir[1] > tol
-        show_yz = abs_dir[0] > tol
+        show_xz = bool(abs_dir[1] > tol)
+        show_yz = bool(abs_dir[0] > tol)
         
         grid_vis = {
             'xy': True,  # XY grid is always visible (default ground plane)
             'xz': show_xz,
             'yz': show_yz,
         }
+
+        state = (show_xz, show_yz, target_step_cm)
+        if state == getattr(self, '_axis_label_state', None):
+            return False
+        self._axis_label_state = state
         
         # Update center axis lines visibility
         if hasattr(self, '_center_axis_actors'):
@@ -1385,14 +1800,17 @@ class RobotCanvas(QtWidgets.QWidget):
             # Visibility condition: matches target step and grid is visible
             tv = (cm_val % target_step_cm) == 0
             lbl['actor'].SetVisibility(bool(gv and tv))
+        return True
 
     def _on_camera_change(self, *args):
+        """Debounced camera observer: schedules a grid/label refresh once the camera settles."""
+        self._camera_change_timer.start()
+
+    def _apply_camera_change(self):
         """Dynamically toggles grid visibility based on camera orientation."""
-        # Get normalized direction vector from camera to focal point
-        pos = np.array(self.plotter.camera.position)
-        focal = np.array(self.plotter.camera.focal_point)
-        direction = focal - pos
-        direction /= np.linalg.norm(direction)
+        direction, _ = self._camera_direction()
+        if direction is None:
+            return
         
         # Absolute components to detect alignment with axes
         abs_dir = np.abs(direction)
@@ -1401,9 +1819,9 @@ class RobotCanvas(QtWidgets.QWidget):
         tol = 0.95
         
         # Determine which grid to show
-        show_xy = abs_dir[2] > tol # Looking mostly along Z (Top/Bottom)
-        show_xz = abs_dir[1] > tol # Looking mostly along Y (Front/Back)
-        show_yz = abs_dir[0] > tol # Looking mostly along X (Left/Right)
+        show_xy = bool(abs_dir[2] > tol) # Looking mostly along Z (Top/Bottom)
+        show_xz = bool(abs_dir[1] > tol) # Looking mostly along Y (Front/Back)
+        show_yz = bool(abs_dir[0] > tol) # Looking mostly along X (Left/Right)
         
         # Special case: If we are in free-rotation (isometric-ish), default to XY or hide?
         # User said "if i am seeng topview show me side plans grid only ... applied for all sides"
@@ -1411,25 +1829,37 @@ class RobotCanvas(QtWidgets.QWidget):
         # Let's show XY as a default ground plane if not snapped to a side.
         
         is_snapped = show_xy or show_xz or show_yz
-        
-        if not is_snapped:
-            # Optionally show a faint XY grid in 3D view
-            self.grids['xy'].SetVisibility(True)
-            self.grids['xy'].GetProperty().SetOpacity(0.15)
-            self.grids['xz'].SetVisibility(False)
-            self.grids['yz'].SetVisibility(False)
-        else:
-            self.grids['xy'].SetVisibility(bool(show_xy))
-            self.grids['xy'].GetProperty().SetOpacity(0.5 if show_xy else 0.3)
-            
-            self.grids['xz'].SetVisibility(bool(show_xz))
-            self.grids['xz'].GetProperty().SetOpacity(0.5 if show_xz else 0.3)
-            
-            self.grids['yz'].SetVisibility(bool(show_yz))
-            self.grids['yz'].GetProperty().SetOpacity(0.5 if show_yz else 0.3)
+        changed = False
+
+        view_state = (is_snapped, show_xy, show_xz, show_yz)
+        if view_state != self._camera_view_state:
+            self._camera_view_state = view_state
+            changed = True
+            if not is_snapped:
+                # Optionally show a faint XY grid in 3D view
+                self.grids['xy'].SetVisibility(True)
+                self.grids['xy'].GetProperty().SetOpacity(0.15)
+                self.grids['xz'].SetVisibility(False)
+                self.grids['yz'].SetVisibility(False)
+            else:
+                self.grids['xy'].SetVisibility(bool(show_xy))
+                self.grids['xy'].GetProperty().SetOpacity(0.5 if show_xy else 0.3)
+                
+                self.grids['xz'].SetVisibility(bool(show_xz))
+                self.grids['xz'].GetProperty().SetOpacity(0.5 if show_xz else 0.3)
+                
+                self.grids['yz'].SetVisibility(bool(show_yz))
+                self.grids['yz'].GetProperty().SetOpacity(0.5 if show_yz else 0.3)
         
         # Update axis labels based on zoom and grid visibility
-        self._update_axis_labels()
+        if self._update_axis_labels():
+            changed = True
+
+        # Only render when visibility actually changed; an unconditional render
+        # here would re-trigger ModifiedEvent and keep the timer spinning.
+        if changed:
+            self.plotter.render()
+
     def _init_ghost_system(self):
         """Initialize ghost trail tracking (called lazily on first use)."""
         if not hasattr(self, '_ghost_data'):
@@ -1552,6 +1982,73 @@ class RobotCanvas(QtWidgets.QWidget):
             except:
                 pass
 
+    # ------------------------------------------------------------------
+    # Hardware "actual" pose overlay
+    # ------------------------------------------------------------------
+    def set_actual_pose(self, transforms, color="#ff6d00", opacity=0.3):
+        """
+        Shows a translucent copy of the robot at `transforms` (link name ->
+        4x4, e.g. Robot.world_transforms() of the reported joint angles),
+        next to the commanded pose. Links whose actual and commanded poses
+        coincide are hidden. None removes the overlay.
+        """
+        if transforms is None:
+            self.clear_actual_pose()
+            return
+
+        changed = False
+        for name, t_world in transforms.items():
+            actor = self.actors.get(name)
+            if actor is None:
+                continue
+            source = actor.GetMapper().GetInput()
+            entry = self._actual_actors.get(name)
+            if entry is not None and entry[0] is not source:
+                # Link mesh was replaced: rebuild its ghost
+                self.plotter.remove_actor(entry[1])
+                entry = None
+            if entry is None:
+                ghost = self.plotter.add_mesh(
+                    source,
+                    color=color,
+                    opacity=opacity,
+                    show_edges=False,
+                    name=f"_actual_{name}",
+                    pickable=False,
+                    lighting=False,
+                )
+                entry = (source, ghost)
+                self._actual_actors[name] = entry
+                changed = True
+
+            ghost = entry[1]
+            commanded = self._applied_t_world.get(name)
+            visible = commanded is None or not np.allclose(commanded, t_world, atol=1e-3)
+            if bool(ghost.GetVisibility()) != visible:
+                ghost.SetVisibility(visible)
+                changed = True
+            if visible and not np.array_equal(ghost.user_matrix, t_world):
+                ghost.user_matrix = t_world
+                changed = True
+
+        for name in [n for n in self._actual_actors if n not in transforms or n not in self.actors]:
+            self.plotter.remove_actor(self._actual_actors.pop(name)[1])
+            changed = True
+        if changed:
+            self.plotter.render()
+
+    def clear_actual_pose(self):
+        """Removes the hardware pose overlay."""
+        if not self._actual_actors:
+            return
+        for _, ghost in self._actual_actors.values():
+            try:
+                self.plotter.remove_actor(ghost)
+            except Exception:
+                pass
+        self._actual_actors.clear()
+        self.plotter.render()
+
     def clear_joint_ghosts(self):
         """Removes all ghost shadow actors from the scene."""
         if not hasattr(self, '_ghost_data'): return
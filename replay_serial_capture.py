@@ -0,0 +1,81 @@
+"""
+Re-sends what the host wrote in a serial capture (SerialManager.start_capture,
+or TOROTRON_SERIAL_CAPTURE) to a board or to the ESP32 emulator, with the
+original timing or scaled by `speed` (2 = twice as fast, 0 = back to back),
+and prints what comes back. Rotated files (<capture>.1, .2, ...) are replayed
+first, oldest to newest.
+
+Usage: python replay_serial_capture.py <capture> <port> [speed]
+       python replay_serial_capture.py <capture> --emulator <project.trn> [speed]
+"""
+import sys
+import time
+import zipfile
+
+from core.project_format import read_project_json
+from core.serial_capture import CAPTURE_RX, CAPTURE_TX, capture_files, read_capture, replay_capture
+from core.serial_protocol import EVENT_FRAME, FrameParser
+
+
+def robot_from_project(path):
+    """Links, joints, limits and relations of a .trn project; enough for the emulator."""
+    from core.robot import Robot
+
+    with zipfile.ZipFile(path, "r") as zipf:
+        robot_data = read_project_json(zipf)
+    robot = Robot()
+    for l_data in robot_data["links"]:
+        robot.add_link(l_data["name"])
+    for j_data in robot_data["joints"]:
+        if j_data["parent_link"] in robot.links and j_data["child_link"] in robot.links:
+            joint = robot.add_joint(j_data["name"], j_data["parent_link"], j_data["child_link"])
+            joint.min_limit = j_data.get("min_limit", -180.0)
+            joint.max_limit = j_data.get("max_limit", 180.0)
+    robot.joint_relations = robot_data.get("joint_relations", {})
+    return robot
+
+
+def print_rx(parser):
+    def on_rx(t, data):
+        for event in parser.events(data, t):
+            text = f"frame type {event.data[0]:#04x} seq {event.data[1]}" if event.kind == EVENT_FRAME else event.text
+            print(f"  {t:8.3f}s  << {text}")
+    return on_rx
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    capture_path = sys.argv[1]
+    use_emulator = sys.argv[2] == "--emulator"
+    rest = sys.argv[4:] if use_emulator else sys.argv[3:]
+    speed = float(rest[0]) if rest else 1.0
+
+    wall_start, records = read_capture(capture_path)
+    files = capture_files(capture_path)
+    if len(files) > 1:
+        print(f"Reading {len(files)} files: {', '.join(files)}")
+    n_tx = sum(1 for _, d, _ in records if d == CAPTURE_TX)
+    n_rx = sum(1 for _, d, _ in records if d == CAPTURE_RX)
+    span = records[-1][0] - records[0][0] if records else 0.0
+    print(f"{capture_path}: recorded {time.ctime(wall_start)}, {n_tx} TX / {n_rx} RX records over {span:.2f}s")
+
+    emulator = None
+    if use_emulator:
+        from core.esp32_emulator import ESP32Emulator
+
+        emulator = ESP32Emulator(robot_from_project(sys.argv[3]))
+        port = emulator.start()
+    else:
+        port = sys.argv[2]
+
+    try:
+        t0 = time.perf_counter()
+        sent = replay_capture(records, port, speed, on_rx=print_rx(FrameParser()))
+        print(f"Replayed {sent} bytes to {port} in {time.perf_counter() - t0:.2f}s")
+        if emulator is not None:
+            print("Emulator joints:", {n: round(v, 2) for n, v in emulator.joint_values().items()})
+    finally:
+        if emulator is not None:
+            emulator.stop()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Verification script for contact weld seam detection.
+A plate standing on a base plate must give one 90 deg fillet seam around
+its foot, whatever frame the base part's mesh was authored in.
+"""
+
+import sys
+import numpy as np
+
+from core.weld_seams import detect_weld_seams
+
+
+def box(lo, hi):
+    """Closed triangle mesh of an axis-aligned box: (vertices, faces)."""
+    (x0, y0, z0), (x1, y1, z1) = lo, hi
+    verts = np.array([
+        [x0, y0, z0], [x1, y0, z0], [x1, y1, z0], [x0, y1, z0],
+        [x0, y0, z1], [x1, y0, z1], [x1, y1, z1], [x0, y1, z1],
+    ], dtype=float)
+    faces = np.array([
+        [0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7],
+        [0, 1, 5], [0, 5, 4], [1, 2, 6], [1, 6, 5],
+        [2, 3, 7], [2, 7, 6], [3, 0, 4], [3, 4, 7],
+    ])
+    return verts, faces
+
+
+def rot_x(deg):
+    c, s = np.cos(np.radians(deg)), np.sin(np.radians(deg))
+    t = np.eye(4)
+    t[:3, :3] = [[1, 0, 0], [0, c, -s], [0, s, c]]
+    return t
+
+
+base_w, base_f = box((-0.1, -0.1, 0.0), (0.1, 0.1, 0.01))
+plate_v, plate_f = box((-0.005, -0.05, 0.01), (0.005, 0.05, 0.11))
+
+failed = []
+for label, t_base in (("identity base frame", np.eye(4)), ("base frame rotated 90 deg about X", rot_x(90))):
+    # Same world geometry; the base mesh is stored in its own (rotated) frame
+    base_local = (t_base[:3, :3].T @ base_w.T).T
+    parts = [("base", base_local, base_f, t_base), ("plate", plate_v, plate_f, np.eye(4))]
+    seams, _ = detect_weld_seams(parts, contact_tol=1e-4, min_length=0.005)
+    contact = [s for s in seams if s["kind"] == "contact"]
+    angles = sorted(round(s["dihedral_deg"], 1) for s in contact)
+    print(f"[INFO] {label}: {len(contact)} contact seam(s), dihedral {angles}")
+    if not contact:
+        failed.append(f"{label}: no contact seam")
+    elif any(abs(a - 90.0) > 1.0 for a in angles):
+        failed.append(f"{label}: expected 90 deg fillets, got {angles}")
+
+# Corner joint: the plate stands flush on the base's edge, so that edge is a
+# feature of both parts and is found plate-on-base and base-on-plate
+plate_v, plate_f = box((0.09, -0.1, 0.01), (0.1, 0.1, 0.11))
+parts = [("base", base_w, base_f, np.eye(4)), ("plate", plate_v, plate_f, np.eye(4))]
+seams, _ = detect_weld_seams(parts, contact_tol=1e-4, min_length=0.005)
+length = sum(np.linalg.norm(np.diff(s["points_world"], axis=0), axis=1).sum() for s in seams if s["kind"] == "contact")
+print(f"[INFO] corner joint: {length:.3f} m of contact seam (foot perimeter 0.420 m)")
+if abs(length - 0.42) > 1e-6:
+    failed.append(f"corner joint: expected 0.420 m of seam once, got {length:.3f} m")
+
+print()
+if failed:
+    for msg in failed:
+        print(f"[FAIL] {msg}")
+    sys.exit(1)
+print("[SUCCESS] Contact seams are 90 deg fillets and reported once per link pair")
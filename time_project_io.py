@@ -0,0 +1,110 @@
+"""
+Times .trn save/load for a synthetic 50-link project: format v1 (STL files in
+a temp dir, ZIP_DEFLATED, extract + trimesh.load) against format v2 (binary
+.npy meshes deduplicated by content hash and written directly into the zip).
+
+Usage: python time_project_io.py [n_links] [sphere_subdivisions]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+import trimesh
+
+from core.project_format import ProjectMeshReader, read_project_json, write_project_archive
+
+
+def make_links(n_links, subdivisions):
+    # Every fifth link reuses the same part (fasteners, repeated brackets...)
+    shared = trimesh.creation.icosphere(subdivisions=subdivisions, radius=20.0)
+    links = {}
+    for i in range(n_links):
+        if i % 5 == 0:
+            links[f"link_{i}"] = shared.copy()
+        else:
+            mesh = trimesh.creation.icosphere(subdivisions=subdivisions, radius=20.0 + i)
+            mesh.apply_translation([i * 50.0, 0.0, 0.0])
+            links[f"link_{i}"] = mesh
+    return links
+
+
+def robot_data_for(links):
+    return {
+        "meta": {"mesh_units": "mm", "grid_units_per_cm": 10.0},
+        "links": [{"name": name, "t_offset": np.eye(4).tolist()} for name in links],
+        "joints": [],
+        "ui_state": {},
+        "joint_relations": {},
+    }
+
+
+def save_v1(path, links):
+    robot_data = robot_data_for(links)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        mesh_dir = os.path.join(temp_dir, "meshes")
+        os.makedirs(mesh_dir)
+        for l_data in robot_data["links"]:
+            mesh_filename = f"{l_data['name']}.stl"
+            links[l_data["name"]].export(os.path.join(mesh_dir, mesh_filename), file_type="stl")
+            l_data["mesh_file"] = f"meshes/{mesh_filename}"
+        with open(os.path.join(temp_dir, "robot.json"), "w") as f:
+            json.dump(robot_data, f, indent=4)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for root, dirs, files in os.walk(temp_dir):
+                for file in files:
+                    abs_file = os.path.join(root, file)
+                    zipf.write(abs_file, os.path.relpath(abs_file, temp_dir))
+
+
+def load_v1(path):
+    meshes = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with zipfile.ZipFile(path, "r") as zipf:
+            zipf.extractall(temp_dir)
+        with open(os.path.join(temp_dir, "robot.json")) as f:
+            robot_data = json.load(f)
+        for l_data in robot_data["links"]:
+            meshes[l_data["name"]] = trimesh.load(os.path.join(temp_dir, l_data["mesh_file"]))
+    return meshes
+
+
+def save_v2(path, links):
+    write_project_archive(path, robot_data_for(links), links)
+
+
+def load_v2(path):
+    meshes = {}
+    with zipfile.ZipFile(path, "r") as zipf:
+        robot_data = read_project_json(zipf)
+        reader = ProjectMeshReader(zipf, robot_data)
+        for l_data in robot_data["links"]:
+            meshes[l_data["name"]] = reader.mesh_for_link(l_data)
+    return meshes
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    n_links = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    subdivisions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    links = make_links(n_links, subdivisions)
+    n_faces = sum(len(m.faces) for m in links.values())
+    print(f"{n_links} links, {n_faces} faces total")
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for label, save, load in (("v1", save_v1, load_v1), ("v2", save_v2, load_v2)):
+            path = os.path.join(out_dir, f"bench_{label}.trn")
+            t_save, _ = timed(save, path, links)
+            t_load, meshes = timed(load, path)
+            size_mb = os.path.getsize(path) / 1e6
+            assert all(len(meshes[name].faces) == len(links[name].faces) for name in links)
+            print(f"{label}: save {t_save:6.2f}s  load {t_load:6.2f}s  size {size_mb:7.1f} MB")
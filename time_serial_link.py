@@ -0,0 +1,146 @@
+"""
+Times the host side of the hardware link against the ESP32 emulator (a
+pseudo-terminal running the generated firmware's protocol), so no board is
+needed: send_command call cost, ping round trips through the whole stack,
+joint frame throughput and a streamed trajectory's completion time.
+
+Linux/macOS only (needs a pty). Usage: python time_serial_link.py [n_joints] [n_pings]
+"""
+import sys
+import threading
+import time
+
+import numpy as np
+
+from core.esp32_emulator import ESP32Emulator
+from core.robot import Robot
+from core.serial_manager import SerialManager
+from core.serial_protocol import EVENT_PONG, EVENT_TRAJ
+from core.trajectory_streamer import linear_trajectory
+
+
+class _Signal:
+    def __init__(self):
+        self.count = 0
+
+    def emit(self, message):
+        self.count += 1
+
+
+class _Window:
+    """The parts of MainWindow that SerialManager uses."""
+
+    def __init__(self, robot):
+        self.robot = robot
+        self.log_signal = _Signal()
+        self.current_speed = 50
+
+
+def make_robot(n_joints):
+    robot = Robot()
+    robot.add_link("link_0")
+    for i in range(n_joints):
+        robot.add_link(f"link_{i + 1}")
+        robot.add_joint(f"j{i}", f"link_{i}", f"link_{i + 1}")
+    return robot
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def ping_rtts(sm, n_pings):
+    """Round trips in ms of "PING <n>" lines through queue, pty, emulator, parser and dispatch."""
+    sent = {}
+    rtts = []
+    got = threading.Event()
+
+    def on_pong(event):
+        t_sent = sent.pop(event.data, None)
+        if t_sent is not None:
+            rtts.append((time.perf_counter() - t_sent) * 1000.0)
+            got.set()
+
+    sm.subscribe(on_pong, kinds={EVENT_PONG})
+    for i in range(n_pings):
+        seq = str(60000 + i)  # Clear of the heartbeat's own sequence numbers
+        got.clear()
+        sent[seq] = time.perf_counter()
+        sm.send_raw(f"PING {seq}")
+        got.wait(1.0)
+    sm.unsubscribe(on_pong)
+    return np.array(rtts)
+
+
+def frame_throughput(sm, emulator, names, seconds):
+    """Joint targets for every joint as fast as the caller can produce them, for `seconds`."""
+    tx0, rx0 = sm.tx_stats.get("frames", 0), emulator.stats["frames"]
+    calls = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        angle = 30.0 * np.sin(calls * 0.01)
+        sm.send_joints({name: (angle, 50.0) for name in names})
+        calls += 1
+    time.sleep(0.1)
+    return calls, sm.tx_stats.get("frames", 0) - tx0, emulator.stats["frames"] - rx0
+
+
+def stream_trajectory(sm, emulator, names, steps, step_delay):
+    done = threading.Event()
+    sm.subscribe(lambda event: event.text == "TRAJ DONE" and done.set(), kinds={EVENT_TRAJ})
+    start = {name: 0.0 for name in names}
+    target = {name: 45.0 for name in names}
+    points = linear_trajectory(start, target, steps, step_delay)
+    t0 = time.perf_counter()
+    sm.stream_trajectory(points)
+    finished = done.wait(points[-1][0] + 5.0)
+    elapsed = time.perf_counter() - t0
+    error = max(abs(v - 45.0) for v in emulator.joint_targets().values())
+    return finished, elapsed, points[-1][0], error
+
+
+if __name__ == "__main__":
+    n_joints = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    n_pings = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    robot = make_robot(n_joints)
+    names = list(robot.joints)
+    window = _Window(robot)
+    sm = SerialManager(window)
+
+    with ESP32Emulator(robot) as emulator:
+        t_connect, ok = timed(sm.connect, emulator.port)
+        assert ok, sm.last_error
+        deadline = time.perf_counter() + 2.0
+        while sm.protocol != "binary" and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        print(f"{n_joints} joints, connect {t_connect * 1000:.0f} ms, protocol {sm.protocol}")
+
+        t_calls, _ = timed(lambda: [sm.send_command(names[0], i * 0.01, 50) for i in range(10000)])
+        print(f"send_command: {t_calls / 10000 * 1e6:6.2f} us/call")
+
+        rtt = ping_rtts(sm, n_pings)
+        if len(rtt):
+            p50, p95, p99 = np.percentile(rtt, [50, 95, 99])
+            print(f"ping RTT ({len(rtt)}/{n_pings}): p50 {p50:.2f} ms  p95 {p95:.2f} ms  p99 {p99:.2f} ms")
+
+        calls, tx_frames, rx_frames = frame_throughput(sm, emulator, names, 2.0)
+        print(
+            f"throughput: {calls / 2.0:.0f} send_joints/s coalesced into {tx_frames / 2.0:.0f} frames/s, "
+            f"{rx_frames} of {tx_frames} frames received"
+        )
+
+        finished, elapsed, duration, error = stream_trajectory(sm, emulator, names, 200, 0.01)
+        print(
+            f"trajectory: {duration:.2f}s of waypoints played in {elapsed:.2f}s "
+            f"({'done' if finished else 'TIMED OUT'}), final target error {error:.2f} deg"
+        )
+
+        q = sm.link_quality
+        print(
+            f"link: tx {q['tx_bytes_per_s']:.0f} B/s  rx {q['rx_bytes_per_s']:.0f} B/s  "
+            f"crc errors {q['crc_errors']}  parse errors {q['parse_errors']}"
+        )
+        sm.disconnect()
@@ -10,13 +10,15 @@ class MotorAssignDialog(QtWidgets.QDialog):
 
     Clicking a button selects that motor type with a clear
     visual fill effect. Matches the ToRoTRoN blue/white UI theme.
+    The Board column picks which controller the joint is wired to, for
+    robots split across several ESP32 boards (one sketch per board).
 
     Usage
     -----
         dlg = MotorAssignDialog(robot, parent=self)
         if dlg.exec_() == QtWidgets.QDialog.Accepted:
             assignments = dlg.get_assignments()
-            # -> {"Joint1": "servo", "Joint2": "stepper", ...}
+            # -> {"Joint1": {"type": "servo", "servo_mode": ..., "board": 0}, ...}
     """
 
     # ── Style constants (match main_window.py apply_styles) ──────────────────
@@ -48,7 +50,7 @@ class MotorAssignDialog(QtWidgets.QDialog):
 
         self.setWindowTitle("Motor & Firmware Config")
         self.setModal(True)
-        self.setMinimumWidth(720) # Wider to accommodate config columns
+        self.setMinimumWidth(820) # Wider to accommodate config columns
         self.setWindowFlags(QtCore.Qt.Dialog | QtCore.Qt.WindowCloseButtonHint)
         self.setStyleSheet(f"""
             QDialog {{
@@ -99,8 +101,11 @@ class MotorAssignDialog(QtWidgets.QDialog):
         config_h = QtWidgets.QLabel("Detailed Config")
         config_h.setFixedWidth(180)
         config_h.setAlignment(QtCore.Qt.AlignCenter)
+        board_h = QtWidgets.QLabel("Board")
+        board_h.setFixedWidth(70)
+        board_h.setAlignment(QtCore.Qt.AlignCenter)
         
-        for lbl in [type_h, config_h]:
+        for lbl in [type_h, config_h, board_h]:
             lbl.setStyleSheet("color: #757575; font-size: 11px; font-weight: bold; text-transform: uppercase;")
             h_lay.addWidget(lbl)
             
@@ -304,8 +309,18 @@ class MotorAssignDialog(QtWidgets.QDialog):
         config_slot.addWidget(self.stepper_config) # Index 1
         lay.addWidget(config_slot)
         
+        # ── Board (controller) the joint is wired to ─────────────────────
+        board_sb = QtWidgets.QSpinBox()
+        board_sb.setRange(0, 7)
+        board_sb.setFixedSize(70, 32)
+        board_sb.setToolTip("ESP32 board driving this joint (0 for single-board robots)")
+        board_sb.setStyleSheet("""
+            QSpinBox { border: 1px solid #ddd; border-radius: 4px; padding-left: 5px; font-weight: bold; }
+        """)
+        lay.addWidget(board_sb)
+
         self._config_widgets[joint_name] = config_slot
-        self._configs[joint_name] = {"ratio_sb": ratio_sb, "type_cb": type_cb}
+        self._configs[joint_name] = {"ratio_sb": ratio_sb, "type_cb": type_cb, "board_sb": board_sb}
 
         # Interaction
         btn_servo.clicked.connect(lambda _, jn=joint_name: self._select(jn, "servo"))
@@ -319,6 +334,7 @@ class MotorAssignDialog(QtWidgets.QDialog):
             mtype = prev_data.get("type", "servo").lower()
             if mtype == "stepper": ratio_sb.setValue(prev_data.get("gear_ratio", 1.0))
             if mtype == "servo": type_cb.setCurrentText(prev_data.get("servo_mode", "Standard (0-180)"))
+            board_sb.setValue(int(prev_data.get("board", 0)))
 
         self._selection[joint_name] = mtype
         self._apply_selection(joint_name, mtype)
@@ -372,6 +388,7 @@ class MotorAssignDialog(QtWidgets.QDialog):
                 self._result[name] = {"type": "stepper", "gear_ratio": conf["ratio_sb"].value()}
             else:
                 self._result[name] = {"type": "servo", "servo_mode": conf["type_cb"].currentText()}
+            self._result[name]["board"] = conf["board_sb"].value()
         self.accept()
 
     def get_assignments(self) -> dict:
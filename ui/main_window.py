@@ -5,7 +5,11 @@ from ui.panels.joint_panel import JointPanel
 from ui.panels.matrices_panel import MatricesPanel
 from ui.panels.gripper_panel import GripperPanel
 from ui.panels.simulation_panel import SimulationPanel
-from core.serial_manager import SerialManager
+from core.serial_pool import SerialConnectionPool
+from core.port_watcher import PortWatcher
+from core.serial_capture import capture_path_requested
+from core.mesh_store import MeshStore, mmap_meshes_requested
+from core.local_geometry import LocalGeometryCache, mesh_hull_vertices
 import os
 import time
 import numpy as np
@@ -13,6 +17,7 @@ import random
 from pathlib import Path
 from ui.widgets.code_drawer import CodeDrawer
 from core.firmware_gen import generate_esp32_firmware
+from core.trajectory_streamer import linear_trajectory
 
 # Mixin imports — each provides a subset of MainWindow methods
 from ui.mixins.links_mixin import LinksMixin
@@ -31,6 +36,8 @@ class TypeOnlySpinBox(QtWidgets.QSpinBox):
 
 class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin, NavigationMixin):
     log_signal = QtCore.pyqtSignal(str)
+    serial_connect_signal = QtCore.pyqtSignal(bool)  # Background connect finished: ok
+    ports_changed_signal = QtCore.pyqtSignal(list, list, list)  # Port labels, added devices, removed devices
     
     def __init__(self, enable_3d: bool = True):
         super().__init__()
@@ -39,19 +46,51 @@ class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin,
         self.resize(1200, 800)
         
         self.robot = Robot()
-        self.serial_mgr = SerialManager(self)
+        self.serial_mgr = SerialConnectionPool(self)  # One link per board of the robot
         self.alignment_cache = {} # Cache for storing alignment points: {(parent, child): point}
+        self._tcp_hull_cache = LocalGeometryCache(mesh_hull_vertices)
+        self._tcp_memo = {}       # (link name, return_vec) -> (inputs, get_link_tool_point result)
+        self._gripper_calibrations = {} # control joint names -> (signature, gap calibration)
         self.current_speed = 50   # Global speed setting (0-100%)
+        # Optional memory-mapped geometry for very large assemblies
+        self.mesh_store = None
+        if mmap_meshes_requested():
+            try:
+                self.mesh_store = MeshStore()
+            except OSError as e:
+                print(f"Mesh cache unavailable, keeping meshes in RAM: {e}")
         self.init_ui()
         self.apply_styles()
         
-        # Periodic Port Refresh (Auto-Scan)
-        self.port_scan_timer = QtCore.QTimer(self)
-        self.port_scan_timer.timeout.connect(self.refresh_ports_silently)
-        self.port_scan_timer.start(5000) # Scan every 5s
+        # Port hotplug: the watcher thread lists ports only when a device comes or goes
+        self._linked_ports = {}  # {board: port} the user connected to (kept if a link drops on its own)
+        self._replug_ports = {}  # {board: linked port that was unplugged}; reconnected when it returns
+        self.port_watcher = PortWatcher(self._on_ports_changed_bg)
+        self.port_watcher.start()
+
+        # Hardware "actual" pose overlay, refreshed from position reports while enabled
+        self.actual_pose_timer = QtCore.QTimer(self)
+        self.actual_pose_timer.timeout.connect(self._refresh_actual_pose)
+        
+        # Autosave: journal model deltas every 30s, offer recovery on startup
+        self.current_project_path = None
+        self.autosave_timer = QtCore.QTimer(self)
+        self.autosave_timer.timeout.connect(self.autosave_tick)
+        self.autosave_timer.start(30000)
+        QtCore.QTimer.singleShot(0, self.check_untitled_recovery)
         
         # Connect signals
         self.log_signal.connect(self.log)
+        self.serial_connect_signal.connect(self._on_serial_connect_finished)
+        self.ports_changed_signal.connect(self._on_ports_changed)
+
+        # Serial traffic capture for offline replay ($TOROTRON_SERIAL_CAPTURE)
+        capture_path = capture_path_requested()
+        if capture_path:
+            try:
+                self.serial_mgr.start_capture(capture_path)
+            except OSError as e:
+                self.log(f"[Capture] Could not record serial traffic: {e}")
 
     def init_ui(self):
         central = QtWidgets.QWidget()
@@ -131,6 +170,11 @@ class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin,
             }
         """)
         top_layout.addWidget(self.port_combo)
+        # Port choices of boards 1..N of a multi-board robot (see HardwareMixin._sync_board_port_combos)
+        self.board_port_combos = {}
+        self.board_ports_layout = QtWidgets.QHBoxLayout()
+        self.board_ports_layout.setSpacing(6)
+        top_layout.addLayout(self.board_ports_layout)
         
         self.connect_btn = QtWidgets.QPushButton("Connect")
         self.connect_btn.setCursor(QtCore.Qt.PointingHandCursor)
@@ -346,6 +390,17 @@ class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin,
             }
         """)
         self.terminal_btn.clicked.connect(self.toggle_terminal)
+
+        # --- STATIC BATCHING TOGGLE (next to the terminal button) ---
+        self.batch_static_btn = QtWidgets.QPushButton("▦ Batch Static")
+        self.batch_static_btn.setCheckable(True)
+        self.batch_static_btn.setChecked(True)
+        self.batch_static_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        self.batch_static_btn.setToolTip("Draw links no joint can move as one merged mesh (faster rendering)")
+        self.batch_static_btn.setAccessibleName("Toggle Static Batching")
+        self.batch_static_btn.setFixedHeight(30)
+        self.batch_static_btn.setStyleSheet(self.terminal_btn.styleSheet())
+        self.batch_static_btn.toggled.connect(self.toggle_static_batching)
         
         # Add components to main horizontal splitter
 
@@ -434,7 +489,12 @@ class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin,
         right_vbox.setContentsMargins(0, 0, 0, 0)
         right_vbox.setSpacing(0)
         right_vbox.addWidget(self.right_splitter, 1)
-        right_vbox.addWidget(self.terminal_btn)
+        bottom_bar = QtWidgets.QHBoxLayout()
+        bottom_bar.setContentsMargins(0, 0, 0, 0)
+        bottom_bar.setSpacing(0)
+        bottom_bar.addWidget(self.terminal_btn, 1)
+        bottom_bar.addWidget(self.batch_static_btn)
+        right_vbox.addLayout(bottom_bar)
         
         self.main_splitter.addWidget(right_container)
         
@@ -834,12 +894,16 @@ class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin,
             step_delay = 0.06
 
         if hasattr(self, "serial_mgr") and self.serial_mgr.is_connected:
-            for name, value in target_vals.items():
-                try:
-                    self.serial_mgr.send_command(name, float(value), speed=speed_pct)
-                except Exception:
-                    pass
+            # Stream the same timeline the view animates; text firmware only gets the final target
+            trajectory = linear_trajectory(start_vals, target_vals, steps, step_delay)
+            if not self.serial_mgr.stream_trajectory(trajectory):
+                for name, value in target_vals.items():
+                    try:
+                        self.serial_mgr.send_command(name, float(value), speed=speed_pct)
+                    except Exception:
+                        pass
 
+        t0 = time.perf_counter()
         for i in range(1, steps + 1):
             a = i / steps
             for n, v0 in start_vals.items():
@@ -854,7 +918,8 @@ class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin,
                 self.canvas.update_transforms(self.robot)
             self.update_live_ui()
             QtWidgets.QApplication.processEvents()
-            time.sleep(step_delay)
+            # Pace against the trajectory clock so slow frames don't stretch the move
+            time.sleep(max(0.0, t0 + i * step_delay - time.perf_counter()))
 
         return True
 
@@ -1052,6 +1117,15 @@ class MainWindow(QtWidgets.QMainWindow, LinksMixin, HardwareMixin, ProjectMixin,
             traceback.print_exc()
             return False
 
+    def closeEvent(self, event):
+        if not self.close_journal():
+            event.ignore()
+            return
+        self.autosave_timer.stop()
+        self.port_watcher.stop()
+        self.serial_mgr.stop_capture()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     import sys
     app = QtWidgets.QApplication(sys.argv)
@@ -1,3 +1,5 @@
+import threading
+
 from PyQt5 import QtWidgets, QtCore
 
 
@@ -23,13 +25,45 @@ class HardwareMixin:
             self.connect_btn.setStyleSheet(
                 "background-color: #2e7d32; color: white; font-weight: bold; border-radius: 6px; padding: 8px 18px; font-size: 13px;"
             )
-            self.port_combo.setEnabled(False)
+            for combo in self._port_combos().values():
+                combo.setEnabled(False)
         else:
             self.connect_btn.setText("Connect")
             self.connect_btn.setStyleSheet(
                 "background-color: #d32f2f; color: white; font-weight: bold; border-radius: 6px; padding: 8px 18px; font-size: 13px;"
             )
-            self.port_combo.setEnabled(True)
+            for combo in self._port_combos().values():
+                combo.setEnabled(True)
+
+    def _port_combos(self):
+        """{board: port combo}: the top-bar combo is the primary board's, plus one per further board."""
+        combos = {self.serial_mgr.boards[0]: self.port_combo}
+        combos.update(getattr(self, "board_port_combos", {}))
+        return combos
+
+    def _port_combo_of(self, board=None):
+        return self._port_combos().get(board, self.port_combo)
+
+    def _sync_board_port_combos(self):
+        """One port choice per board of a multi-board robot: adds combos for new boards, drops gone ones."""
+        boards = self.serial_mgr.boards
+        extra = boards[1:]
+        for board in list(self.board_port_combos):
+            if board not in extra:
+                combo = self.board_port_combos.pop(board)
+                self.board_ports_layout.removeWidget(combo)
+                combo.deleteLater()
+        for board in extra:
+            if board in self.board_port_combos:
+                continue
+            combo = QtWidgets.QComboBox()
+            combo.setFixedWidth(160)
+            combo.setStyleSheet(self.port_combo.styleSheet())
+            combo.setToolTip(f"Serial port of board {board}")
+            self.board_port_combos[board] = combo
+            self.board_ports_layout.insertWidget(sorted(self.board_port_combos).index(board), combo)
+        self.port_combo.setToolTip(f"Serial port of board {boards[0]}" if extra else "")
+        self.refresh_ports(silent=True)
 
     @staticmethod
     def _is_esp32_like_port(port_text: str) -> bool:
@@ -56,8 +90,11 @@ class HardwareMixin:
                 pass
         return self._is_esp32_like_port(port_text)
 
-    def _best_port_index(self, ports, current_text, connected_port_text):
-        """Pick best UI selection: connected port > previous port > ESP32-like > first."""
+    def _best_port_index(self, ports, current_text, connected_port_text, taken=()):
+        """
+        Pick best UI selection: connected port > previous port > ESP32-like >
+        first, preferring ports not `taken` by another board's choice.
+        """
         if not ports:
             return -1
 
@@ -74,102 +111,158 @@ class HardwareMixin:
                 if self._raw_port(label) == current_raw:
                     return idx
 
+        taken_raw = {self._raw_port(p) for p in taken}
+        for idx, port in enumerate(ports):
+            if self._is_esp32_port(port) and self._raw_port(port) not in taken_raw:
+                return idx
+        for idx, port in enumerate(ports):
+            if self._raw_port(port) not in taken_raw:
+                return idx
         for idx, port in enumerate(ports):
             if self._is_esp32_port(port):
                 return idx
 
         return 0
 
-    def refresh_ports(self, silent=False):
-        """Update the list of available COM ports."""
-        current = self.port_combo.currentText()
-        ports = self.serial_mgr.get_available_ports()
-        connected_port = self.serial_mgr.port_name if self.serial_mgr.is_connected else ""
+    def refresh_ports(self, silent=False, ports=None):
+        """Update the lists of available COM ports (`ports`: labels already listed by the port watcher)."""
+        if ports is None:
+            ports = self.serial_mgr.get_available_ports()
         port_raw_set = {self._raw_port(p) for p in ports}
-        connected_raw = self._raw_port(connected_port)
-        
-        # Avoid clearing if lists are same to prevent flickering
-        existing = [self.port_combo.itemText(i) for i in range(self.port_combo.count())]
-        if set(ports) == set(existing) and ports:
-            self._set_connection_button_ui(self.serial_mgr.is_connected)
+        combos = self._port_combos()
+        primary = self.serial_mgr.boards[0]
+
+        chosen = []
+        for board, combo in combos.items():
+            sm = self.serial_mgr.manager(board)
+            connected_port = sm.port_name if sm.is_connected else ""
+            self._refresh_port_combo(combo, ports, connected_port, chosen, silent or board != primary)
+            chosen.append(combo.currentText())
 
             # If connected and the device disappears, auto-disconnect to prevent stale state.
-            if self.serial_mgr.is_connected and connected_raw and connected_raw not in port_raw_set:
-                self.serial_mgr.disconnect()
-                self._set_connection_button_ui(False)
+            connected_raw = self._raw_port(connected_port)
+            if sm.is_connected and connected_raw and connected_raw not in port_raw_set:
+                sm.disconnect()
                 if not silent:
-                    self._safe_log("ESP32 disconnected (port no longer available).")
+                    where = f" (board {board})" if len(combos) > 1 else ""
+                    self._safe_log(f"ESP32 disconnected{where} (port no longer available).")
                 if hasattr(self, "program_tab"):
                     self.program_tab.update_hw_badge()
+
+        self._set_connection_button_ui(self.serial_mgr.is_connected)
+
+    def _refresh_port_combo(self, combo, ports, connected_port, taken, silent):
+        current = combo.currentText()
+        # Avoid clearing if lists are same to prevent flickering
+        existing = [combo.itemText(i) for i in range(combo.count())]
+        if set(ports) == set(existing) and ports:
             return
 
-        self.port_combo.clear()
+        combo.clear()
         if ports:
-            self.port_combo.addItems(ports)
-        
-        # Auto-selection logic
-        if ports:
-            best_idx = self._best_port_index(ports, current, connected_port)
-            self.port_combo.setCurrentIndex(best_idx)
+            combo.addItems(ports)
+
+            # Auto-selection logic
+            combo.setCurrentIndex(self._best_port_index(ports, current, connected_port, taken))
 
             if not silent:
-                selected = self.port_combo.currentText()
+                selected = combo.currentText()
                 if self._is_esp32_port(selected):
                     self._safe_log(f"ESP32 detected: {selected}")
                 else:
                     self._safe_log(f"Serial port detected: {selected}")
         else:
-            self.port_combo.addItem("No ESP32/Serial device detected")
+            combo.addItem("No ESP32/Serial device detected")
 
-        # If connected and selected port disappears, disconnect and update UI.
-        if self.serial_mgr.is_connected and connected_raw and connected_raw not in port_raw_set:
-            self.serial_mgr.disconnect()
-            self._set_connection_button_ui(False)
-            if not silent:
-                self._safe_log("ESP32 disconnected (port no longer available).")
-            if hasattr(self, "program_tab"):
-                self.program_tab.update_hw_badge()
-        else:
-            self._set_connection_button_ui(self.serial_mgr.is_connected)
+    def _on_ports_changed_bg(self, devices, added, removed):
+        """PortWatcher callback (watcher thread): builds the labels there, the GUI only swaps them in."""
+        labels = self.serial_mgr.get_available_ports()
+        self.ports_changed_signal.emit(labels, sorted(added), sorted(removed))
 
-    def refresh_ports_silently(self):
-        """Timer callback to scan ports without logging unless count changes."""
-        self.refresh_ports(silent=True)
+    def _on_ports_changed(self, labels, added, removed):
+        """A serial device was plugged in or removed: update the lists, reconnect replugged boards."""
+        self.refresh_ports(silent=True, ports=labels)
+
+        # The I/O threads may already have dropped a link, so go by the ports the user linked
+        unplugged = {board: port for board, port in self._linked_ports.items() if port in removed}
+        for board, port in unplugged.items():
+            del self._linked_ports[board]
+            self._replug_ports[board] = port
+            self._safe_log(f"🔌 {port} unplugged; reconnecting when it is plugged back in.")
+        if unplugged:
+            return
+
+        pending = {b: p for b, p in self._replug_ports.items() if not self.serial_mgr.manager(b).is_connected}
+        # Same device node, or the only new one (the board may re-enumerate under another name)
+        matches = {b: p for b, p in pending.items() if p in added}
+        if not matches and len(pending) == 1 and len(added) == 1:
+            matches = {next(iter(pending)): added[0]}
+        if not matches:
+            return
+        for board, port in matches.items():
+            self._replug_ports.pop(board, None)
+            self._safe_log(f"🔌 {port} is back; reconnecting...")
+        self.connect_btn.setEnabled(False)
+        self.connect_btn.setText("Reconnecting...")
+        self.port_watcher.pause()
+
+        results = {}
+        lock = threading.Lock()
+
+        def done(board, port, ok):
+            if not ok:
+                self._replug_ports[board] = port  # Try again on the next replug
+            with lock:
+                results[board] = ok
+                if len(results) < len(matches):
+                    return
+            if any(results.values()):
+                # The boards rebooted with their power-on pose; give them the current one
+                self.serial_mgr.sync_all_to_hardware()
+            self.serial_connect_signal.emit(all(results.values()))
+
+        for board, port in matches.items():
+            self.serial_mgr.reconnect_async(board, port, lambda ok, b=board, p=port: done(b, p, ok))
 
     def toggle_connection(self):
-        """Connect or disconnect from the selected serial port."""
+        """Connect or disconnect the selected serial port of every board."""
         if not self.serial_mgr.is_connected:
-            port = self.port_combo.currentText()
-            if not port or "detected" in port.lower():
-                self.log("Cannot connect: No serial ports detected.")
+            ports = {board: combo.currentText() for board, combo in self._port_combos().items()}
+            for board, port in ports.items():
+                if not port or "detected" in port.lower():
+                    where = f" for board {board}" if len(ports) > 1 else ""
+                    self.log(f"Cannot connect: No serial ports detected{where}.")
+                    return
+            if len({self._raw_port(p) for p in ports.values()}) < len(ports):
+                self.log("Cannot connect: every board needs its own serial port.")
                 return
 
             # --- PREVENT CONFLICTS ---
-            # Temporarily stop all background scans to avoid competing for the port
-            if hasattr(self, 'port_scan_timer'): self.port_scan_timer.stop()
+            # Temporarily stop all background scans to avoid competing for the port;
+            # opening it can reset the board, which must not look like a replug
+            self._linked_ports.clear()
+            self._replug_ports.clear()
+            self.serial_mgr.cancel_reconnect()
+            if hasattr(self, 'port_watcher'): self.port_watcher.pause()
             if hasattr(self, 'code_drawer') and hasattr(self.code_drawer, 'detect_timer'):
                 self.code_drawer.detect_timer.stop()
 
-            self.log(f"Attempting connection to {port}...")
-            if self.serial_mgr.connect(port):
-                self._set_connection_button_ui(True)
-                if hasattr(self, "show_toast"):
-                    self.show_toast(f"✅ Hardware Linked: {self.serial_mgr.port_name}", "success")
-            else:
-                # Restart scans on failure
-                if hasattr(self, 'port_scan_timer'): self.port_scan_timer.start(5000)
-                if hasattr(self, 'code_drawer') and hasattr(self.code_drawer, 'detect_timer'):
-                    self.code_drawer.detect_timer.start(3000)
-
-            # Update Hardware Badge in Program Panel
-            if hasattr(self, 'program_tab'):
-                self.program_tab.update_hw_badge()
+            self.log(f"Attempting connection to {', '.join(ports.values())}...")
+            # Retries can take seconds; connect off the GUI thread, all boards at once
+            self.connect_btn.setEnabled(False)
+            self.connect_btn.setText("Connecting...")
+            self.serial_mgr.connect_async(
+                ports, lambda results: self.serial_connect_signal.emit(bool(results) and all(results.values()))
+            )
         else:
+            self._linked_ports.clear()
+            self._replug_ports.clear()
+            self.serial_mgr.cancel_reconnect()
             self.serial_mgr.disconnect()
             self._set_connection_button_ui(False)
             
             # Restart background scans now that port is free
-            if hasattr(self, 'port_scan_timer'): self.port_scan_timer.start(5000)
+            if hasattr(self, 'port_watcher'): self.port_watcher.resume()
             if hasattr(self, 'code_drawer') and hasattr(self.code_drawer, 'detect_timer'):
                 self.code_drawer.detect_timer.start(3000)
 
@@ -178,8 +271,50 @@ class HardwareMixin:
                 if hasattr(self.program_tab, 'update_hw_badge'):
                     self.program_tab.update_hw_badge()
 
-    def on_firmware_upload_success(self, port):
-        """Called automatically after a successful code upload to the ESP32."""
+    def _on_serial_connect_finished(self, ok):
+        """GUI-thread half of toggle_connection (and replug reconnects), once the background connects are done."""
+        self.connect_btn.setEnabled(True)
+        # Watch for unplugs while connected, and for ports to retry after a failure
+        if hasattr(self, 'port_watcher'): self.port_watcher.resume()
+        self._linked_ports.update(self.serial_mgr.port_names)
+        connected = self.serial_mgr.is_connected
+        self._set_connection_button_ui(connected)
+        if ok:
+            if hasattr(self, "show_toast"):
+                self.show_toast(f"✅ Hardware Linked: {', '.join(self.serial_mgr.port_names.values())}", "success")
+        elif connected:
+            missing = [b for b in self.serial_mgr.boards if b not in self.serial_mgr.connected_boards]
+            self.log(f"⚠️ Board(s) {', '.join(map(str, missing))} not connected; only the connected boards are driven.")
+        else:
+            # Restart scans on failure
+            if hasattr(self, 'code_drawer') and hasattr(self.code_drawer, 'detect_timer'):
+                self.code_drawer.detect_timer.start(3000)
+
+        # Update Hardware Badge in Program Panel
+        if hasattr(self, 'program_tab'):
+            self.program_tab.update_hw_badge()
+
+    def set_actual_pose_visible(self, visible):
+        """Turns the translucent hardware pose overlay on or off."""
+        if visible:
+            self.actual_pose_timer.start(50)  # 20 Hz, the firmware's default report rate
+        else:
+            self.actual_pose_timer.stop()
+            if getattr(self, "canvas", None) is not None:
+                self.canvas.clear_actual_pose()
+
+    def _refresh_actual_pose(self):
+        """Timer callback: draws the pose from the newest position report, if any is recent."""
+        if getattr(self, "canvas", None) is None:
+            return
+        actual = self.serial_mgr.actual_joint_values() if self.serial_mgr.is_connected else None
+        if actual is None:
+            self.canvas.clear_actual_pose()
+            return
+        self.canvas.set_actual_pose(self.robot.world_transforms(actual))
+
+    def on_firmware_upload_success(self, port, board=None):
+        """Called automatically after a successful code upload to the ESP32 of `board` (the primary for None)."""
         self.log(f"📡 Firmware uploaded successfully. Initializing Digital Twin sync on {port}...")
         
         # Wait for the ESP32 to reboot and become available for serial again
@@ -191,10 +326,12 @@ class HardwareMixin:
             self.refresh_ports(silent=True)
             
             # Attempt to connect
-            if not self.serial_mgr.is_connected:
+            sm = self.serial_mgr.manager(board)
+            if not sm.is_connected:
                 # Use the provided port or the currently selected one
-                target_port = port if port else self.port_combo.currentText()
-                if self.serial_mgr.connect(target_port):
+                target_port = port if port else self._port_combo_of(board).currentText()
+                if sm.connect(target_port):
+                    self._linked_ports[self.serial_mgr.boards[0] if board is None else board] = sm.port_name
                     # Use QMetaObject.invokeMethod to safely update UI from background thread
                     from PyQt5.QtCore import QMetaObject, Qt, Q_ARG
                     QMetaObject.invokeMethod(self, "_set_connection_button_ui", Qt.QueuedConnection, Q_ARG(bool, True))
@@ -3,6 +3,8 @@ import numpy as np
 import os
 import random
 
+from core.mesh_import import TessellationCache, start_import_process
+
 
 class LinksMixin:
     """Methods for managing robot links: import, select, base, remove, color."""
@@ -279,128 +281,250 @@ class LinksMixin:
             self, "Import Mesh", "", "3D Files (*.stl *.step *.stp *.obj)"
         )
         if file_path:
-            self.log(f"Importing: {os.path.basename(file_path)}")
-            import trimesh
+            self._start_mesh_import(file_path)
+
+    def _tessellation_cache(self):
+        """Lazily created on-disk cache of tessellated CAD files (None if unavailable)."""
+        if not hasattr(self, "_tess_cache"):
             try:
-                loaded = trimesh.load(file_path)
-                
-                # Handle Scenes (often returned by STEP/STEP files)
-                if isinstance(loaded, trimesh.Scene):
-                    self.log("Detected assembly/scene. Merging meshes...")
-                    mesh = loaded.to_mesh() 
-                else:
-                    mesh = loaded
-
-                # VALIDATION: Check if mesh is empty
-                if not hasattr(mesh, 'vertices') or len(mesh.vertices) == 0:
-                     self.log("ERROR: Imported mesh has 0 vertices! The file might be empty or incompatible.")
-                     return
-
-                # IMPORT "AS IS" - No forced scale ratios
-                bounds = mesh.bounds
-                raw_size = bounds[1] - bounds[0]
-                max_dim = max(raw_size)
-                self.log(f"Original CAD Units: {raw_size[0]:.1f} x {raw_size[1]:.1f} x {raw_size[2]:.1f}")
-
-                # Automatic Unit Detection
-                #
-                # Internal world units are treated as millimeters (default canvas.grid_units_per_cm = 10).
-                # Keep that invariant stable and normalize imported CAD units into millimeters so:
-                # - UI values are always centimeters
-                # - Kinematics/IK/FK and meshes stay in the same unit system
-                if max_dim < 1.0:
-                    # Likely meters (e.g. 0.090). Convert m -> mm.
-                    self.log(f"Auto-Detected: Unit appears to be METERS ({max_dim:.3f} units). Scaling mesh x1000 (m -> mm)...")
-                    mesh.apply_scale(1000.0)
-                elif max_dim > 150:
-                    # Likely already millimeters (robot-scale parts are hundreds of mm).
-                    self.log(f"Auto-Detected: Unit appears to be MILLIMETERS ({max_dim:.1f} units). No scaling applied.")
-                else:
-                    # Common case for some CAD exports: centimeters. Convert cm -> mm.
-                    self.log(f"Auto-Detected: Unit appears to be CENTIMETERS ({max_dim:.1f} units). Scaling mesh x10 (cm -> mm)...")
-                    mesh.apply_scale(10.0)
-                
-                # Assign a random distinct color
-                colors = ["#e74c3c", "#3498db", "#2ecc71", "#f1c40f", "#9b59b6", "#1abc9c", "#e67e22", "#95a5a6"]
-                link_color = random.choice(colors)
+                self._tess_cache = TessellationCache()
+            except OSError as e:
+                self.log(f"Tessellation cache unavailable: {e}")
+                self._tess_cache = None
+        return self._tess_cache
 
-                name = os.path.basename(file_path).split('.')[0]
-                
-                # Handle unique naming
-                base_name = name
-                counter = 1
-                while name in self.robot.links:
-                    name = f"{base_name}_{counter}"
-                    counter += 1
-                
-                link = self.robot.add_link(name, mesh)
-                link.color = link_color
-                
-                # Tag as Simulation Object if imported in simulation mode
-                if hasattr(self, 'sim_toggle_btn') and self.sim_toggle_btn.isChecked():
-                    link.is_sim_obj = True
-                
-                # Use new helper to add row with 'Eye' button
-                self.add_link_item(name)
-                
-                # Default spawn position: (50, 50, 50) cm
-                ratio = self.canvas.grid_units_per_cm
-                t_import = np.eye(4)
-                t_import[:3, 3] = [50.0 * ratio, 50.0 * ratio, 50.0 * ratio]
-                link.t_offset = t_import
-                
-                self.canvas.update_link_mesh(name, mesh, t_import, color=link.color)
-                
-                # SELF-ADJUSTING GRAPH: 
-                # If component is larger than grid, expand the grid automatically
-                actor = self.canvas.actors[name]
-                self.canvas.ensure_grid_fits_bounds(actor.GetBounds())
+    def _start_mesh_import(self, file_path):
+        """
+        Imports a mesh without blocking the GUI: a cached tessellation is used
+        directly, otherwise a worker process loads/tessellates the file while
+        a cancellable progress dialog is shown.
+        """
+        if getattr(self, "_import_job", None) is not None:
+            self.show_toast("An import is already running", "warning")
+            return
+
+        self.log(f"Importing: {os.path.basename(file_path)}")
+        cache = self._tessellation_cache()
+        folder = cache.find(file_path) if cache is not None else None
+        if folder is not None:
+            self.log("Using cached tessellation (file unchanged since last import).")
+            try:
+                mesh = cache.load(folder, getattr(self, "mesh_store", None))
+            except Exception as e:
+                self.log(f"Cached tessellation unreadable, re-importing: {e}")
+            else:
+                self._add_imported_mesh(file_path, mesh)
+                return
+
+        process, queue = start_import_process(file_path, cache.cache_dir if cache is not None else None)
+
+        dialog = QtWidgets.QProgressDialog(f"Importing {os.path.basename(file_path)}...", "Cancel", 0, 100, self)
+        dialog.setWindowTitle("Import Mesh")
+        dialog.setMinimumDuration(300)
+        dialog.setValue(0)
+        dialog.canceled.connect(self._cancel_mesh_import)
+
+        timer = QtCore.QTimer(self)
+        timer.setInterval(50)
+        timer.timeout.connect(self._poll_mesh_import)
+        self._import_job = {
+            "file_path": file_path,
+            "process": process,
+            "queue": queue,
+            "dialog": dialog,
+            "timer": timer,
+        }
+        timer.start()
+
+    def _poll_mesh_import(self):
+        """GUI-thread tick: relays worker progress and picks up the result."""
+        import queue as queue_mod
+
+        job = getattr(self, "_import_job", None)
+        if job is None:
+            return
+
+        while True:
+            try:
+                msg = job["queue"].get_nowait()
+            except queue_mod.Empty:
+                break
+
+            kind = msg[0]
+            if kind == "progress":
+                job["dialog"].setValue(msg[1])
+                job["dialog"].setLabelText(msg[2])
+            elif kind == "done":
+                folder, sha1, merged_scene = msg[1], msg[2], msg[3]
+                self._end_mesh_import()
+                cache = self._tessellation_cache()
+                try:
+                    cache.remember_hash(job["file_path"], sha1)
+                except OSError:
+                    pass
+                if merged_scene:
+                    self.log("Detected assembly/scene. Merged meshes.")
+                try:
+                    mesh = cache.load(folder, getattr(self, "mesh_store", None))
+                except Exception as e:
+                    self.log(f"Error: {str(e)}")
+                    return
+                self._add_imported_mesh(job["file_path"], mesh)
+                return
+            elif kind == "mesh":
+                # Imported without the tessellation cache
+                import trimesh
+                vertices, faces, merged_scene = msg[1], msg[2], msg[3]
+                self._end_mesh_import()
+                if merged_scene:
+                    self.log("Detected assembly/scene. Merged meshes.")
+                self._add_imported_mesh(job["file_path"], trimesh.Trimesh(vertices=vertices, faces=faces, process=False))
+                return
+            elif kind == "missing_dependency":
+                self._end_mesh_import()
+                self.log(f"MISSING DEPENDENCY: {msg[1]}")
+                QtWidgets.QMessageBox.critical(self, "Import Error", 
+                    f"To load STEP files, you need extra libraries.\n\nError: {msg[1]}\n\n"
+                    "I am currently trying to install 'cascadio' for you. "
+                    "Please restart the app once the installation finishes.")
+                return
+            elif kind == "error":
+                self._end_mesh_import()
+                self.log(f"Error: {msg[1]}")
+                return
+
+        if not job["process"].is_alive() and job["queue"].empty():
+            self._end_mesh_import()
+            self.log(f"Error: import worker exited unexpectedly (code {job['process'].exitcode}).")
+
+    def _cancel_mesh_import(self):
+        job = getattr(self, "_import_job", None)
+        if job is None:
+            return
+        job["process"].terminate()
+        self._end_mesh_import()
+        self.log(f"Import cancelled: {os.path.basename(job['file_path'])}")
+
+    def _end_mesh_import(self):
+        job = getattr(self, "_import_job", None)
+        if job is None:
+            return
+        self._import_job = None
+        job["timer"].stop()
+        job["dialog"].blockSignals(True)
+        job["dialog"].close()
+
+    def _add_imported_mesh(self, file_path, mesh):
+        """Unit detection, naming and scene setup for a freshly loaded mesh."""
+        try:
+            # VALIDATION: Check if mesh is empty
+            if not hasattr(mesh, 'vertices') or len(mesh.vertices) == 0:
+                self.log("ERROR: Imported mesh has 0 vertices! The file might be empty or incompatible.")
+                return
+
+            # IMPORT "AS IS" - No forced scale ratios
+            bounds = mesh.bounds
+            raw_size = bounds[1] - bounds[0]
+            max_dim = max(raw_size)
+            self.log(f"Original CAD Units: {raw_size[0]:.1f} x {raw_size[1]:.1f} x {raw_size[2]:.1f}")
+
+            # Automatic Unit Detection
+            #
+            # Internal world units are treated as millimeters (default canvas.grid_units_per_cm = 10).
+            # Keep that invariant stable and normalize imported CAD units into millimeters so:
+            # - UI values are always centimeters
+            # - Kinematics/IK/FK and meshes stay in the same unit system
+            if max_dim < 1.0:
+                # Likely meters (e.g. 0.090). Convert m -> mm.
+                self.log(f"Auto-Detected: Unit appears to be METERS ({max_dim:.3f} units). Scaling mesh x1000 (m -> mm)...")
+                mesh.apply_scale(1000.0)
+            elif max_dim > 150:
+                # Likely already millimeters (robot-scale parts are hundreds of mm).
+                self.log(f"Auto-Detected: Unit appears to be MILLIMETERS ({max_dim:.1f} units). No scaling applied.")
+            else:
+                # Common case for some CAD exports: centimeters. Convert cm -> mm.
+                self.log(f"Auto-Detected: Unit appears to be CENTIMETERS ({max_dim:.1f} units). Scaling mesh x10 (cm -> mm)...")
+                mesh.apply_scale(10.0)
+
+            # Large meshes move into the memory-mapped cache when enabled
+            if getattr(self, "mesh_store", None) is not None:
+                mesh = self.mesh_store.adopt(mesh)
+            
+            # Assign a random distinct color
+            colors = ["#e74c3c", "#3498db", "#2ecc71", "#f1c40f", "#9b59b6", "#1abc9c", "#e67e22", "#95a5a6"]
+            link_color = random.choice(colors)
+
+            name = os.path.basename(file_path).split('.')[0]
+            
+            # Handle unique naming
+            base_name = name
+            counter = 1
+            while name in self.robot.links:
+                name = f"{base_name}_{counter}"
+                counter += 1
+            
+            link = self.robot.add_link(name, mesh)
+            link.color = link_color
+            
+            # Tag as Simulation Object if imported in simulation mode
+            if hasattr(self, 'sim_toggle_btn') and self.sim_toggle_btn.isChecked():
+                link.is_sim_obj = True
+            
+            # Use new helper to add row with 'Eye' button
+            self.add_link_item(name)
+            
+            # Default spawn position: (50, 50, 50) cm
+            ratio = self.canvas.grid_units_per_cm
+            t_import = np.eye(4)
+            t_import[:3, 3] = [50.0 * ratio, 50.0 * ratio, 50.0 * ratio]
+            link.t_offset = t_import
+            
+            self.canvas.update_link_mesh(name, mesh, t_import, color=link.color)
+            
+            # SELF-ADJUSTING GRAPH: 
+            # If component is larger than grid, expand the grid automatically
+            actor = self.canvas.actors[name]
+            self.canvas.ensure_grid_fits_bounds(actor.GetBounds())
+            
+            self.log(f"Successfully loaded: {name}")
+            
+            # Auto-select and focus
+            self.canvas.select_actor(name)
+            self.canvas.focus_on_actor(name)
+            
+            self.update_link_colors()
+            
+            # Refresh Simulation Objects list if needed
+            if getattr(link, 'is_sim_obj', False):
+                self.refresh_sim_objects_list()
                 
-                self.log(f"Successfully loaded: {name}")
+                # --- AUTO-SELECT and AUTO-POPULATE DIM on import ---
+                # Find and select the newly-imported item in the sim objects list
+                sim_list = self.simulation_tab.objects_list
+                for i in range(sim_list.count()):
+                    item_i = sim_list.item(i)
+                    if item_i and item_i.text() == name:
+                        sim_list.setCurrentItem(item_i)
+                        break
                 
-                # Auto-select and focus
-                self.canvas.select_actor(name)
-                self.canvas.focus_on_actor(name)
+                # Populate DIM fields and object info immediately
+                self.simulation_tab.refresh_object_info(name)
                 
-                self.update_link_colors()
+                # --- INDUSTRIAL READINESS: Auto-capture P1 and set P2 ---
+                # 1. Capture current bottom-center as P1
+                self.simulation_tab.capture_object_to_p1()
                 
-                # Refresh Simulation Objects list if needed
-                if getattr(link, 'is_sim_obj', False):
-                    self.refresh_sim_objects_list()
-                    
-                    # --- AUTO-SELECT and AUTO-POPULATE DIM on import ---
-                    # Find and select the newly-imported item in the sim objects list
-                    sim_list = self.simulation_tab.objects_list
-                    for i in range(sim_list.count()):
-                        item_i = sim_list.item(i)
-                        if item_i and item_i.text() == name:
-                            sim_list.setCurrentItem(item_i)
-                            break
-                    
-                    # Populate DIM fields and object info immediately
-                    self.simulation_tab.refresh_object_info(name)
-                    
-                    # --- INDUSTRIAL READINESS: Auto-capture P1 and set P2 ---
-                    # 1. Capture current bottom-center as P1
-                    self.simulation_tab.capture_object_to_p1()
-                    
-                    # 2. Set default P2 (e.g., 20cm away in Y axis)
-                    p1_y = self.simulation_tab.pick_y.value()
-                    self.simulation_tab.place_x.setValue(self.simulation_tab.pick_x.value())
-                    self.simulation_tab.place_y.setValue(p1_y + 20.0) # Move 20cm north
-                    self.simulation_tab.place_z.setValue(0.0) # Place at floor
-                    
-                    self.log(f"📐 System Ready: Dimensions and P1/P2 auto-populated for '{name}'.")
-                    self.show_toast(f"Robot ready to pick {name}", "success")
+                # 2. Set default P2 (e.g., 20cm away in Y axis)
+                p1_y = self.simulation_tab.pick_y.value()
+                self.simulation_tab.place_x.setValue(self.simulation_tab.pick_x.value())
+                self.simulation_tab.place_y.setValue(p1_y + 20.0) # Move 20cm north
+                self.simulation_tab.place_z.setValue(0.0) # Place at floor
                 
-            except ImportError as ie:
-                self.log(f"MISSING DEPENDENCY: {str(ie)}")
-                QtWidgets.QMessageBox.critical(self, "Import Error", 
-                    f"To load STEP files, you need extra libraries.\n\nError: {str(ie)}\n\n"
-                    "I am currently trying to install 'cascadio' for you. "
-                    "Please restart the app once the installation finishes.")
-            except Exception as e:
-                self.log(f"Error: {str(e)}")
+                self.log(f"📐 System Ready: Dimensions and P1/P2 auto-populated for '{name}'.")
+                self.show_toast(f"Robot ready to pick {name}", "success")
+            
+        except Exception as e:
+            self.log(f"Error: {str(e)}")
 
     def add_link_item(self, name):
         """Helper to add an item to the list with a focus button."""
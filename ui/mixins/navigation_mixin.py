@@ -1,7 +1,45 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 import numpy as np
 
-from core.firmware_gen import generate_esp32_firmware
+from core.firmware_gen import generate_board_firmwares, generate_esp32_firmware
+from core.serial_protocol import board_ids
+
+# Samples of the gap-versus-alpha curve taken when a gripper is calibrated
+GRIPPER_GAP_SAMPLES = 33
+
+# Joint attributes get_link_tool_point depends on (memo inputs)
+_TCP_JOINT_ATTRS = (
+    'is_gripper', 'gripping_surface_touch_only', 'paired_gripping_enabled',
+    'gripping_surface_name', 'gripping_surface_link_name',
+    'gripping_surface_center_local', 'gripping_surface_normal_local',
+    'contact_surface_name', 'contact_surface_link_name',
+    'contact_surface_center_local', 'contact_surface_normal_local',
+    'paired_gripping_surface_joint_name', 'paired_gripping_surface_name',
+    'paired_gripping_surface_link_name',
+    'paired_gripping_surface_center_local', 'paired_gripping_surface_normal_local',
+)
+_TCP_SURFACE_LINK_ATTRS = (
+    'gripping_surface_link_name', 'contact_surface_link_name', 'paired_gripping_surface_link_name',
+)
+
+
+def _same_tcp_inputs(old, new):
+    # Arrays and model objects are compared by identity: every edit in the
+    # app assigns a new array, and an identity miss only costs a recompute.
+    return len(old) == len(new) and all(
+        a is b or (isinstance(a, (int, float, str)) and a == b)
+        for a, b in zip(old, new)
+    )
+
+
+def _copy_tcp_result(result):
+    world, local, extra = result
+    if isinstance(extra, dict):
+        extra = {
+            key: (value.copy() if isinstance(value, np.ndarray) else list(value) if isinstance(value, list) else value)
+            for key, value in extra.items()
+        }
+    return np.array(world, dtype=float), np.array(local, dtype=float), extra
 
 
 class ToastNotification(QtWidgets.QFrame):
@@ -626,12 +664,60 @@ class NavigationMixin:
 
         return gripping_samples if len(gripping_samples) >= 2 else fallback_samples
 
+    def _link_hull_vertices(self, link):
+        """Convex-hull vertices of a link's mesh in its own frame, cached per mesh."""
+        return self._tcp_hull_cache.get(link.name, link.mesh)
+
+    def _link_extent_along(self, link, axis):
+        """(min, max) of a link's mesh projected on a world axis at its current pose."""
+        # v_world . axis == v_local . (R^T axis) + t . axis, so only the hull is projected
+        projected = self._link_hull_vertices(link) @ (link.t_world[:3, :3].T @ axis)
+        offset = float(link.t_world[:3, 3] @ axis)
+        return float(np.min(projected)) + offset, float(np.max(projected)) + offset
+
+    def _tcp_memo_inputs(self, link):
+        """Everything get_link_tool_point reads besides geometry it caches itself."""
+        mesh = link.mesh
+        inputs = [
+            self.robot.kinematics_version, link.t_world, mesh, hash(mesh),
+            getattr(link, 'custom_tcp_offset', None),
+        ]
+        for joint in link.child_joints:
+            inputs.append(joint)
+            inputs.extend(getattr(joint, attr, None) for attr in _TCP_JOINT_ATTRS)
+            child = joint.child_link
+            if child is not None:
+                child_mesh = child.mesh
+                inputs.extend((child, child.t_world, child_mesh, hash(child_mesh)))
+            for attr in _TCP_SURFACE_LINK_ATTRS:
+                surface_link = self.robot.links.get(getattr(joint, attr, None) or "")
+                inputs.append(surface_link.t_world if surface_link is not None else None)
+        return inputs
+
     def get_link_tool_point(self, link, return_vec=False):
         """
         Calculates the Tool Center Point (TCP) in World and Local coords.
         - If the link has related child joints ('Gripper'), calculates midpoint between fingers.
         - Otherwise, calculates the center-top point of the mesh bounds.
+
+        Memoized per link until the kinematic state (robot.kinematics_version),
+        a finger mesh or the gripper surface selection changes, so repeated
+        calls within one tick or IK step are free. Callers get copies.
         """
+        if not link:
+            return self._compute_link_tool_point(link, return_vec)
+
+        key = (link.name, bool(return_vec))
+        inputs = self._tcp_memo_inputs(link)
+        cached = self._tcp_memo.get(key)
+        if cached is not None and _same_tcp_inputs(cached[0], inputs):
+            result = cached[1]
+        else:
+            result = self._compute_link_tool_point(link, return_vec)
+            self._tcp_memo[key] = (inputs, result)
+        return _copy_tcp_result(result)
+
+    def _compute_link_tool_point(self, link, return_vec=False):
         if not link:
             if return_vec: return np.zeros(3), np.zeros(3), None
             return np.zeros(3), np.zeros(3), 0.0
@@ -682,9 +768,8 @@ class NavigationMixin:
             depth_samples = []
             for f in fingers:
                 if f.mesh:
-                    v_w = (f.t_world[:3, :3] @ f.mesh.vertices.T).T + f.t_world[:3, 3]
-                    p_depth = v_w @ approach_axis
-                    depth_samples.append(np.ptp(p_depth))
+                    d_min, d_max = self._link_extent_along(f, approach_axis)
+                    depth_samples.append(d_max - d_min)
             if depth_samples:
                 finger_depth = np.max(depth_samples)
 
@@ -787,10 +872,9 @@ class NavigationMixin:
                 depth_samples = []
                 for f in fingers:
                     if f.mesh:
-                        # Project finger mesh vertices onto the approach axis
-                        v_w = (f.t_world[:3, :3] @ f.mesh.vertices.T).T + f.t_world[:3, 3]
-                        p_depth = v_w @ approach_axis
-                        depth_samples.append(np.ptp(p_depth))
+                        # Extent of the finger mesh along the approach axis
+                        d_min, d_max = self._link_extent_along(f, approach_axis)
+                        depth_samples.append(d_max - d_min)
                 
                 if depth_samples:
                     finger_depth = np.max(depth_samples)
@@ -804,18 +888,14 @@ class NavigationMixin:
                     
                     # Project meshes onto best_vec
                     if f1.mesh and f2.mesh:
-                        # f1 vertices in world
-                        v1_w = (f1.t_world[:3, :3] @ f1.mesh.vertices.T).T + f1.t_world[:3, 3]
-                        v2_w = (f2.t_world[:3, :3] @ f2.mesh.vertices.T).T + f2.t_world[:3, 3]
-                        
-                        p1 = v1_w @ best_vec
-                        p2 = v2_w @ best_vec
+                        p1_min, _ = self._link_extent_along(f1, best_vec)
+                        _, p2_max = self._link_extent_along(f2, best_vec)
                         
                         # The gap is the distance between the closest points of the two ranges
-                        # range1: [min(p1), max(p1)], range2: [min(p2), max(p2)]
+                        # range1: [p1_min, p1_max], range2: [p2_min, p2_max]
                         # Since best_vec points from f2 to f1 (v = pts[i]-pts[j]),
-                        # range1 is further along best_vec. So gap = min(p1) - max(p2)
-                        real_gap = max(0.0, np.min(p1) - np.max(p2))
+                        # range1 is further along best_vec. So gap = p1_min - p2_max
+                        real_gap = max(0.0, p1_min - p2_max)
 
                 if return_vec:
                     # Provide all finger positions relative to hand for complex width calculation
@@ -1006,129 +1086,180 @@ class NavigationMixin:
         if not control_joints:
             return {} if not apply else None
 
-        saved_all = {name: joint.current_value for name, joint in self.robot.joints.items()}
+        calibration = self._gripper_calibration(control_joints)
+        open_angles = calibration["open"]
+        close_angles = calibration["close"]
+        gap_limits = dict(calibration["limits"])
         targets = {}
-        gap_limits = {}
-        open_angles = {}
-        close_angles = {}
-
-        def _restore_all():
-            for name, value in saved_all.items():
-                if name in self.robot.joints:
-                    self.robot.joints[name].current_value = value
-            self.robot.update_kinematics()
 
-        def _apply_joint_and_slaves(master_joint, value):
-            master_joint.current_value = value
-            for slave_id, ratio in self.robot.joint_relations.get(master_joint.name, []):
-                if slave_id in self.robot.joints:
-                    self.robot.joints[slave_id].current_value = value * ratio
+        # If we need a specific jaw gap, look up one shared alpha for the whole pair.
+        if target_gap_world is not None and calibration["gaps"] is not None:
+            gaps = calibration["gaps"]
+            gap_open, gap_close = float(gaps[0]), float(gaps[-1])
+            global_min = min(gap_open, gap_close)
+            global_max = max(gap_open, gap_close)
+            gap_limits["_global"] = (global_min, global_max)
 
-        def _apply_joint_targets(targets_map):
-            _restore_all()
-            for joint_name, value in targets_map.items():
-                joint = self.robot.joints.get(joint_name)
-                if joint is None:
-                    continue
-                _apply_joint_and_slaves(joint, value)
-            self.robot.update_kinematics()
-
-        def _measure_joint_limit_gap(master_joint, joint_value):
-            _restore_all()
-            _apply_joint_and_slaves(master_joint, joint_value)
-            self.robot.update_kinematics()
-            return self._compute_finger_gap()
-
-        def _measure_gap_for_alpha(alpha):
-            alpha = float(np.clip(alpha, 0.0, 1.0))
-            targets_map = {}
+            target_gap = float(np.clip(target_gap_world, global_min, global_max))
+            alpha = self._gripper_alpha_for_gap(calibration, target_gap)
             for joint in control_joints:
-                open_val = open_angles.get(joint.name, saved_all.get(joint.name, joint.current_value))
-                close_val = close_angles.get(joint.name, open_val)
-                targets_map[joint.name] = open_val + alpha * (close_val - open_val)
-            _apply_joint_targets(targets_map)
-            return self._compute_finger_gap(), targets_map
-
-        # Determine each control joint's open and close angle from measured min/max face distance.
-        for joint in control_joints:
-            lo = joint.min_limit
-            hi = joint.max_limit
-            gap_lo = _measure_joint_limit_gap(joint, lo)
-            gap_hi = _measure_joint_limit_gap(joint, hi)
-
-            if gap_lo is not None and gap_hi is not None:
-                gap_limits[joint.name] = (float(min(gap_lo, gap_hi)), float(max(gap_lo, gap_hi)))
-                if gap_hi >= gap_lo:
-                    open_angles[joint.name] = hi
-                    close_angles[joint.name] = lo
-                else:
-                    open_angles[joint.name] = lo
-                    close_angles[joint.name] = hi
-            else:
-                # Fallback: keep previous behavior if gap measurement is unavailable.
-                open_angles[joint.name] = joint.min_limit
-                close_angles[joint.name] = joint.max_limit
-
-        # If we need a specific jaw gap, solve one shared alpha for the whole pair.
-        if target_gap_world is not None:
-            gap_open, targets_open = _measure_gap_for_alpha(0.0)
-            gap_close, targets_close = _measure_gap_for_alpha(1.0)
-
-            if gap_open is not None and gap_close is not None:
-                global_min = float(min(gap_open, gap_close))
-                global_max = float(max(gap_open, gap_close))
-                gap_limits["_global"] = (global_min, global_max)
-
-                target_gap = float(np.clip(target_gap_world, global_min, global_max))
-                decreasing_with_alpha = (gap_open >= gap_close)
-                left = 0.0
-                right = 1.0
-                best_targets = targets_open if abs(gap_open - target_gap) <= abs(gap_close - target_gap) else targets_close
-                best_err = min(abs(float(gap_open) - target_gap), abs(float(gap_close) - target_gap))
-
-                for _ in range(24):
-                    mid = (left + right) / 2.0
-                    gap_mid, targets_mid = _measure_gap_for_alpha(mid)
-                    if gap_mid is None:
-                        break
-
-                    err = abs(float(gap_mid) - target_gap)
-                    if err < best_err:
-                        best_err = err
-                        best_targets = targets_mid
-                    if err <= 1e-4:
-                        break
-
-                    if decreasing_with_alpha:
-                        if gap_mid > target_gap:
-                            left = mid
-                        else:
-                            right = mid
-                    else:
-                        if gap_mid < target_gap:
-                            left = mid
-                        else:
-                            right = mid
-
-                targets = best_targets
-            else:
-                # Fallback: use geometric close/open side when shared gap is unavailable.
-                for joint in control_joints:
-                    targets[joint.name] = close_angles[joint.name] if close else open_angles[joint.name]
+                open_val = open_angles[joint.name]
+                targets[joint.name] = open_val + alpha * (close_angles[joint.name] - open_val)
         else:
-            # Pure full open/full close.
+            # Pure full open/full close (or no measurable gap to aim for).
             for joint in control_joints:
                 targets[joint.name] = close_angles[joint.name] if close else open_angles[joint.name]
 
-        _restore_all()
         self._last_gripper_gap_limits = gap_limits
 
         if apply:
-            _apply_joint_targets(targets)
+            for joint_name, value in targets.items():
+                self._set_joint_and_slaves(self.robot.joints[joint_name], value)
+            self.robot.update_kinematics()
             self.canvas.update_transforms(self.robot)
             return None
         return targets
 
+    def _set_joint_and_slaves(self, master_joint, value):
+        master_joint.current_value = value
+        for slave_id, ratio in self.robot.joint_relations.get(master_joint.name, []):
+            if slave_id in self.robot.joints:
+                self.robot.joints[slave_id].current_value = value * ratio
+
+    def _gripper_calibration_signature(self, control_joints):
+        """Hashable snapshot of everything a gripper's gap curve depends on."""
+        def _plain(value):
+            if isinstance(value, (np.ndarray, list, tuple)):
+                return tuple(np.asarray(value, dtype=float).ravel().tolist())
+            return value
+
+        tcp_link = self.simulation_tab._get_tcp_link() if hasattr(self, 'simulation_tab') else None
+        control_names = {joint.name for joint in control_joints}
+        driven_names = set(control_names)
+        for name in control_names:
+            driven_names.update(slave_id for slave_id, _ in self.robot.joint_relations.get(name, []))
+
+        joint_items = []
+        for joint_name in sorted(self.robot.joints):
+            joint = self.robot.joints[joint_name]
+            if joint_name not in driven_names and not getattr(joint, 'is_gripper', False):
+                continue
+            child = joint.child_link
+            joint_items.append((
+                joint_name,
+                float(joint.min_limit), float(joint.max_limit),
+                _plain(joint.axis), _plain(joint.origin),
+                _plain(child.t_offset) if child is not None else None,
+                hash(child.mesh) if child is not None else None,
+                tuple(self.robot.joint_relations.get(joint_name, [])),
+                tuple(_plain(getattr(joint, attr, None)) for attr in _TCP_JOINT_ATTRS),
+                # Jaws outside the driven set stay where they are, so they are part of the key
+                None if joint_name in driven_names else float(joint.current_value),
+            ))
+
+        return (
+            tcp_link.name if tcp_link is not None else None,
+            _plain(getattr(tcp_link, 'custom_tcp_offset', None)) if tcp_link is not None else None,
+            tuple(sorted(control_names)),
+            tuple(joint_items),
+        )
+
+    def _gripper_calibration(self, control_joints):
+        """
+        Open/close angles and the gap-versus-alpha table of a set of control
+        joints, where alpha in [0, 1] blends every control joint from its
+        open to its close angle. Measured with forward kinematics once and
+        reused until the joints, jaw meshes, surfaces or TCP change.
+        """
+        signature = self._gripper_calibration_signature(control_joints)
+        cache_key = signature[2]
+        cached = self._gripper_calibrations.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        saved_all = {name: joint.current_value for name, joint in self.robot.joints.items()}
+        control_names = {joint.name for joint in control_joints}
+
+        def _neutral(joint):
+            return float(np.clip(0.0, joint.min_limit, joint.max_limit))
+
+        def _measure(targets_map):
+            for name, value in saved_all.items():
+                self.robot.joints[name].current_value = value
+            for joint_name, value in targets_map.items():
+                self._set_joint_and_slaves(self.robot.joints[joint_name], value)
+            self.robot.update_kinematics()
+            return self._compute_finger_gap()
+
+        limits = {}
+        open_angles = {}
+        close_angles = {}
+        try:
+            # Each control joint's open and close angle from the gap at its two limits,
+            # with the other control joints held at their neutral angle.
+            for joint in control_joints:
+                reference = {
+                    other.name: _neutral(other) for other in control_joints if other.name != joint.name
+                }
+                gap_lo = _measure({**reference, joint.name: joint.min_limit})
+                gap_hi = _measure({**reference, joint.name: joint.max_limit})
+
+                if gap_lo is not None and gap_hi is not None:
+                    limits[joint.name] = (float(min(gap_lo, gap_hi)), float(max(gap_lo, gap_hi)))
+                    if gap_hi >= gap_lo:
+                        open_angles[joint.name] = joint.max_limit
+                        close_angles[joint.name] = joint.min_limit
+                    else:
+                        open_angles[joint.name] = joint.min_limit
+                        close_angles[joint.name] = joint.max_limit
+                else:
+                    # Fallback: keep previous behavior if gap measurement is unavailable.
+                    open_angles[joint.name] = joint.min_limit
+                    close_angles[joint.name] = joint.max_limit
+
+            alphas = np.linspace(0.0, 1.0, GRIPPER_GAP_SAMPLES)
+            gaps = []
+            for alpha in alphas:
+                gap = _measure({
+                    name: open_angles[name] + alpha * (close_angles[name] - open_angles[name])
+                    for name in control_names
+                })
+                if gap is None:
+                    gaps = None
+                    break
+                gaps.append(float(gap))
+        finally:
+            for name, value in saved_all.items():
+                if name in self.robot.joints:
+                    self.robot.joints[name].current_value = value
+            self.robot.update_kinematics()
+
+        calibration = {
+            "open": open_angles,
+            "close": close_angles,
+            "limits": limits,
+            "alphas": alphas,
+            "gaps": np.array(gaps, dtype=float) if gaps is not None else None,
+        }
+        self._gripper_calibrations[cache_key] = (signature, calibration)
+        return calibration
+
+    def _gripper_alpha_for_gap(self, calibration, target_gap):
+        """Interpolates the calibrated table for the alpha that gives `target_gap`."""
+        alphas = calibration["alphas"]
+        gaps = calibration["gaps"]
+        # At or past either end (e.g. jaws already touching), use that end itself
+        narrow_alpha, wide_alpha = (1.0, 0.0) if gaps[0] >= gaps[-1] else (0.0, 1.0)
+        if target_gap <= min(gaps[0], gaps[-1]):
+            return narrow_alpha
+        if target_gap >= max(gaps[0], gaps[-1]):
+            return wide_alpha
+
+        # Monotone envelope of the sampled curve, oriented so gaps increase
+        if gaps[0] >= gaps[-1]:
+            return float(np.interp(target_gap, np.minimum.accumulate(gaps)[::-1], alphas[::-1]))
+        return float(np.interp(target_gap, np.maximum.accumulate(gaps), alphas))
+
     def show_speed_overlay(self):
         """Displays current speed percentage on the 3D canvas temporarily"""
         if not hasattr(self, 'canvas') or self.canvas is None:
@@ -1221,6 +1352,11 @@ class NavigationMixin:
             self.console.setVisible(False)
             self.right_splitter.setSizes([800, 0])
 
+    def toggle_static_batching(self, enabled):
+        """Turns merging of the links no joint can move into one actor on or off."""
+        self.canvas.set_static_batching(enabled, self.robot)
+        self.log(f"Static batching {'on' if enabled else 'off'}")
+
     def on_generate_code(self, motor_assignments=None):
         """Generates ESP32 code with per-joint motor types and populates the sidebar panel."""
         if not self.robot.joints:
@@ -1236,12 +1372,25 @@ class NavigationMixin:
         else:
             summary = f"{len(self.robot.joints)} Servo (default)"
 
-        code = generate_esp32_firmware(
-            self.robot,
-            default_speed=self.current_speed,
-            motor_assignments=motor_assignments,
-        )
-        self.code_drawer.set_code(code)
+        boards = board_ids(self.robot, motor_assignments)
+        if len(boards) > 1:
+            self.code_drawer.set_board_codes(generate_board_firmwares(
+                self.robot,
+                default_speed=self.current_speed,
+                motor_assignments=motor_assignments,
+            ))
+            summary += f" on {len(boards)} boards"
+            self.log(f"ℹ️ Choose the serial port of each of the {len(boards)} boards in the top bar before connecting.")
+        else:
+            code = generate_esp32_firmware(
+                self.robot,
+                default_speed=self.current_speed,
+                motor_assignments=motor_assignments,
+            )
+            self.code_drawer.set_code(code)
+        # One link per board, each speaking its sketch's joint numbering
+        self.serial_mgr.set_motor_assignments(motor_assignments)
+        self._sync_board_port_combos()
 
         # Expand the splitter to show the code panel
         self.code_drawer.show()
@@ -3,19 +3,175 @@ import os
 import numpy as np
 
 from core.robot import Robot
+from core.project_format import (
+    ProjectMeshLoader, project_format_version, read_project_json, write_project_archive,
+)
+from core.project_journal import ProjectJournal, untitled_project_path
 
 
 class ProjectMixin:
     """Methods for saving and loading robot project files (.trn)."""
 
+    def _collect_project_data(self):
+        """Project dict (robot.json contents) for the current session, without meshes."""
+        robot_data = {
+            "meta": {
+                # The project format stores meshes exported from the current session.
+                # Our internal world units are millimeters (canvas.grid_units_per_cm = 10.0).
+                # Mesh arrays are unitless, so we must persist the intended unit system explicitly.
+                "mesh_units": "mm",
+                "grid_units_per_cm": float(getattr(getattr(self, "canvas", None), "grid_units_per_cm", 10.0) or 10.0),
+            },
+            "links": [],
+            "joints": [],
+            "ui_state": {
+                "joint_panel_joints": {},
+                "program_code": "",
+                "live_sync": False,
+                "alignment_point": None,
+                "alignment_normal": None,
+                "alignment_cache": {},
+                "current_speed": 50,
+                "camera_position": None,
+                "home_point": None
+            },
+            "joint_relations": {}
+        }
+
+        # Derive a human-readable mesh unit label from grid scale (legacy-compatible).
+        try:
+            units_per_cm = float(robot_data["meta"]["grid_units_per_cm"])
+            if abs(units_per_cm - 10.0) < 1e-9:
+                robot_data["meta"]["mesh_units"] = "mm"
+            elif abs(units_per_cm - 1.0) < 1e-9:
+                robot_data["meta"]["mesh_units"] = "cm"
+            elif abs(units_per_cm - 0.01) < 1e-12:
+                robot_data["meta"]["mesh_units"] = "m"
+            else:
+                robot_data["meta"]["mesh_units"] = "custom"
+        except Exception:
+            robot_data["meta"]["mesh_units"] = "unknown"
+
+        # 1. Gather Links (meshes are written by the archive writer below)
+        for name, link in self.robot.links.items():
+            robot_data["links"].append({
+                "name": link.name,
+                "color": link.color,
+                "is_base": link.is_base,
+                "t_offset": link.t_offset.tolist(),
+                "is_sim_obj": getattr(link, "is_sim_obj", False),
+                "pick_pos": list(getattr(link, "pick_pos", [0.0, 0.0, 0.0])),
+                "place_pos": list(getattr(link, "place_pos", [0.0, 0.0, 0.0]))
+            })
+
+        # 2. Gather Joints (Robot Core)
+        for name, joint in self.robot.joints.items():
+            robot_data["joints"].append({
+                "name": joint.name,
+                "parent_link": joint.parent_link.name,
+                "child_link": joint.child_link.name,
+                "joint_type": joint.joint_type,
+                "origin": joint.origin.tolist(),
+                "axis": joint.axis.tolist(),
+                "min_limit": joint.min_limit,
+                "max_limit": joint.max_limit,
+                "current_value": joint.current_value,
+                "is_gripper": getattr(joint, "is_gripper", False),
+                "gripping_surface_touch_only": getattr(joint, "gripping_surface_touch_only", False),
+                "contact_surface_name": getattr(joint, "contact_surface_name", None),
+                "contact_surface_link_name": getattr(joint, "contact_surface_link_name", None),
+                "contact_surface_center_local": (
+                    joint.contact_surface_center_local.tolist()
+                    if getattr(joint, "contact_surface_center_local", None) is not None
+                    else None
+                ),
+                "contact_surface_normal_local": (
+                    joint.contact_surface_normal_local.tolist()
+                    if getattr(joint, "contact_surface_normal_local", None) is not None
+                    else None
+                ),
+                "gripping_surface_name": getattr(joint, "gripping_surface_name", None),
+                "gripping_surface_link_name": getattr(joint, "gripping_surface_link_name", None),
+                "gripping_surface_center_local": (
+                    joint.gripping_surface_center_local.tolist()
+                    if getattr(joint, "gripping_surface_center_local", None) is not None
+                    else None
+                ),
+                "gripping_surface_normal_local": (
+                    joint.gripping_surface_normal_local.tolist()
+                    if getattr(joint, "gripping_surface_normal_local", None) is not None
+                    else None
+                ),
+                "paired_gripping_enabled": getattr(joint, "paired_gripping_enabled", False),
+                "paired_gripping_surface_joint_name": getattr(joint, "paired_gripping_surface_joint_name", None),
+                "paired_gripping_surface_name": getattr(joint, "paired_gripping_surface_name", None),
+                "paired_gripping_surface_link_name": getattr(joint, "paired_gripping_surface_link_name", None),
+                "paired_gripping_surface_center_local": (
+                    joint.paired_gripping_surface_center_local.tolist()
+                    if getattr(joint, "paired_gripping_surface_center_local", None) is not None
+                    else None
+                ),
+                "paired_gripping_surface_normal_local": (
+                    joint.paired_gripping_surface_normal_local.tolist()
+                    if getattr(joint, "paired_gripping_surface_normal_local", None) is not None
+                    else None
+                )
+            })
+
+        # 2b. Joint Relations
+        for master_id, slaves in self.robot.joint_relations.items():
+            robot_data["joint_relations"][master_id] = slaves
+
+        # 3. Gather UI State
+        # Joint Panel UI Data
+        if hasattr(self, 'joint_tab'):
+            for child_name, data in self.joint_tab.joints.items():
+                clean_data = data.copy()
+                if 'alignment_point' in clean_data and isinstance(clean_data['alignment_point'], np.ndarray):
+                    clean_data['alignment_point'] = clean_data['alignment_point'].tolist()
+                robot_data["ui_state"]["joint_panel_joints"][child_name] = clean_data
+
+        # Program Tab Code
+        if hasattr(self, 'program_tab'):
+            robot_data["ui_state"]["program_code"] = self.program_tab.code_edit.toPlainText()
+            robot_data["ui_state"]["live_sync"] = self.program_tab.sync_hw_check.isChecked()
+
+        # Simulation home point
+        if hasattr(self, 'home_x') and hasattr(self, 'home_y') and hasattr(self, 'home_z'):
+            robot_data["ui_state"]["home_point"] = [
+                self.home_x.value(),
+                self.home_y.value(),
+                self.home_z.value()
+            ]
+
+        # Align Panel Stored Point (for continuing joint creation)
+        if hasattr(self, 'align_tab'):
+            if hasattr(self.align_tab, 'alignment_point') and self.align_tab.alignment_point is not None:
+                robot_data["ui_state"]["alignment_point"] = self.align_tab.alignment_point.tolist()
+            if hasattr(self.align_tab, 'alignment_normal') and self.align_tab.alignment_normal is not None:
+                robot_data["ui_state"]["alignment_normal"] = self.align_tab.alignment_normal.tolist()
+
+        # Alignment Cache (from MainWindow)
+        if hasattr(self, 'alignment_cache'):
+            # Convert {(p, c): point} to {"p,c": point} for JSON
+            serializable_cache = {}
+            for (p, c), pt in self.alignment_cache.items():
+                serializable_cache[f"{p}|||{c}"] = pt.tolist()
+            robot_data["ui_state"]["alignment_cache"] = serializable_cache
+
+        # Speed
+        if hasattr(self, 'current_speed'):
+            robot_data["ui_state"]["current_speed"] = self.current_speed
+
+        # Camera Position
+        if hasattr(self, 'canvas'):
+            robot_data["ui_state"]["camera_position"] = [list(p) for p in self.canvas.plotter.camera_position]
+            robot_data["ui_state"]["static_batching"] = bool(getattr(self.canvas, "static_batching", True))
+
+        return robot_data
+
     def save_project(self):
         """Saves current robot configuration into a .trn zip file."""
-        import json
-        import zipfile
-        import io
-        import tempfile
-        import shutil
-
         file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
             self, "Save Project", "", "ToRoTRoN Project (*.trn)"
         )
@@ -26,183 +182,15 @@ class ProjectMixin:
             file_path += '.trn'
 
         try:
-            # Create a temporary directory to gather files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                mesh_dir = os.path.join(temp_dir, "meshes")
-                os.makedirs(mesh_dir)
-
-                robot_data = {
-                    "meta": {
-                        # The project format stores meshes exported from the current session.
-                        # Our internal world units are millimeters (canvas.grid_units_per_cm = 10.0).
-                        # STL is unitless, so we must persist the intended unit system explicitly.
-                        "mesh_units": "mm",
-                        "grid_units_per_cm": float(getattr(getattr(self, "canvas", None), "grid_units_per_cm", 10.0) or 10.0),
-                    },
-                    "links": [],
-                    "joints": [],
-                    "ui_state": {
-                        "joint_panel_joints": {},
-                        "program_code": "",
-                        "live_sync": False,
-                        "alignment_point": None,
-                        "alignment_normal": None,
-                        "alignment_cache": {},
-                        "current_speed": 50,
-                        "camera_position": None,
-                        "home_point": None
-                    },
-                    "joint_relations": {}
-                }
-
-                # Derive a human-readable mesh unit label from grid scale (legacy-compatible).
-                try:
-                    units_per_cm = float(robot_data["meta"]["grid_units_per_cm"])
-                    if abs(units_per_cm - 10.0) < 1e-9:
-                        robot_data["meta"]["mesh_units"] = "mm"
-                    elif abs(units_per_cm - 1.0) < 1e-9:
-                        robot_data["meta"]["mesh_units"] = "cm"
-                    elif abs(units_per_cm - 0.01) < 1e-12:
-                        robot_data["meta"]["mesh_units"] = "m"
-                    else:
-                        robot_data["meta"]["mesh_units"] = "custom"
-                except Exception:
-                    robot_data["meta"]["mesh_units"] = "unknown"
+            robot_data = self._collect_project_data()
 
-                # 1. Gather Links
-                for name, link in self.robot.links.items():
-                    mesh_filename = f"{name}.stl"
-                    mesh_path = os.path.join(mesh_dir, mesh_filename)
-                    
-                    # Export mesh
-                    link.mesh.export(mesh_path, file_type='stl')
-                    
-                    robot_data["links"].append({
-                        "name": link.name,
-                        "mesh_file": f"meshes/{mesh_filename}",
-                        "color": link.color,
-                        "is_base": link.is_base,
-                        "t_offset": link.t_offset.tolist(),
-                        "is_sim_obj": getattr(link, "is_sim_obj", False),
-                        "pick_pos": list(getattr(link, "pick_pos", [0.0, 0.0, 0.0])),
-                        "place_pos": list(getattr(link, "place_pos", [0.0, 0.0, 0.0]))
-                    })
-
-                # 2. Gather Joints (Robot Core)
-                for name, joint in self.robot.joints.items():
-                    robot_data["joints"].append({
-                        "name": joint.name,
-                        "parent_link": joint.parent_link.name,
-                        "child_link": joint.child_link.name,
-                        "joint_type": joint.joint_type,
-                        "origin": joint.origin.tolist(),
-                        "axis": joint.axis.tolist(),
-                        "min_limit": joint.min_limit,
-                        "max_limit": joint.max_limit,
-                        "current_value": joint.current_value,
-                        "is_gripper": getattr(joint, "is_gripper", False),
-                        "gripping_surface_touch_only": getattr(joint, "gripping_surface_touch_only", False),
-                        "contact_surface_name": getattr(joint, "contact_surface_name", None),
-                        "contact_surface_link_name": getattr(joint, "contact_surface_link_name", None),
-                        "contact_surface_center_local": (
-                            joint.contact_surface_center_local.tolist()
-                            if getattr(joint, "contact_surface_center_local", None) is not None
-                            else None
-                        ),
-                        "contact_surface_normal_local": (
-                            joint.contact_surface_normal_local.tolist()
-                            if getattr(joint, "contact_surface_normal_local", None) is not None
-                            else None
-                        ),
-                        "gripping_surface_name": getattr(joint, "gripping_surface_name", None),
-                        "gripping_surface_link_name": getattr(joint, "gripping_surface_link_name", None),
-                        "gripping_surface_center_local": (
-                            joint.gripping_surface_center_local.tolist()
-                            if getattr(joint, "gripping_surface_center_local", None) is not None
-                            else None
-                        ),
-                        "gripping_surface_normal_local": (
-                            joint.gripping_surface_normal_local.tolist()
-                            if getattr(joint, "gripping_surface_normal_local", None) is not None
-                            else None
-                        ),
-                        "paired_gripping_enabled": getattr(joint, "paired_gripping_enabled", False),
-                        "paired_gripping_surface_joint_name": getattr(joint, "paired_gripping_surface_joint_name", None),
-                        "paired_gripping_surface_name": getattr(joint, "paired_gripping_surface_name", None),
-                        "paired_gripping_surface_link_name": getattr(joint, "paired_gripping_surface_link_name", None),
-                        "paired_gripping_surface_center_local": (
-                            joint.paired_gripping_surface_center_local.tolist()
-                            if getattr(joint, "paired_gripping_surface_center_local", None) is not None
-                            else None
-                        ),
-                        "paired_gripping_surface_normal_local": (
-                            joint.paired_gripping_surface_normal_local.tolist()
-                            if getattr(joint, "paired_gripping_surface_normal_local", None) is not None
-                            else None
-                        )
-                    })
-
-                # 2b. Joint Relations
-                for master_id, slaves in self.robot.joint_relations.items():
-                    robot_data["joint_relations"][master_id] = slaves
-
-                # 3. Gather UI State
-                # Joint Panel UI Data
-                if hasattr(self, 'joint_tab'):
-                    for child_name, data in self.joint_tab.joints.items():
-                        clean_data = data.copy()
-                        if 'alignment_point' in clean_data and isinstance(clean_data['alignment_point'], np.ndarray):
-                            clean_data['alignment_point'] = clean_data['alignment_point'].tolist()
-                        robot_data["ui_state"]["joint_panel_joints"][child_name] = clean_data
-
-                # Program Tab Code
-                if hasattr(self, 'program_tab'):
-                    robot_data["ui_state"]["program_code"] = self.program_tab.code_edit.toPlainText()
-                    robot_data["ui_state"]["live_sync"] = self.program_tab.sync_hw_check.isChecked()
-
-                # Simulation home point
-                if hasattr(self, 'home_x') and hasattr(self, 'home_y') and hasattr(self, 'home_z'):
-                    robot_data["ui_state"]["home_point"] = [
-                        self.home_x.value(),
-                        self.home_y.value(),
-                        self.home_z.value()
-                    ]
-
-                # Align Panel Stored Point (for continuing joint creation)
-                if hasattr(self, 'align_tab'):
-                    if hasattr(self.align_tab, 'alignment_point') and self.align_tab.alignment_point is not None:
-                        robot_data["ui_state"]["alignment_point"] = self.align_tab.alignment_point.tolist()
-                    if hasattr(self.align_tab, 'alignment_normal') and self.align_tab.alignment_normal is not None:
-                        robot_data["ui_state"]["alignment_normal"] = self.align_tab.alignment_normal.tolist()
-
-                # Alignment Cache (from MainWindow)
-                if hasattr(self, 'alignment_cache'):
-                    # Convert {(p, c): point} to {"p,c": point} for JSON
-                    serializable_cache = {}
-                    for (p, c), pt in self.alignment_cache.items():
-                        serializable_cache[f"{p}|||{c}"] = pt.tolist()
-                    robot_data["ui_state"]["alignment_cache"] = serializable_cache
-
-                # Speed
-                if hasattr(self, 'current_speed'):
-                    robot_data["ui_state"]["current_speed"] = self.current_speed
-
-                # Camera Position
-                if hasattr(self, 'canvas'):
-                    robot_data["ui_state"]["camera_position"] = [list(p) for p in self.canvas.plotter.camera_position]
-
-                # 4. Write JSON
-                json_path = os.path.join(temp_dir, "robot.json")
-                with open(json_path, 'w') as f:
-                    json.dump(robot_data, f, indent=4)
-
-                # 4. ZIP everything up
-                with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for root, dirs, files in os.walk(temp_dir):
-                        for file in files:
-                            abs_file = os.path.join(root, file)
-                            rel_file = os.path.relpath(abs_file, temp_dir)
-                            zipf.write(abs_file, rel_file)
+            # 4. Write the archive directly: JSON + deduplicated binary meshes
+            n_meshes = write_project_archive(
+                file_path, robot_data, {name: link.mesh for name, link in self.robot.links.items()}
+            )
+            self.log(f"[Project] Wrote {len(robot_data['links'])} link(s), {n_meshes} unique mesh(es)")
+            self.current_project_path = file_path
+            self._restart_journal(file_path, robot_data, base_trn=file_path)
 
             self.log(f"Project saved to: {file_path}")
             QtWidgets.QMessageBox.information(self, "Success", "Project saved successfully.")
@@ -211,22 +199,52 @@ class ProjectMixin:
             self.log(f"SAVE ERROR: {str(e)}")
             QtWidgets.QMessageBox.critical(self, "Save Error", f"Could not save project: {str(e)}")
 
-    def load_project(self):
-        """Loads a robot configuration from a .trn zip file."""
-        import json
-        import zipfile
-        import tempfile
-        import shutil
-        import trimesh
-
-        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Open Project", "", "ToRoTRoN Project (*.trn)"
-        )
+    def load_project(self, file_path=None):
+        """
+        Loads a robot configuration from a .trn zip file (format v1 or v2),
+        offering to recover unsaved changes from its autosave journal.
+        """
+        if not isinstance(file_path, str) or not file_path:
+            file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Open Project", "", "ToRoTRoN Project (*.trn)"
+            )
         if not file_path:
             return
 
+        source_path = file_path
+        journal = ProjectJournal(file_path)
+        if journal.has_recoverable_changes():
+            reply = QtWidgets.QMessageBox.question(
+                self, "Recover Autosave",
+                "This project has unsaved changes from a previous session in its autosave journal.\n\n"
+                "Recover them?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, QtWidgets.QMessageBox.Yes
+            )
+            if reply == QtWidgets.QMessageBox.Yes:
+                try:
+                    source_path = journal.compact()
+                    self.log(f"[Autosave] Recovered journal into {os.path.basename(source_path)}")
+                except Exception as e:
+                    self.log(f"[Autosave] Recovery failed, loading the saved project: {e}")
+            else:
+                journal.discard()
+
+        self._load_project_file(source_path, project_path=file_path)
+
+    def _load_project_file(self, file_path, project_path=None):
+        """
+        Loads `file_path`; the session then belongs to `project_path`
+        (defaults to file_path; differs when loading a recovered autosave).
+
+        Phase 1 restores the model (links, joints, relations, UI state) right
+        away; link meshes decode on a thread pool and their actors stream into
+        the canvas as they finish (see _stream_project_meshes).
+        """
+        import zipfile
+
         try:
             # 1. Clear Current Robot
+            self._cancel_project_mesh_stream()
             self.robot = Robot()
             self.canvas.clear_highlights()
             # Remove all actors from canvas
@@ -241,18 +259,14 @@ class ProjectMixin:
             if hasattr(self, 'joint_tab'): self.joint_tab.reset_joint_ui()
             if hasattr(self, 'align_tab'): self.align_tab.reset_panel()
 
-            # 2. Extract ZIP to temp folder
-            with tempfile.TemporaryDirectory() as temp_dir:
-                with zipfile.ZipFile(file_path, 'r') as zipf:
-                    zipf.extractall(temp_dir)
-
+            # 2. Open the archive; meshes (v2 arrays or v1 STLs) are decoded
+            #    from it in the background, nothing is extracted to disk
+            with zipfile.ZipFile(file_path, 'r') as zipf:
                 # 3. Read JSON
-                json_path = os.path.join(temp_dir, "robot.json")
-                if not os.path.exists(json_path):
-                    raise Exception("Invalid project file: robot.json missing")
-
-                with open(json_path, 'r') as f:
-                    robot_data = json.load(f)
+                robot_data = read_project_json(zipf)
+                format_version = project_format_version(robot_data)
+                mesh_loader = ProjectMeshLoader(file_path, robot_data, mesh_store=getattr(self, "mesh_store", None))
+                self.log(f"[Project] Format v{format_version}")
 
                 # Restore the unit scale used when the project was saved (legacy projects
                 # may have used a non-default grid_units_per_cm to match CAD units).
@@ -265,26 +279,16 @@ class ProjectMixin:
                     except Exception:
                         pass
 
-                # 4. Load Links
+                # 4. Load Links (meshes are queued; each link waits only for its own)
                 first_actor_name = None
                 inferred_units_per_cm = None
+                pending_meshes = []
                 for l_data in robot_data["links"]:
                     name = l_data["name"]
-                    mesh_rel_path = l_data["mesh_file"]
-                    mesh_path = os.path.join(temp_dir, mesh_rel_path)
-                    
-                    if not os.path.exists(mesh_path):
+                    if not mesh_loader.has_mesh(l_data):
                         self.log(f"WARNING: Mesh file missing for {name}")
                         continue
-
-                    mesh = trimesh.load(mesh_path)
-                    if isinstance(mesh, trimesh.Scene):
-                        self.log(f"Detected assembly/scene for '{name}'. Merging meshes...")
-                        mesh = mesh.to_mesh()
-
-                    if not hasattr(mesh, "vertices") or len(mesh.vertices) == 0:
-                        self.log(f"WARNING: Mesh for {name} has 0 vertices.")
-                        continue
+                    mesh_future = mesh_loader.submit(l_data)
 
                     # IMPORTANT:
                     # Do NOT attempt unit auto-detection here. The project (.trn) stores meshes
@@ -302,7 +306,7 @@ class ProjectMixin:
                         and self.canvas is not None
                     ):
                         try:
-                            bounds = mesh.bounds
+                            bounds = mesh_future.result().bounds
                             raw_size = bounds[1] - bounds[0]
                             max_dim = float(max(raw_size))
                             if max_dim < 1.0:
@@ -316,7 +320,8 @@ class ProjectMixin:
                         except Exception:
                             pass
 
-                    link = self.robot.add_link(name, mesh)
+                    link = self.robot.add_link(name)
+                    link.set_pending_mesh(mesh_future)
                     link.color = l_data.get("color", "lightgray")
                     link.is_base = l_data.get("is_base", False)
                     link.t_offset = np.array(l_data["t_offset"])
@@ -328,9 +333,9 @@ class ProjectMixin:
                         self.robot.base_link = link
                         self.canvas.fixed_actors.add(name)
 
-                    # Add to UI and Canvas
+                    # Add to UI now; the canvas actor follows when the mesh is decoded
                     self.add_link_item(name)
-                    self.canvas.update_link_mesh(name, mesh, link.t_offset, color=link.color)
+                    pending_meshes.append((name, mesh_future))
                     if first_actor_name is None:
                         first_actor_name = name
 
@@ -548,6 +553,15 @@ class ProjectMixin:
                 else:
                     self.canvas.plotter.reset_camera()
 
+                # Restore static-geometry batching (applied by the final update below)
+                self.canvas.static_batching = bool(ui_state.get("static_batching", True))
+                if not self.canvas.static_batching:
+                    self.canvas.set_static_batching(False)
+                if hasattr(self, 'batch_static_btn'):
+                    self.batch_static_btn.blockSignals(True)
+                    self.batch_static_btn.setChecked(self.canvas.static_batching)
+                    self.batch_static_btn.blockSignals(False)
+
             # 7. Final Update
             self.robot.update_kinematics()
             self.canvas.update_transforms(self.robot)
@@ -558,20 +572,208 @@ class ProjectMixin:
                 self.matrices_tab.refresh_sliders()
                 self.matrices_tab.update_display()
 
-            # Ensure something is visible immediately after load.
-            try:
-                base_name = self.robot.base_link.name if getattr(self.robot, "base_link", None) is not None else None
-                focus_name = base_name or first_actor_name
-                if focus_name and hasattr(self.canvas, "focus_on_actor"):
-                    self.canvas.focus_on_actor(focus_name)
-                else:
-                    self.canvas.plotter.reset_camera()
-            except Exception:
-                self.canvas.plotter.reset_camera()
+            # Phase 2: stream actors in; the base (or first) link gets the
+            # camera focus as soon as it is on screen.
+            base_name = self.robot.base_link.name if getattr(self.robot, "base_link", None) is not None else None
+            self._stream_project_meshes(mesh_loader, pending_meshes, base_name or first_actor_name)
             
+            # Journal further edits on top of the file just loaded
+            self.current_project_path = project_path or file_path
+            self._restart_journal(self.current_project_path, robot_data, base_trn=file_path)
+
             self.log(f"Project loaded from: {file_path}")
             QtWidgets.QMessageBox.information(self, "Success", "Project loaded successfully.")
 
         except Exception as e:
             self.log(f"LOAD ERROR: {str(e)}")
             QtWidgets.QMessageBox.critical(self, "Load Error", f"Could not load project: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Progressive mesh streaming (phase 2 of load_project)
+    # ------------------------------------------------------------------
+    def _stream_project_meshes(self, mesh_loader, pending, focus_name=None):
+        """Adds link actors as their background decodes complete, with a progress bar."""
+        import time
+        from PyQt5 import QtCore
+
+        self._mesh_stream = {
+            "loader": mesh_loader,
+            "robot": self.robot,
+            "pending": list(pending),
+            "total": len(pending),
+            "focus": focus_name,
+            "started": time.perf_counter(),
+        }
+
+        if not hasattr(self, "_mesh_stream_progress"):
+            self._mesh_stream_progress = QtWidgets.QProgressBar()
+            self._mesh_stream_progress.setMaximumWidth(220)
+            self._mesh_stream_progress.setFormat("Loading meshes %v/%m")
+            self.statusBar().addPermanentWidget(self._mesh_stream_progress)
+        self._mesh_stream_progress.setRange(0, max(len(pending), 1))
+        self._mesh_stream_progress.setValue(0)
+        self._mesh_stream_progress.setVisible(bool(pending))
+
+        if not hasattr(self, "_mesh_stream_timer"):
+            self._mesh_stream_timer = QtCore.QTimer(self)
+            self._mesh_stream_timer.setInterval(30)
+            self._mesh_stream_timer.timeout.connect(self._poll_project_meshes)
+        self._mesh_stream_timer.start()
+        self._poll_project_meshes()
+
+    def _poll_project_meshes(self):
+        """GUI-thread tick: turns finished mesh futures into canvas actors."""
+        import time
+
+        stream = getattr(self, "_mesh_stream", None)
+        if stream is None or stream["robot"] is not self.robot:
+            self._cancel_project_mesh_stream()
+            return
+
+        still_pending = []
+        for name, future in stream["pending"]:
+            if not future.done():
+                still_pending.append((name, future))
+                continue
+            link = self.robot.links.get(name)
+            if link is None:
+                continue  # Removed while loading
+            mesh = link.mesh
+            if mesh is None or not hasattr(mesh, "vertices") or len(mesh.vertices) == 0:
+                self.log(f"WARNING: Mesh for {name} has 0 vertices or could not be decoded.")
+                continue
+            self.canvas.update_link_mesh(name, mesh, link.t_world, color=link.color)
+            if name == stream["focus"]:
+                try:
+                    if hasattr(self.canvas, "focus_on_actor"):
+                        self.canvas.focus_on_actor(name)
+                    else:
+                        self.canvas.plotter.reset_camera()
+                except Exception:
+                    self.canvas.plotter.reset_camera()
+        stream["pending"] = still_pending
+
+        done = stream["total"] - len(still_pending)
+        self._mesh_stream_progress.setValue(done)
+        if still_pending:
+            return
+
+        self._mesh_stream_timer.stop()
+        self._mesh_stream_progress.setVisible(False)
+        stream["loader"].shutdown()
+        self._mesh_stream = None
+        # Re-apply poses/batching now that every actor exists
+        self.canvas.update_transforms(self.robot)
+        if stream["total"]:
+            self.log(f"[Project] {stream['total']} mesh(es) loaded in {time.perf_counter() - stream['started']:.2f}s")
+
+    def _cancel_project_mesh_stream(self):
+        """Stops streaming a previous project's meshes (e.g. when another load starts)."""
+        stream = getattr(self, "_mesh_stream", None)
+        if hasattr(self, "_mesh_stream_timer"):
+            self._mesh_stream_timer.stop()
+        if hasattr(self, "_mesh_stream_progress"):
+            self._mesh_stream_progress.setVisible(False)
+        if stream is not None:
+            stream["loader"].shutdown(cancel=True)
+        self._mesh_stream = None
+
+    # ------------------------------------------------------------------
+    # Autosave journal
+    # ------------------------------------------------------------------
+    def _restart_journal(self, project_path, robot_data, base_trn=None):
+        """Points autosave at `project_path`, journaling on top of `base_trn`."""
+        old = getattr(self, "_journal", None)
+        if old is not None:
+            old.close()
+            # The unsaved session now lives in a real project file
+            if old.project_path == untitled_project_path() and project_path != old.project_path:
+                old.discard()
+        self._journal = ProjectJournal(project_path)
+        self._journal.start(base_trn, robot_data)
+
+    def autosave_tick(self):
+        """Appends whatever changed since the last tick to the autosave journal."""
+        try:
+            if getattr(self, "_journal", None) is None:
+                path = getattr(self, "current_project_path", None) or untitled_project_path()
+                self._restart_journal(path, {"links": []}, base_trn=path if os.path.exists(path) else None)
+            self._journal.record(self._collect_project_data(), self.robot.links)
+            if self._journal.records_since_base >= ProjectJournal.COMPACT_RECORDS:
+                self._journal.compact()
+                self.log("[Autosave] Journal compacted")
+        except Exception as e:
+            self.log(f"[Autosave] {e}")
+
+    def check_untitled_recovery(self):
+        """At startup, offers to restore an unsaved session that did not exit cleanly."""
+        journal = ProjectJournal(untitled_project_path())
+        if not journal.has_recoverable_changes():
+            self._start_untitled_journal()
+            return
+        # An autosave tick while the question is open would restart that very journal
+        self.autosave_timer.stop()
+        try:
+            reply = QtWidgets.QMessageBox.question(
+                self, "Recover Autosave",
+                "An unsaved session from last time was found in the autosave journal.\n\nRecover it?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, QtWidgets.QMessageBox.Yes
+            )
+        finally:
+            self.autosave_timer.start(30000)
+        if reply != QtWidgets.QMessageBox.Yes:
+            journal.discard()
+            self._start_untitled_journal()
+            return
+        try:
+            recovered = journal.compact()
+        except Exception as e:
+            self.log(f"[Autosave] Recovery failed: {e}")
+            self._start_untitled_journal()
+            return
+        self._load_project_file(recovered, project_path=untitled_project_path())
+        self.current_project_path = None
+
+    def _start_untitled_journal(self):
+        """Journals the fresh session against its pristine state, so only real edits count as unsaved."""
+        if getattr(self, "_journal", None) is None:
+            self._restart_journal(untitled_project_path(), self._collect_project_data())
+
+    def close_journal(self):
+        """
+        Clean-exit counterpart of the startup recovery: journals the last
+        edits, then asks whether to save, discard or keep working. A clean
+        exit never leaves unsaved edits behind in the journal (that recovery
+        prompt is for crashes only). Returns False to keep the window open.
+        """
+        self.autosave_tick()
+        journal = getattr(self, "_journal", None)
+        if journal is None:
+            return True
+        journal.flush()
+        untitled = journal.project_path == untitled_project_path()
+        if journal.has_recoverable_changes() and not (untitled and not self.robot.links):
+            reply = QtWidgets.QMessageBox.question(
+                self, "Unsaved Changes",
+                "The project has unsaved changes.\n\nSave them before closing?",
+                QtWidgets.QMessageBox.Save | QtWidgets.QMessageBox.Discard | QtWidgets.QMessageBox.Cancel,
+                QtWidgets.QMessageBox.Save
+            )
+            if reply == QtWidgets.QMessageBox.Cancel:
+                return False
+            if reply == QtWidgets.QMessageBox.Save:
+                self.save_project()
+                journal = self._journal  # Restarted on top of the saved file
+                journal.flush()
+                if journal.has_recoverable_changes():
+                    return False  # Save dialog cancelled or the save failed
+            else:
+                journal.close()
+                journal.discard()
+                self._journal = None
+                return True
+        journal.close()
+        if untitled:
+            journal.discard()
+        self._journal = None
+        return True
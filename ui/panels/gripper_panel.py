@@ -1,6 +1,8 @@
 from PyQt5 import QtWidgets, QtCore
 import numpy as np
 
+from core.local_geometry import LocalGeometryCache
+
 
 class TypeOnlyDoubleSpinBox(QtWidgets.QDoubleSpinBox):
     def __init__(self, *args, **kwargs):
@@ -17,6 +19,8 @@ class GripperPanel(QtWidgets.QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.mw = main_window
+        self._surface_local_cache = LocalGeometryCache(self._build_local_surfaces)
+        self._surface_label_cache = {}  # link name -> (templates, base names, label plan)
         self.init_ui()
 
     def _group_style(self):
@@ -1403,117 +1407,47 @@ class GripperPanel(QtWidgets.QWidget):
         positive_name, negative_name = axis_names.get(axis_index, ("Surface", "Surface"))
         return positive_name if axis_sign > 0 else negative_name
 
-    def _is_teethed_group(self, base_name, group, max_area):
-        """Best-effort detection for serrated/toothed gripping surfaces."""
-        if len(group) < 4 or max_area <= 1e-9:
+    def _is_teethed_group(self, base_name, local_centers, local_normals, areas, max_area):
+        """Best-effort detection for serrated/toothed gripping surfaces (one group's arrays)."""
+        if len(areas) < 4 or max_area <= 1e-9:
             return False
 
-        areas = [
-            float(candidate.get('area', 0.0))
-            for candidate in group
-            if float(candidate.get('area', 0.0)) > 0.0
-        ]
-        if not areas:
+        positive_areas = areas[areas > 0.0]
+        if len(positive_areas) == 0:
             return False
 
-        median_area = float(np.median(areas))
-        mean_area = float(np.mean(areas))
+        median_area = float(np.median(positive_areas))
+        mean_area = float(np.mean(positive_areas))
         small_relative = median_area <= max_area * 0.45 and mean_area <= max_area * 0.55
 
-        centers = np.array(
-            [np.array(candidate['local_center'], dtype=float) for candidate in group],
-            dtype=float
-        )
-        spreads = np.ptp(centers, axis=0) if len(centers) > 1 else np.zeros(3)
-
-        normal_axis = int(np.argmax(np.abs(np.array(group[0]['local_normal'], dtype=float))))
-        tangent_spreads = [spreads[idx] for idx in range(3) if idx != normal_axis]
-        longest_tangent = max(tangent_spreads) if tangent_spreads else 0.0
-        shortest_tangent = min(tangent_spreads) if tangent_spreads else 0.0
+        spreads = np.ptp(local_centers, axis=0)
+        normal_axis = int(np.argmax(np.abs(local_normals[0])))
+        tangent_spreads = np.delete(spreads, normal_axis)
+        longest_tangent = float(np.max(tangent_spreads))
+        shortest_tangent = float(np.min(tangent_spreads))
 
         repeated_strip = longest_tangent > 0.0 and (
-            shortest_tangent <= longest_tangent * 0.45 or len(group) >= 6
+            shortest_tangent <= longest_tangent * 0.45 or len(areas) >= 6
         )
 
         preferred_base = base_name in {"Inner Surface", "Top Surface", "Bottom Surface"}
         return small_relative and repeated_strip and preferred_base
 
-    def _build_composite_surface_candidate(self, link_name, link, group, surface_name):
-        """Create a synthetic candidate that covers a whole grouped surface."""
-        if not group:
-            return None
-
-        areas = np.array(
-            [max(float(candidate.get('area', 0.0)), 1e-6) for candidate in group],
-            dtype=float
-        )
-        weights = areas / max(float(np.sum(areas)), 1e-6)
-
-        local_centers = np.array(
-            [np.array(candidate['local_center'], dtype=float) for candidate in group],
-            dtype=float
-        )
-        local_normals = np.array(
-            [np.array(candidate['local_normal'], dtype=float) for candidate in group],
-            dtype=float
-        )
-
-        local_center = np.average(local_centers, axis=0, weights=weights)
-        local_normal = np.average(local_normals, axis=0, weights=weights)
-        local_normal_norm = np.linalg.norm(local_normal)
-        if local_normal_norm <= 1e-9:
-            local_normal = np.array(group[0]['local_normal'], dtype=float)
-        else:
-            local_normal = local_normal / local_normal_norm
-
+    def _surface_world_pose(self, link, local_center, local_normal):
         world_center = (link.t_world @ np.append(local_center, 1.0))[:3]
         world_normal = link.t_world[:3, :3] @ local_normal
         world_normal_norm = np.linalg.norm(world_normal)
         if world_normal_norm > 1e-9:
             world_normal = world_normal / world_normal_norm
+        return world_center, world_normal
 
-        combined_edges = []
-        for candidate in group:
-            combined_edges.extend(candidate.get('mesh_boundary_edges') or [])
-
-        deduped_edges = None
-        if combined_edges:
-            edge_set = {
-                tuple(sorted((int(edge[0]), int(edge[1]))))
-                for edge in combined_edges
-                if len(edge) == 2
-            }
-            deduped_edges = [list(edge) for edge in sorted(edge_set)]
-
-        combined_faces = []
-        for candidate in group:
-            combined_faces.extend(candidate.get('mesh_face_indices') or [])
-
-        deduped_faces = sorted({int(face_id) for face_id in combined_faces})
-
-        return {
-            'link_name': link_name,
-            'local_center': local_center,
-            'local_normal': local_normal,
-            'world_center': world_center,
-            'world_normal': world_normal,
-            'area': float(np.sum(areas)),
-            'mesh_boundary_edges': deduped_edges,
-            'mesh_face_indices': deduped_faces or None,
-            'base_surface_name': surface_name,
-            'surface_name': surface_name,
-            'display_name': f"{link_name} - {surface_name}",
-            'composite_surface': True,
-        }
-
-    def _build_bbox_surface_candidates(self, link_name, link, link_center_world, assembly_center_world):
-        mesh = link.mesh
+    def _local_bbox_surfaces(self, mesh):
+        """The six bounding-box faces of a mesh as local-space surface templates."""
         bounds = np.array(mesh.bounds, dtype=float)
         local_center = (bounds[0] + bounds[1]) / 2.0
         extents = bounds[1] - bounds[0]
-        rot = link.t_world[:3, :3]
 
-        candidates = []
+        templates = []
         for axis_index in range(3):
             for axis_sign in (-1, 1):
                 local_normal = np.zeros(3)
@@ -1532,222 +1466,284 @@ class GripperPanel(QtWidgets.QWidget):
                     corner[free_axes[1]] = bounds[second_idx][free_axes[1]]
                     outline_points.append(corner.tolist())
 
-                world_center = (link.t_world @ np.append(local_point, 1.0))[:3]
-                world_normal = rot @ local_normal
-                norm = np.linalg.norm(world_normal)
-                if norm > 1e-9:
-                    world_normal = world_normal / norm
-
-                candidates.append({
-                    'link_name': link_name,
+                templates.append({
                     'local_center': local_point,
                     'local_normal': local_normal,
-                    'world_center': world_center,
-                    'world_normal': world_normal,
                     'area': float(np.prod(np.delete(extents, axis_index))),
                     'outline_points': outline_points,
                     'outline_edges': [(0, 1), (1, 2), (2, 3), (3, 0)],
                 })
+        return templates
+
+    def _local_facet_surfaces(self, mesh):
+        """Planar facets of a mesh as local-space surface templates (None when there are none)."""
+        facets = list(getattr(mesh, 'facets', []) or [])
+        if not facets:
+            return None
+        facet_centers = np.asarray(getattr(mesh, 'facets_origin', []), dtype=float)
+        facet_normals = np.asarray(getattr(mesh, 'facets_normal', []), dtype=float)
+        facet_areas = np.asarray(getattr(mesh, 'facets_area', []), dtype=float)
 
-        return self._label_link_surface_candidates(
-            link_name, link, link_center_world, assembly_center_world, candidates
+        facet_count = min(len(facets), len(facet_centers), len(facet_normals), len(facet_areas))
+        if facet_count <= 0:
+            return None
+
+        facet_centers = facet_centers[:facet_count].reshape(-1, 3)
+        facet_normals = facet_normals[:facet_count].reshape(-1, 3)
+        facet_areas = facet_areas[:facet_count]
+
+        max_area = float(np.max(facet_areas))
+        min_area = max_area * 0.08 if facet_count > 12 and max_area > 0 else 0.0
+        normal_norms = np.linalg.norm(facet_normals, axis=1)
+        keep = np.flatnonzero(
+            np.isfinite(facet_areas) & (facet_areas >= min_area) & (normal_norms > 1e-9)
         )
+        if len(keep) == 0:
+            return None
 
-    def _label_link_surface_candidates(
-        self, link_name, link, link_center_world, assembly_center_world, candidates
-    ):
-        if not candidates:
-            return []
+        # Only read for the facets that survive the area filter
+        facet_boundaries = list(getattr(mesh, 'facets_boundary', []) or [])
+        local_centers = facet_centers[keep]
+        local_normals = facet_normals[keep] / normal_norms[keep][:, None]
+
+        templates = []
+        for row, index in enumerate(keep):
+            templates.append({
+                'local_center': local_centers[row],
+                'local_normal': local_normals[row],
+                'area': float(facet_areas[index]),
+                'mesh_face_indices': np.asarray(facets[index], dtype=int).tolist(),
+                'mesh_boundary_edges': (
+                    np.asarray(facet_boundaries[index], dtype=int).tolist()
+                    if index < len(facet_boundaries)
+                    else None
+                ),
+            })
+        return templates
 
-        to_assembly_world = np.array(assembly_center_world, dtype=float) - np.array(link_center_world, dtype=float)
-        to_assembly_local = link.t_world[:3, :3].T @ to_assembly_world
+    def _link_local_surfaces(self, link_name, link):
+        """
+        Local-space surface templates of a link with their (N, 3) center and
+        normal arrays and (N,) areas. Cached per mesh object and content hash, so trimesh's
+        facet properties are only evaluated again after the mesh changes.
+        """
+        return self._surface_local_cache.get(link_name, link.mesh)
+
+    def _build_local_surfaces(self, mesh):
+        templates = self._local_facet_surfaces(mesh) or self._local_bbox_surfaces(mesh)
+        local_centers = np.array([t['local_center'] for t in templates], dtype=float).reshape(-1, 3)
+        local_normals = np.array([t['local_normal'] for t in templates], dtype=float).reshape(-1, 3)
+        areas = np.array([t['area'] for t in templates], dtype=float)
+        # New templates also invalidate the label plan (keyed on their identity)
+        return templates, local_centers, local_normals, areas
+
+    def _surface_base_names(self, link, local_normals, world_centers, link_center_world, assembly_center_world):
+        """Inner/outer/axis base name of every candidate, from its pose relative to the assembly."""
+        rot = link.t_world[:3, :3]
+        assembly_center_world = np.array(assembly_center_world, dtype=float)
 
+        to_assembly_local = rot.T @ (assembly_center_world - np.array(link_center_world, dtype=float))
         inner_axis_index = None
         inner_axis_sign = None
         if np.linalg.norm(to_assembly_local) > 1e-9:
             inner_axis_index = int(np.argmax(np.abs(to_assembly_local)))
             inner_axis_sign = 1 if to_assembly_local[inner_axis_index] >= 0 else -1
 
-        grouped = {}
-        for candidate in candidates:
-            local_normal = np.array(candidate['local_normal'], dtype=float)
-            axis_index = int(np.argmax(np.abs(local_normal)))
-            axis_sign = 1 if local_normal[axis_index] >= 0 else -1
-            to_assembly_local = link.t_world[:3, :3].T @ (
-                np.array(assembly_center_world, dtype=float) - np.array(candidate['world_center'], dtype=float)
-            )
-            to_assembly_norm = np.linalg.norm(to_assembly_local)
-            normal_alignment = None
-            if to_assembly_norm > 1e-9:
-                normal_alignment = float(
-                    np.dot(local_normal, to_assembly_local / to_assembly_norm)
-                )
-            base_name = self._surface_base_name(
-                axis_index, axis_sign, inner_axis_index, inner_axis_sign, normal_alignment
+        # Row-wise rot.T @ (assembly - center) for every candidate at once
+        to_assembly = (assembly_center_world - world_centers) @ rot
+        to_assembly_norms = np.linalg.norm(to_assembly, axis=1)
+        alignments = np.einsum(
+            'ij,ij->i', local_normals, to_assembly / np.maximum(to_assembly_norms, 1e-12)[:, None]
+        )
+        axis_indices = np.argmax(np.abs(local_normals), axis=1)
+        axis_signs = np.where(local_normals[np.arange(len(local_normals)), axis_indices] >= 0, 1, -1)
+
+        return tuple(
+            self._surface_base_name(
+                int(axis_indices[i]),
+                int(axis_signs[i]),
+                inner_axis_index,
+                inner_axis_sign,
+                float(alignments[i]) if to_assembly_norms[i] > 1e-9 else None,
             )
+            for i in range(len(local_normals))
+        )
+
+    def _composite_surface_fields(self, link_name, templates, rows, local_centers, local_normals, areas, surface_name):
+        """Local-space fields of a synthetic candidate covering a whole grouped surface."""
+        if len(rows) == 0:
+            return None
+
+        group_areas = np.maximum(areas[rows], 1e-6)
+        weights = group_areas / max(float(np.sum(group_areas)), 1e-6)
 
-            candidate['original_base_surface_name'] = base_name
-            candidate['base_surface_name'] = base_name
-            candidate['surface_name'] = base_name
-            candidate['display_name'] = f"{link_name} - {base_name}"
-            grouped.setdefault(base_name, []).append(candidate)
-
-        max_area = max(float(candidate.get('area', 0.0)) for candidate in candidates) if candidates else 0.0
-        for base_name, group in grouped.items():
-            if self._is_teethed_group(base_name, group, max_area):
-                for candidate in group:
-                    candidate['source_base_surface_name'] = base_name
-                    candidate['base_surface_name'] = "Teethed Surface"
-                    candidate['surface_name'] = "Teethed Surface"
-                    candidate['display_name'] = f"{link_name} - Teethed Surface"
-
-        extra_candidates = []
-        inner_group = [
-            candidate for candidate in candidates
-            if candidate.get('original_base_surface_name') == "Inner Surface"
+        local_center = np.average(local_centers[rows], axis=0, weights=weights)
+        local_normal = np.average(local_normals[rows], axis=0, weights=weights)
+        local_normal_norm = np.linalg.norm(local_normal)
+        if local_normal_norm <= 1e-9:
+            local_normal = np.array(local_normals[rows[0]], dtype=float)
+        else:
+            local_normal = local_normal / local_normal_norm
+
+        edge_arrays = [
+            np.asarray(templates[row]['mesh_boundary_edges'], dtype=int).reshape(-1, 2)
+            for row in rows
+            if templates[row].get('mesh_boundary_edges')
         ]
-        if len(inner_group) > 1:
-            composite_inner = self._build_composite_surface_candidate(
-                link_name, link, inner_group, "Inner Surface"
-            )
-            if composite_inner is not None:
-                extra_candidates.append(composite_inner)
+        deduped_edges = None
+        if edge_arrays:
+            edges = np.sort(np.concatenate(edge_arrays), axis=1)
+            deduped_edges = np.unique(edges, axis=0).tolist()
+
+        face_arrays = [
+            np.asarray(templates[row]['mesh_face_indices'], dtype=int).ravel()
+            for row in rows
+            if templates[row].get('mesh_face_indices')
+        ]
+        deduped_faces = np.unique(np.concatenate(face_arrays)).tolist() if face_arrays else []
 
-        for base_name, group in grouped.items():
-            if len(group) <= 1:
-                continue
+        return {
+            'local_center': local_center,
+            'local_normal': local_normal,
+            'area': float(np.sum(group_areas)),
+            'mesh_boundary_edges': deduped_edges,
+            'mesh_face_indices': deduped_faces or None,
+            'base_surface_name': surface_name,
+            'surface_name': surface_name,
+            'detailed_surface_name': surface_name,
+            'display_name': f"{link_name} - {surface_name}",
+            'composite_surface': True,
+            'table_group': 0,
+            'table_index': 0,
+        }
 
-            effective_base_name = group[0].get('base_surface_name', base_name)
+    def _surface_label_plan(self, link_name, templates, local_centers, local_normals, areas, base_names):
+        """
+        Names, groups and orders one link's surfaces on array data.
 
-            group.sort(
-                key=lambda candidate: (
-                    -float(candidate.get('area', 0.0)),
-                    round(float(candidate['local_center'][2]), 6),
-                    round(float(candidate['local_center'][1]), 6),
-                    round(float(candidate['local_center'][0]), 6),
-                )
-            )
-            for index, candidate in enumerate(group, start=1):
-                candidate['surface_name'] = f"{effective_base_name} {index}"
-                candidate['display_name'] = f"{link_name} - {candidate['surface_name']}"
+        Returns [(row, fields)] in table order, where `row` indexes the link's
+        templates (None for the composite inner surface, whose fields then
+        hold its local geometry) and `fields` are the labels for that row.
+        Everything here depends only on local geometry and the base names,
+        so the plan can be reused for any pose that yields the same names.
+        """
+        count = len(templates)
+        if count == 0:
+            return []
 
-        candidates.sort(
-            key=lambda candidate: (
-                candidate['link_name'],
-                self._surface_priority(candidate.get('base_surface_name', 'Surface')),
-                -float(candidate.get('area', 0.0)),
-            )
-        )
-        candidates = extra_candidates + candidates
+        original_names = np.array(base_names, dtype=object)
+        effective_names = original_names.copy()
+        groups = {name: np.flatnonzero(original_names == name) for name in dict.fromkeys(base_names)}
 
-        outer_index = 0
-        inner_index = 0
-        teethed_index = 0
-        for candidate in candidates:
-            detailed_name = candidate['surface_name']
-            candidate['detailed_surface_name'] = detailed_name
-
-            if candidate.get('composite_surface') and candidate.get('base_surface_name') == "Inner Surface":
-                candidate['surface_name'] = "Inner Surface"
-                candidate['table_group'] = 0
-                candidate['table_index'] = 0
-            elif candidate.get('base_surface_name') == "Teethed Surface":
-                teethed_index += 1
-                candidate['surface_name'] = f"Teethed Surface {teethed_index}"
-                candidate['table_group'] = 1
-                candidate['table_index'] = teethed_index
-            elif candidate.get('base_surface_name') == "Inner Surface":
-                inner_index += 1
-                candidate['table_group'] = 2
-                candidate['table_index'] = inner_index
-            else:
-                outer_index += 1
-                outer_name = f"Outer Surface {outer_index}"
-                candidate['outer_surface_name'] = outer_name
-                candidate['table_group'] = 3
-                candidate['table_index'] = outer_index
+        max_area = float(np.max(areas))
+        for base_name, rows in groups.items():
+            if self._is_teethed_group(base_name, local_centers[rows], local_normals[rows], areas[rows], max_area):
+                effective_names[rows] = "Teethed Surface"
 
+        # Number multi-facet groups: largest first, then by position (z, y, x)
+        detailed_names = effective_names.copy()
+        rounded = np.round(local_centers, 6)
+        for rows in groups.values():
+            if len(rows) <= 1:
+                continue
+            order = rows[np.lexsort((rounded[rows, 0], rounded[rows, 1], rounded[rows, 2], -areas[rows]))]
+            effective_base_name = effective_names[rows[0]]
+            for index, row in enumerate(order, start=1):
+                detailed_names[row] = f"{effective_base_name} {index}"
+
+        priorities = np.array([self._surface_priority(name) for name in effective_names])
+        order = np.lexsort((-areas, priorities))
+
+        plan = []
+        inner_rows = np.flatnonzero(original_names == "Inner Surface")
+        if len(inner_rows) > 1:
+            plan.append((None, self._composite_surface_fields(
+                link_name, templates, inner_rows, local_centers, local_normals, areas, "Inner Surface"
+            )))
+
+        # Table groups: teethed (1), inner (2), everything else as outer (3)
+        tables = {1: [], 2: [], 3: []}
+        for row in order:
+            effective_name = effective_names[row]
+            detailed_name = detailed_names[row]
+            fields = {
+                'original_base_surface_name': original_names[row],
+                'base_surface_name': effective_name,
+                'surface_name': detailed_name,
+                'detailed_surface_name': detailed_name,
+            }
+            if effective_name != original_names[row]:
+                fields['source_base_surface_name'] = original_names[row]
+
+            if effective_name == "Teethed Surface":
+                table_group = 1
+                fields['surface_name'] = f"Teethed Surface {len(tables[1]) + 1}"
+            elif effective_name == "Inner Surface":
+                table_group = 2
+            else:
+                table_group = 3
+                outer_name = f"Outer Surface {len(tables[3]) + 1}"
+                fields['outer_surface_name'] = outer_name
                 if detailed_name.startswith("Outer Surface"):
-                    candidate['surface_name'] = outer_name
+                    fields['surface_name'] = outer_name
                 else:
-                    candidate['surface_name'] = f"{outer_name} ({detailed_name})"
+                    fields['surface_name'] = f"{outer_name} ({detailed_name})"
 
-            candidate['display_name'] = f"{link_name} - {candidate['surface_name']}"
+            fields['table_group'] = table_group
+            fields['table_index'] = len(tables[table_group]) + 1
+            fields['display_name'] = f"{link_name} - {fields['surface_name']}"
+            tables[table_group].append((int(row), fields))
 
-        candidates.sort(
-            key=lambda candidate: (
-                candidate['link_name'],
-                int(candidate.get('table_group', 3)),
-                int(candidate.get('table_index', 999)),
-                self._surface_priority(candidate.get('base_surface_name', 'Surface')),
-                -float(candidate.get('area', 0.0)),
-            )
-        )
-        return candidates
+        for table_group in (1, 2, 3):
+            plan.extend(tables[table_group])
+        return plan
 
     def _build_link_surface_candidates(self, link_name, link, link_center_world, assembly_center_world):
         mesh = getattr(link, 'mesh', None)
         if mesh is None:
             return []
 
-        facets = list(getattr(mesh, 'facets', []) or [])
-        facet_boundaries = list(getattr(mesh, 'facets_boundary', []) or [])
-        facet_centers = np.asarray(getattr(mesh, 'facets_origin', []), dtype=float)
-        facet_normals = np.asarray(getattr(mesh, 'facets_normal', []), dtype=float)
-        facet_areas = np.asarray(getattr(mesh, 'facets_area', []), dtype=float)
-
-        facet_count = min(len(facets), len(facet_centers), len(facet_normals), len(facet_areas))
-        if facet_count <= 0:
-            return self._build_bbox_surface_candidates(
-                link_name, link, link_center_world, assembly_center_world
-            )
-
-        max_area = float(np.max(facet_areas[:facet_count])) if facet_count > 0 else 0.0
-        min_area = max_area * 0.08 if facet_count > 12 and max_area > 0 else 0.0
+        templates, local_centers, local_normals, areas = self._link_local_surfaces(link_name, link)
 
+        # One matrix product per link instead of one per facet
         rot = link.t_world[:3, :3]
-        candidates = []
-        for index in range(facet_count):
-            area = float(facet_areas[index])
-            if not np.isfinite(area) or area < min_area:
-                continue
-
-            local_center = np.array(facet_centers[index], dtype=float)
-            local_normal = np.array(facet_normals[index], dtype=float)
-            local_norm = np.linalg.norm(local_normal)
-            if local_norm <= 1e-9:
-                continue
-            local_normal = local_normal / local_norm
-
-            world_center = (link.t_world @ np.append(local_center, 1.0))[:3]
-            world_normal = rot @ local_normal
-            world_norm = np.linalg.norm(world_normal)
-            if world_norm > 1e-9:
-                world_normal = world_normal / world_norm
-
-            candidates.append({
-                'link_name': link_name,
-                'local_center': local_center,
-                'local_normal': local_normal,
-                'world_center': world_center,
-                'world_normal': world_normal,
-                'area': area,
-                'mesh_face_indices': np.asarray(facets[index], dtype=int).tolist(),
-                'mesh_boundary_edges': (
-                    np.asarray(facet_boundaries[index], dtype=int).tolist()
-                    if index < len(facet_boundaries)
-                    else None
-                ),
-            })
+        world_centers = local_centers @ rot.T + link.t_world[:3, 3]
+        world_normals = local_normals @ rot.T
+        world_norms = np.linalg.norm(world_normals, axis=1)
+        world_normals = np.where(
+            (world_norms > 1e-9)[:, None],
+            world_normals / np.maximum(world_norms, 1e-12)[:, None],
+            world_normals,
+        )
 
-        if not candidates:
-            return self._build_bbox_surface_candidates(
-                link_name, link, link_center_world, assembly_center_world
+        base_names = self._surface_base_names(
+            link, local_normals, world_centers, link_center_world, assembly_center_world
+        )
+        cached = self._surface_label_cache.get(link_name)
+        if cached is not None and cached[0] is templates and cached[1] == base_names:
+            plan = cached[2]
+        else:
+            plan = self._surface_label_plan(
+                link_name, templates, local_centers, local_normals, areas, base_names
             )
+            self._surface_label_cache[link_name] = (templates, base_names, plan)
 
-        return self._label_link_surface_candidates(
-            link_name, link, link_center_world, assembly_center_world, candidates
-        )
+        # Candidate dicts are only assembled here, for the panel and its callers
+        candidates = []
+        for row, fields in plan:
+            if row is None:
+                candidate = dict(fields)
+                candidate['world_center'], candidate['world_normal'] = self._surface_world_pose(
+                    link, fields['local_center'], fields['local_normal']
+                )
+            else:
+                candidate = dict(templates[row])
+                candidate.update(fields)
+                candidate['world_center'] = world_centers[row]
+                candidate['world_normal'] = world_normals[row]
+            candidate['link_name'] = link_name
+            candidates.append(candidate)
+        return candidates
 
     def _get_surface_candidates(self, joint_name):
         joint = self.mw.robot.joints.get(joint_name)
@@ -1768,6 +1764,10 @@ class GripperPanel(QtWidgets.QWidget):
         if not link_payloads:
             return []
 
+        self._surface_local_cache.prune(self.mw.robot.links)
+        for stale_name in [name for name in self._surface_label_cache if name not in self.mw.robot.links]:
+            del self._surface_label_cache[stale_name]
+
         assembly_center_world = np.mean(
             [payload[2] for payload in link_payloads], axis=0
         )
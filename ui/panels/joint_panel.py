@@ -602,6 +602,7 @@ class JointPanel(QtWidgets.QWidget):
         # 2. Reset world transform to the offset (0 rotation position)
         child_link = self.mw.robot.links[child_name]
         child_link.t_world = child_link.t_offset.copy()
+        self.mw.robot.kinematics_version += 1
         
         # 3. Remove from UI data structures
         del self.joints[child_name]
@@ -1067,12 +1068,13 @@ class JointPanel(QtWidgets.QWidget):
         # Apply transformation
         child_link = self.mw.robot.links[self.child_object]
         child_link.t_world = T_from_origin @ R @ T_to_origin @ self.original_child_transform
+        self.mw.robot.kinematics_version += 1
         
-        # 5. Update visual and guides
+        # 5. Update guides, then visuals (update_transforms renders once for both)
+        self.show_joint_arrow(render=False)
         self.mw.canvas.update_transforms(self.mw.robot)
-        self.show_joint_arrow()
 
-    def show_joint_arrow(self):
+    def show_joint_arrow(self, render=True):
         """Display a small RGB axis triad and a yellow joint direction arrow at the pivot."""
         import pyvista as pv
         if not self.parent_object or self.alignment_point is None: return
@@ -1109,7 +1111,8 @@ class JointPanel(QtWidgets.QWidget):
         # --- SHOW MAIN JOINT ARROW (Yellow) ---
         # arrow = pv.Arrow(start=self.alignment_point, direction=world_axis, scale=0.8)
         # self.mw.canvas.plotter.add_mesh(arrow, color="yellow", name="joint_arrow", pickable=False)
-        self.mw.canvas.plotter.render()
+        if render:
+            self.mw.canvas.plotter.render()
 
     def confirm_joint(self):
         """Finalize the joint with selected axis and limits"""
@@ -3,6 +3,7 @@ import time
 import os
 import re
 from ui.dialogs.motor_assign_dialog import MotorAssignDialog
+from core.trajectory_streamer import linear_trajectory
 
 
 class RobotSyntaxHighlighter(QtGui.QSyntaxHighlighter):
@@ -406,6 +407,12 @@ class ProgramPanel(QtWidgets.QWidget):
         """)
         toolbar.addWidget(self.sync_hw_check)
 
+        self.show_actual_check = QtWidgets.QCheckBox("Show Actual")
+        self.show_actual_check.setToolTip("Overlay the pose reported by the hardware (translucent) on the commanded one")
+        self.show_actual_check.setStyleSheet(self.sync_hw_check.styleSheet())
+        self.show_actual_check.toggled.connect(self.mw.set_actual_pose_visible)
+        toolbar.addWidget(self.show_actual_check)
+
         self.hw_status_lbl = QtWidgets.QLabel("● Idle")
         self.hw_status_lbl.setStyleSheet("color: #bdbdbd; margin-left: 8px; font-size: 11px;")
         toolbar.addWidget(self.hw_status_lbl)
@@ -761,15 +768,22 @@ class ProgramPanel(QtWidgets.QWidget):
         step_factor = max(1.0, (101.0 - max(0.0, min(100.0, speed))) / 10.0)
         steps = int(max(6, min(80, max_diff / step_factor))) if max_diff > 0.01 else 1
 
+        step_delay = 0.03
         if hw_sync:
-            for name, value in target_vals.items():
-                try:
-                    self.mw.serial_mgr.send_command(name, float(value), speed=speed)
-                except Exception:
-                    pass
+            # Stream the same timeline the view animates; text firmware only gets the final target
+            trajectory = linear_trajectory(start_vals, target_vals, steps, step_delay)
+            if not self.mw.serial_mgr.stream_trajectory(trajectory):
+                for name, value in target_vals.items():
+                    try:
+                        self.mw.serial_mgr.send_command(name, float(value), speed=speed)
+                    except Exception:
+                        pass
 
+        t0 = time.perf_counter()
         for i in range(1, steps + 1):
             if not self.is_running:
+                if hw_sync:
+                    self.mw.serial_mgr.stop_trajectory()
                 return
             a = i / steps
             for n, v0 in start_vals.items():
@@ -781,7 +795,7 @@ class ProgramPanel(QtWidgets.QWidget):
             self.mw.robot.update_kinematics()
             self.mw.canvas.update_transforms(self.mw.robot)
             QtWidgets.QApplication.processEvents()
-            time.sleep(0.03)
+            time.sleep(max(0.0, t0 + i * step_delay - time.perf_counter()))
 
         if hasattr(self.mw, "show_speed_overlay"):
             self.mw.show_speed_overlay()
@@ -1015,15 +1029,31 @@ class ProgramPanel(QtWidgets.QWidget):
 
         sm = self.mw.serial_mgr
         if sm.is_connected:
+            q = sm.link_quality
+            rtt = f" · {q['rtt_p50_ms']:.1f} ms" if q["rtt_p50_ms"] is not None else ""
             if not sm.is_alive:
                 self.hw_status_lbl.setText("● Stalled")
                 self.hw_status_lbl.setStyleSheet("color: #ff9800; font-size: 11px;")
             elif self.is_running and self.sync_hw_check.isChecked():
-                self.hw_status_lbl.setText("● Streaming")
+                self.hw_status_lbl.setText(f"● Streaming{rtt}")
                 self.hw_status_lbl.setStyleSheet("color: #1976d2; font-size: 11px;")
             else:
-                self.hw_status_lbl.setText("● Online")
+                self.hw_status_lbl.setText(f"● Online{rtt}")
                 self.hw_status_lbl.setStyleSheet("color: #1976d2; font-size: 11px;")
+            self.hw_status_lbl.setToolTip(self._link_quality_text(q))
         else:
             self.hw_status_lbl.setText("● Offline")
             self.hw_status_lbl.setStyleSheet("color: #bdbdbd; font-size: 11px;")
+            self.hw_status_lbl.setToolTip("")
+
+    @staticmethod
+    def _link_quality_text(q):
+        def ms(v):
+            return f"{v:.1f} ms" if v is not None else "n/a"
+        return (
+            f"RTT p50 / p95 / p99: {ms(q['rtt_p50_ms'])} / {ms(q['rtt_p95_ms'])} / {ms(q['rtt_p99_ms'])}"
+            f" ({q['rtt_samples']} pings, {q['pings_lost']} lost)\n"
+            f"TX: {q['tx_bytes_per_s']:.0f} B/s   RX: {q['rx_bytes_per_s']:.0f} B/s\n"
+            f"CRC errors: {q['crc_errors']}   Parse errors: {q['parse_errors']}\n"
+            f"Reconnects: {q['reconnects']}"
+        )
@@ -1,9 +1,12 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 import json
+import threading
 import numpy as np
 import traceback
 from ui.panels.program_panel import ProgramPanel
 from ui.panels.ik_fk_panel import IKFKPanel
+from core.grasp_metrics import ObjectGraspMetrics
+from core.local_geometry import LocalGeometryCache
 
 
 class TypeOnlyDoubleSpinBox(QtWidgets.QDoubleSpinBox):
@@ -13,6 +16,9 @@ class TypeOnlyDoubleSpinBox(QtWidgets.QDoubleSpinBox):
     def wheelEvent(self, event): event.ignore()
 
 class SimulationPanel(QtWidgets.QWidget):
+    weld_seam_progress_signal = QtCore.pyqtSignal(int, int, str)  # done, total, message
+    weld_seam_done_signal = QtCore.pyqtSignal(object)              # {"seams", "indices"} or {"error"}
+
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
@@ -21,6 +27,7 @@ class SimulationPanel(QtWidgets.QWidget):
         
         self._target_gripper_angles = {}
         self._env_collision_manager = None
+        self._grasp_metrics_cache = LocalGeometryCache(ObjectGraspMetrics.from_mesh)
         
         self.init_ui()
 
@@ -528,6 +535,37 @@ class SimulationPanel(QtWidgets.QWidget):
         self.weld_pick_btn.clicked.connect(self.toggle_welding_edge_picking)
         welding_layout.addWidget(self.weld_pick_btn)
 
+        self.weld_auto_btn = QtWidgets.QPushButton("Auto-Detect Seams")
+        self.weld_auto_btn.setFixedHeight(36)
+        self.weld_auto_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        self.weld_auto_btn.setToolTip(
+            "Find inside corners and part-to-part contact lines on every simulation object in one pass."
+        )
+        self.weld_auto_btn.setStyleSheet("""
+            QPushButton {
+                background-color: white;
+                color: #e65100;
+                border: 2px solid #ff9800;
+                border-radius: 8px;
+                font-weight: bold;
+                font-size: 13px;
+            }
+            QPushButton:hover { background-color: #fff3e0; }
+        """)
+        self.weld_auto_btn.clicked.connect(self.auto_detect_weld_seams)
+        welding_layout.addWidget(self.weld_auto_btn)
+
+        self.weld_seam_progress = QtWidgets.QProgressBar()
+        self.weld_seam_progress.setFixedHeight(14)
+        self.weld_seam_progress.setTextVisible(False)
+        self.weld_seam_progress.setVisible(False)
+        welding_layout.addWidget(self.weld_seam_progress)
+
+        self._weld_seam_worker = None
+        self._weld_seam_cancel = False
+        self.weld_seam_progress_signal.connect(self._on_weld_seam_progress)
+        self.weld_seam_done_signal.connect(self._on_weld_seams_detected)
+
         self.weld_edges_list = QtWidgets.QListWidget()
         self.weld_edges_list.setFixedHeight(150)
         self.weld_edges_list.setStyleSheet("""
@@ -548,6 +586,8 @@ class SimulationPanel(QtWidgets.QWidget):
             "approach_mm": 25.0,
             "retract_mm": 25.0,
             "feed_mm_s": 10.0,
+            "seam_contact_tol_mm": 0.5,
+            "seam_min_length_mm": 5.0,
         }
 
         btn_row = QtWidgets.QHBoxLayout()
@@ -1598,14 +1638,24 @@ class SimulationPanel(QtWidgets.QWidget):
         else:
             self.main_window.canvas.deselect_all()
 
-    def _on_weld_edge_picked(self, link_name, p1_w, p2_w):
-        """Callback from the canvas when the user picks one edge."""
+    def _on_weld_edge_picked(self, link_name, p1_w, p2_w, seam=None):
+        """Callback from the canvas when the user picks one edge or a whole feature seam."""
         record = {
             "link": link_name,
             "edge_points": [np.array(p1_w, dtype=float), np.array(p2_w, dtype=float)],
         }
+        if seam is not None:
+            record["polyline"] = [np.array(p, dtype=float) for p in seam["points"]]
+            record["closed"] = bool(seam.get("closed", False))
+            record["seam_normals_local"] = [np.array(n, dtype=float) for n in seam["face_normals_local"]]
+            record["dihedral_deg"] = float(seam.get("dihedral_deg", 0.0))
         if self._add_weld_edge_record(record):
-            self.main_window.log(f"✅ Weld edge added from '{link_name}'.")
+            if seam is not None:
+                self.main_window.log(
+                    f"✅ Weld seam added from '{link_name}' ({len(record['polyline']) - 1} segment(s))."
+                )
+            else:
+                self.main_window.log(f"✅ Weld edge added from '{link_name}'.")
         else:
             self.main_window.log("⚠️ Duplicate or invalid weld edge ignored.")
 
@@ -1615,6 +1665,114 @@ class SimulationPanel(QtWidgets.QWidget):
         if self.weld_pick_btn.isChecked():
             QtCore.QTimer.singleShot(0, lambda: self.main_window.canvas.start_edge_picking(self._on_weld_edge_picked, color="#e65100"))
 
+    def auto_detect_weld_seams(self):
+        """Detect weld seams over all simulation objects in a background thread."""
+        if self._weld_seam_worker is not None and self._weld_seam_worker.is_alive():
+            self._weld_seam_cancel = True
+            self.main_window.log("⏹️ Cancelling seam detection...")
+            return
+
+        links = [
+            l for l in self.main_window.robot.links.values()
+            if getattr(l, "is_sim_obj", False) and l.mesh is not None and len(getattr(l.mesh, "faces", [])) > 0
+        ]
+        if not links:
+            self.main_window.log("⚠️ No simulation objects to scan. Import the workpiece parts in simulation mode first.")
+            self.main_window.show_toast("Import simulation objects first", "warning")
+            return
+
+        canvas = self.main_window.canvas
+        ratio = canvas.grid_units_per_cm
+        mm_to_world = ratio / 10.0
+        contact_tol = float(self.weld_settings.get("seam_contact_tol_mm", 0.5)) * mm_to_world
+        min_length = float(self.weld_settings.get("seam_min_length_mm", 5.0)) * mm_to_world
+
+        # Snapshot geometry on the GUI thread; the worker only sees plain arrays
+        parts = [
+            (l.name, np.asarray(l.mesh.vertices, dtype=float), np.asarray(l.mesh.faces), np.array(l.t_world, dtype=float))
+            for l in links
+        ]
+        cached = {}
+        for l in links:
+            index = canvas.get_feature_edge_index(l.name, build=False)
+            if index is not None:
+                cached[l.name] = index
+
+        def task():
+            from core.weld_seams import detect_weld_seams
+            try:
+                seams, indices = detect_weld_seams(
+                    parts,
+                    contact_tol,
+                    min_length=min_length,
+                    indices=cached,
+                    progress=lambda done, total, msg: self.weld_seam_progress_signal.emit(done, total, msg),
+                    cancel=lambda: self._weld_seam_cancel,
+                )
+                self.weld_seam_done_signal.emit({"seams": seams, "indices": indices})
+            except Exception as e:
+                self.weld_seam_done_signal.emit({"error": str(e)})
+
+        self._weld_seam_cancel = False
+        self.weld_seam_progress.setRange(0, max(1, len(parts) * 2))
+        self.weld_seam_progress.setValue(0)
+        self.weld_seam_progress.setVisible(True)
+        self.weld_auto_btn.setText("Cancel Detection")
+        self.main_window.log(f"🔍 Scanning {len(parts)} simulation object(s) for weld seams...")
+
+        self._weld_seam_worker = threading.Thread(target=task, daemon=True)
+        self._weld_seam_worker.start()
+
+    def _on_weld_seam_progress(self, done, total, message):
+        """Progress updates from the seam detection worker (GUI thread)."""
+        self.weld_seam_progress.setRange(0, max(1, total))
+        self.weld_seam_progress.setValue(done)
+        self.weld_seam_progress.setToolTip(message)
+
+    def _on_weld_seams_detected(self, result):
+        """Turn detected seams into weld edge records (GUI thread)."""
+        self._weld_seam_worker = None
+        self.weld_seam_progress.setVisible(False)
+        self.weld_auto_btn.setText("Auto-Detect Seams")
+
+        if "error" in result:
+            self.main_window.log(f"❌ Seam detection failed: {result['error']}")
+            return
+        if self._weld_seam_cancel:
+            self.main_window.log("⏹️ Seam detection cancelled.")
+            return
+
+        canvas = self.main_window.canvas
+        for name, index in result.get("indices", {}).items():
+            canvas.cache_feature_edge_index(name, index)
+
+        added = 0
+        for seam in result.get("seams", []):
+            pts = [np.array(p, dtype=float) for p in seam["points_world"]]
+            if len(pts) < 2:
+                continue
+            end = pts[-2] if seam["closed"] and len(pts) > 2 else pts[-1]
+            record = {
+                "link": seam["link"],
+                "edge_points": [pts[0], end],
+                "polyline": pts,
+                "closed": bool(seam["closed"]),
+                "seam_normals_local": [np.array(n, dtype=float) for n in seam["normals_local"]],
+                "dihedral_deg": float(seam["dihedral_deg"]),
+                "source": "auto",
+                "seam_kind": seam["kind"],
+                "contact_link": seam.get("contact_link"),
+            }
+            if self._add_weld_edge_record(record):
+                canvas.highlight_seam(pts, f"edge_highlight_auto_{len(self.weld_edge_records)}", color="#e65100")
+                added += 1
+
+        self._refresh_weld_edge_ui()
+        canvas.plotter.render()
+        found = len(result.get("seams", []))
+        self.main_window.log(f"✅ Seam detection found {found} seam(s); {added} new weld edge(s) added.")
+        self.main_window.show_toast(f"{added} weld seam(s) detected", "success" if added else "info")
+
     def _start_weld_live_point_pick(self):
         """Activate face picking so the user can define the weld contact reference."""
         self.main_window.log("🎯 Click a weld face so its center becomes the contact reference.")
@@ -1736,8 +1894,11 @@ class SimulationPanel(QtWidgets.QWidget):
         self.weld_edges_list.clear()
         for idx, edge in enumerate(self.weld_edge_records, start=1):
             p1, p2 = edge["edge_points"]
+            seam_info = ""
+            if edge.get("polyline"):
+                seam_info = f" | seam {len(edge['polyline']) - 1} seg{' (closed)' if edge.get('closed') else ''}"
             self.weld_edges_list.addItem(
-                f"{idx}. {edge['link']} | ({p1[0]:.1f}, {p1[1]:.1f}, {p1[2]:.1f}) -> ({p2[0]:.1f}, {p2[1]:.1f}, {p2[2]:.1f})"
+                f"{idx}. {edge['link']} | ({p1[0]:.1f}, {p1[1]:.1f}, {p1[2]:.1f}) -> ({p2[0]:.1f}, {p2[1]:.1f}, {p2[2]:.1f}){seam_info}"
             )
         if hasattr(self, "weld_summary_label"):
             self.weld_summary_label.setText(f"Selected edges: {len(self.weld_edge_records)}")
@@ -2022,11 +2183,14 @@ class SimulationPanel(QtWidgets.QWidget):
                 "waypoints": [],
             }
 
-        normals, joint_type = self._infer_weld_geometry(link, p1_world, p2_world, weld_type_choice)
+        normals, joint_type = self._infer_weld_geometry(
+            link, p1_world, p2_world, weld_type_choice, seam_normals=edge.get("seam_normals_local")
+        )
         if not normals:
             warnings.append("Could not infer adjacent face normals; using fallback orientation.")
 
-        weld_points = self._sample_edge_polyline([p1_world, p2_world], step_mm)
+        seam_points = edge.get("polyline") or [p1_world, p2_world]
+        weld_points = self._sample_edge_polyline(seam_points, step_mm)
         if len(weld_points) < 2:
             warnings.append("Edge segment is very short; path sampling collapsed to endpoints.")
             weld_points = [p1_world, p2_world]
@@ -2112,6 +2276,8 @@ class SimulationPanel(QtWidgets.QWidget):
 
         return {
             "link": edge["link"],
+            "seam_source": edge.get("seam_kind", "manual"),
+            "contact_link": edge.get("contact_link"),
             "joint_classification": joint_type,
             "weld_type": joint_type,
             "torch_angle_deg": torch_angle_deg,
@@ -2170,13 +2336,14 @@ class SimulationPanel(QtWidgets.QWidget):
         best_proj = None
         best_dist = float("inf")
         for idx, edge in enumerate(self.weld_edge_records, start=1):
-            p1, p2 = edge["edge_points"]
-            proj = self._project_point_to_segment(point_world, p1, p2)
-            dist = float(np.linalg.norm(np.array(point_world, dtype=float) - np.array(proj, dtype=float)))
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = idx
-                best_proj = proj
+            pts = edge.get("polyline") or edge["edge_points"]
+            for a, b in zip(pts[:-1], pts[1:]):
+                proj = self._project_point_to_segment(point_world, a, b)
+                dist = float(np.linalg.norm(np.array(point_world, dtype=float) - np.array(proj, dtype=float)))
+                if dist < best_dist:
+                    best_dist = dist
+                    best_idx = idx
+                    best_proj = proj
         return best_idx, best_proj
 
     def _set_weld_live_point(self, point_world):
@@ -2185,8 +2352,44 @@ class SimulationPanel(QtWidgets.QWidget):
         self.weld_live_point_world = pt
         # Sphere marker removed - only the visual trail is shown
 
-    def _infer_weld_geometry(self, link, p1_world, p2_world, weld_type_choice):
+    def _classify_weld_joint(self, normal_a, normal_b, weld_type_choice):
+        """Classify a weld joint from its two (unit) face normals."""
+        avg = normal_a + normal_b
+        if np.linalg.norm(avg) < 1e-9:
+            avg = normal_a
+        avg = avg / np.linalg.norm(avg)
+
+        dihedral_deg = float(np.degrees(np.arccos(np.clip(np.dot(normal_a, normal_b), -1.0, 1.0))))
+        if weld_type_choice != "auto":
+            joint_type = weld_type_choice
+        elif dihedral_deg < 25.0:
+            joint_type = "butt"
+        elif dihedral_deg < 120.0:
+            joint_type = "fillet"
+        else:
+            joint_type = "lap"
+
+        return {
+            "face_a": normal_a,
+            "face_b": normal_b,
+            "average_normal": avg,
+            "dihedral_deg": dihedral_deg,
+        }, joint_type
+
+    def _infer_weld_geometry(self, link, p1_world, p2_world, weld_type_choice, seam_normals=None):
         """Infer adjacent face normals and classify the weld joint."""
+        # Seams picked through the canvas feature-edge index already carry their
+        # averaged face normals, so the mesh adjacency search can be skipped.
+        if seam_normals is not None and len(seam_normals) == 2:
+            normal_a = np.array(seam_normals[0], dtype=float)
+            normal_b = np.array(seam_normals[1], dtype=float)
+            if np.linalg.norm(normal_a) > 1e-9 and np.linalg.norm(normal_b) > 1e-9:
+                return self._classify_weld_joint(
+                    normal_a / np.linalg.norm(normal_a),
+                    normal_b / np.linalg.norm(normal_b),
+                    weld_type_choice,
+                )
+
         try:
             import trimesh
         except Exception:
@@ -2233,27 +2436,7 @@ class SimulationPanel(QtWidgets.QWidget):
 
         normal_a /= np.linalg.norm(normal_a)
         normal_b /= np.linalg.norm(normal_b)
-        avg = normal_a + normal_b
-        if np.linalg.norm(avg) < 1e-9:
-            avg = normal_a
-        avg /= np.linalg.norm(avg)
-
-        dihedral_deg = float(np.degrees(np.arccos(np.clip(np.dot(normal_a, normal_b), -1.0, 1.0))))
-        if weld_type_choice != "auto":
-            joint_type = weld_type_choice
-        elif dihedral_deg < 25.0:
-            joint_type = "butt"
-        elif dihedral_deg < 120.0:
-            joint_type = "fillet"
-        else:
-            joint_type = "lap"
-
-        return {
-            "face_a": normal_a,
-            "face_b": normal_b,
-            "average_normal": avg,
-            "dihedral_deg": dihedral_deg,
-        }, joint_type
+        return self._classify_weld_joint(normal_a, normal_b, weld_type_choice)
 
     def _sample_edge_polyline(self, points_world, step_mm):
         """Sample a polyline with a fixed waypoint spacing."""
@@ -2845,6 +3028,10 @@ class SimulationPanel(QtWidgets.QWidget):
         self.main_window.canvas.update_transforms(self.main_window.robot)
         self.main_window.update_live_ui()
 
+    def _object_grasp_metrics(self, obj_link):
+        """Local-frame grasp metrics of an object, rebuilt only when its mesh or scale changes."""
+        return self._grasp_metrics_cache.get(obj_link.name, obj_link.mesh)
+
     def _get_object_grip_width(self):
         """
         Measures the object's thickness along the gripper's opening axis
@@ -2924,9 +3111,8 @@ class SimulationPanel(QtWidgets.QWidget):
         grip_width = 0.0
         
         if tcp_link:
-            # --- Project all object mesh vertices for geometric measurement ---
-            # Vertices in world space
-            verts_world = (obj_link.t_world[:3, :3] @ obj_link.mesh.vertices.T).T + obj_link.t_world[:3, 3]
+            # --- Measure along world axes with the object's cached local-frame metrics ---
+            metrics = self._object_grasp_metrics(obj_link)
             
             if using_selected_faces and isinstance(geo_data, dict):
                 # Clamp strictly along the selected gripping-face axis.
@@ -2940,8 +3126,7 @@ class SimulationPanel(QtWidgets.QWidget):
                     axis_norm = np.linalg.norm(grip_axis)
                 if axis_norm > 1e-9:
                     grip_axis = grip_axis / axis_norm
-                projections = verts_world @ grip_axis
-                grip_width = float(np.ptp(projections))
+                grip_width = metrics.width_along(obj_link.t_world, grip_axis)
                 self.main_window.log(
                     f"Face Mode: Measured object thickness {grip_width/ratio:.2f} cm along selected face axis."
                 )
@@ -2976,8 +3161,7 @@ class SimulationPanel(QtWidgets.QWidget):
                 # Hold the object "between" them: 
                 # The effective grip width is the maximum chord of the object among all these axes.
                 for axis in check_axes:
-                    projections = verts_world @ axis
-                    max_observed = max(max_observed, np.ptp(projections))
+                    max_observed = max(max_observed, metrics.width_along(obj_link.t_world, axis))
                 
                 grip_width = max_observed
             else:
@@ -2986,8 +3170,7 @@ class SimulationPanel(QtWidgets.QWidget):
                 if np.linalg.norm(grip_axis) < 1e-3: grip_axis = np.array([1,0,0])
                 grip_axis /= np.linalg.norm(grip_axis)
                 
-                projections = verts_world @ grip_axis
-                grip_width = np.ptp(projections)
+                grip_width = metrics.width_along(obj_link.t_world, grip_axis)
         else:
             # Fallback to world-space bounding box
             grip_width = max(world_extents[0], world_extents[1])
@@ -4532,14 +4715,11 @@ class SimulationPanel(QtWidgets.QWidget):
         target_world_rot = None
         _, _, obj_link = self._get_object_grip_width()
         if obj_link and obj_link.mesh:
-            verts_w = (obj_link.t_world[:3, :3] @ obj_link.mesh.vertices.T).T + obj_link.t_world[:3, 3]
-            # Use PCA (via SVD) on vertices to find major axes
-            centroid = np.mean(verts_w, axis=0)
-            centered = verts_w - centroid
-            _, _, vh = np.linalg.svd(centered, full_matrices=False)
-            # vh[0] is major, vh[1] is secondary, vh[2] is minor (narrowest)
-            major_axis = vh[0]
-            minor_axis = vh[2] 
+            # PCA axes are cached in the object's frame; only rotate them into world space
+            # (major, secondary, minor = narrowest)
+            major_axis, _, minor_axis = self._object_grasp_metrics(obj_link).world_principal_axes(
+                obj_link.t_world
+            )
             
             # We want to align the gripper span (best_vec) with the object's narrowest axis
             # to achieve the most centered/stable grip.
@@ -121,6 +121,30 @@ class CodeDrawer(QtWidgets.QWidget):
         """)
         self.layout.addWidget(self.code_edit)
 
+        # ── Sketch selector (robots split across several boards) ──────────────
+        self._board_codes = {}
+        self.sketch_row = QtWidgets.QWidget()
+        sketch_lay = QtWidgets.QHBoxLayout(self.sketch_row)
+        sketch_lay.setContentsMargins(0, 0, 0, 0)
+        sketch_lbl = QtWidgets.QLabel("Sketch:")
+        sketch_lbl.setStyleSheet("color: #888; font-size: 11px; font-weight: normal;")
+        sketch_lay.addWidget(sketch_lbl)
+        self.sketch_combo = QtWidgets.QComboBox()
+        self.sketch_combo.setStyleSheet("""
+            QComboBox {
+                background: #2a2a2a;
+                color: #a9b7c6;
+                border: 1px solid #444;
+                border-radius: 4px;
+                padding: 3px 8px;
+                font-size: 11px;
+            }
+        """)
+        self.sketch_combo.currentIndexChanged.connect(self._on_sketch_changed)
+        sketch_lay.addWidget(self.sketch_combo, 1)
+        self.sketch_row.hide()
+        self.layout.addWidget(self.sketch_row)
+
         # ── FQBN selector ─────────────────────────────────────────────────────
         fqbn_row = QtWidgets.QHBoxLayout()
         fqbn_lbl = QtWidgets.QLabel("Board:")
@@ -227,6 +251,7 @@ class CodeDrawer(QtWidgets.QWidget):
         self.detect_timer.start(3000)  # Check every 3 seconds
 
         self._upload_in_progress = False
+        self._upload_board = None  # Board whose sketch the running upload flashes
         self._preflight_in_progress = False
         self._build_successful = False
         self._detected_port = None
@@ -339,8 +364,40 @@ class CodeDrawer(QtWidgets.QWidget):
     # ─────────────────────────────────────────────────────────────────────────
 
     def set_code(self, code: str):
+        self._board_codes = {}
+        self.sketch_row.hide()
         self.code_edit.setPlainText(code)
 
+    def set_board_codes(self, codes: dict):
+        """One sketch per board ({board: code}); the selector picks which one is shown, built and uploaded."""
+        if len(codes) <= 1:
+            self.set_code(next(iter(codes.values()), ""))
+            return
+        self._board_codes = dict(codes)
+        self.sketch_combo.blockSignals(True)
+        self.sketch_combo.clear()
+        for board in sorted(self._board_codes):
+            self.sketch_combo.addItem(f"Board {board}", board)
+        self.sketch_combo.blockSignals(False)
+        self.sketch_row.show()
+        self._on_sketch_changed(0)
+
+    def _sketch_board(self):
+        """Board whose sketch is shown, or None for the single whole-robot sketch."""
+        return self.sketch_combo.currentData() if self._board_codes else None
+
+    def _board_link(self, board=None):
+        """SerialManager of `board` (the primary link when None)."""
+        return self.mw.serial_mgr.manager(board)
+
+    def _on_sketch_changed(self, index):
+        board = self.sketch_combo.itemData(index)
+        if board in self._board_codes:
+            self.code_edit.setPlainText(self._board_codes[board])
+            # A build of another board's sketch must not be uploaded to this one
+            self._build_successful = False
+            self.upload_btn.setEnabled(False)
+
     def open_drawer(self):
         self.show()
 
@@ -466,11 +523,13 @@ class CodeDrawer(QtWidgets.QWidget):
         required_libs = self._required_libraries_from_code(code_text)
 
         # 2. Validate COM port
+        # The link and port choice of the board whose sketch is shown
+        board = self._sketch_board()
         port = ""
-        if hasattr(self.mw, "serial_mgr") and self.mw.serial_mgr.port_name:
-            port = self.mw.serial_mgr.port_name
+        if hasattr(self.mw, "serial_mgr") and self._board_link(board).port_name:
+            port = self._board_link(board).port_name
         if not port:
-            port = self.mw.port_combo.currentText()
+            port = self.mw._port_combo_of(board).currentText()
         port = port.split()[0].strip()  # strip description suffix
 
         if not port or port.lower() in ("no ports found", ""):
@@ -479,9 +538,10 @@ class CodeDrawer(QtWidgets.QWidget):
             return
 
         self._upload_in_progress = True
+        self._upload_board = board
         self.upload_btn.setEnabled(False)
-        if hasattr(self.mw, "port_scan_timer"):
-            self.mw.port_scan_timer.stop()
+        if hasattr(self.mw, "port_watcher"):
+            self.mw.port_watcher.pause()
         self._log(f"🚀 Uploading to {port} via {os.path.basename(cli_path)}...")
 
         thread = threading.Thread(
@@ -601,7 +661,7 @@ class CodeDrawer(QtWidgets.QWidget):
 
     @QtCore.pyqtSlot()
     def _update_button_states(self):
-        is_connected = getattr(self.mw.serial_mgr, "is_connected", False)
+        is_connected = getattr(self._board_link(self._sketch_board()), "is_connected", False)
         self.build_btn.setEnabled(True)
         self.upload_btn.setEnabled(self._build_successful and is_connected)
         
@@ -711,7 +771,9 @@ class CodeDrawer(QtWidgets.QWidget):
         build_dir = os.path.join(self._workspace_root, ".build", "arduino", re.sub(r"[^a-zA-Z0-9_.-]", "_", fqbn))
         os.makedirs(build_dir, exist_ok=True)
 
-        was_connected = getattr(self.mw.serial_mgr, "is_connected", False)
+        board = self._upload_board
+        link = self._board_link(board)
+        was_connected = getattr(link, "is_connected", False)
 
         try:
             # 1. Write sketch atomically
@@ -723,7 +785,7 @@ class CodeDrawer(QtWidgets.QWidget):
             # 2. Release serial port so arduino-cli can claim it
             if was_connected:
                 self.upload_status_signal.emit("Releasing serial port...", False)
-                self.mw.serial_mgr.disconnect()
+                link.disconnect()
                 time.sleep(1.2)
 
             # 3. Upload pre-built binaries
@@ -785,7 +847,7 @@ class CodeDrawer(QtWidgets.QWidget):
                 # --- DIGITAL TWIN TRIGGER ---
                 # After successful upload, notify MainWindow to initialize Twin sync
                 if hasattr(self.mw, "on_firmware_upload_success"):
-                    self.mw.on_firmware_upload_success(port)
+                    self.mw.on_firmware_upload_success(port, board)
             else:
                 # Final assisted fallback for boards that require manual BOOT/RESET timing.
                 lower_err = (last_err or "").lower()
@@ -806,7 +868,7 @@ class CodeDrawer(QtWidgets.QWidget):
                         self._log("✅ Firmware uploaded to ESP32 successfully (manual boot mode).")
                         upload_ok = True
                         if hasattr(self.mw, "on_firmware_upload_success"):
-                            self.mw.on_firmware_upload_success(port)
+                            self.mw.on_firmware_upload_success(port, board)
                     else:
                         last_err = m_out.strip() if m_out else "Manual upload failed"
 
@@ -929,8 +991,8 @@ class CodeDrawer(QtWidgets.QWidget):
             self._upload_in_progress = False
             self.upload_btn.setEnabled(True)
             self.build_btn.setEnabled(True)
-            if hasattr(self.mw, "port_scan_timer"):
-                self.mw.port_scan_timer.start(5000)
+            if hasattr(self.mw, "port_watcher"):
+                self.mw.port_watcher.resume()
 
         # Help user with SHA-256 boot errors
         if "SHA-256" in msg: